@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmark the throughput of colorise.fprint across multiple threads.
+
+Each thread prints to its own in-memory stream without any locking. The total
+throughput should stay roughly constant as threads are added instead of
+collapsing due to contention, and each stream is checked for corrupted output.
+
+"""
+
+import argparse
+import io
+import threading
+import time
+
+import colorise
+
+_FORMAT = '{fg=green}[{bold}OK{reset}{fg=green}]{reset} {fg=cyan}status line'
+
+
+def run(thread_count, iterations):
+    """Run the benchmark and return the number of calls per second."""
+    streams = [io.StringIO() for _ in range(thread_count)]
+    barrier = threading.Barrier(thread_count + 1)
+
+    def worker(stream):
+        barrier.wait()
+
+        for _ in range(iterations):
+            colorise.fprint(_FORMAT, file=stream)
+
+    threads = [
+        threading.Thread(target=worker, args=(stream,)) for stream in streams
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+    expected = colorise.fformat(_FORMAT) + '\n'
+
+    for stream in streams:
+        if stream.getvalue() != expected * iterations:
+            raise RuntimeError('Output of concurrent fprint calls was mixed')
+
+    return thread_count * iterations / elapsed
+
+
+def main():
+    """Run the benchmark for an increasing number of threads."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20000,
+                        help='Number of fprint calls per thread')
+    parser.add_argument('--max-threads', type=int, default=8,
+                        help='Maximum number of threads')
+    args = parser.parse_args()
+
+    thread_count = 1
+
+    while thread_count <= args.max_threads:
+        rate = run(thread_count, args.iterations)
+        print('{0:>3} thread(s): {1:>10.0f} calls/s'.format(thread_count,
+                                                            rate))
+        thread_count *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Benchmark the time it takes to import colorise.
+
+Each measurement imports colorise in a fresh interpreter using
+``python -X importtime``, which requires CPython 3.7 or later, and reads the
+cumulative time of the colorise package. The best of several runs is
+reported together with the slowest modules imported by colorise.
+
+    python benchmarks/import_time.py --max-time 0.05
+
+The benchmark exits with a non-zero status if the best import time exceeds
+the maximum time.
+
+"""
+
+import argparse
+import subprocess
+import sys
+
+
+def parse_importtime(output):
+    """Return a list of (cumulative time in seconds, module) tuples."""
+    times = []
+
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, module = line.split('|')
+        times.append((int(cumulative) / 1e6, module.strip()))
+
+    return times
+
+
+def measure():
+    """Import colorise in a new interpreter and return its import times."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import colorise'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+
+    return parse_importtime(result.stderr)
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Number of interpreters to measure')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Number of slowest modules to show')
+    parser.add_argument('--max-time', type=float, default=None,
+                        help='Fail if importing takes longer in seconds')
+    args = parser.parse_args()
+
+    if sys.implementation.name != 'cpython' or sys.version_info < (3, 7):
+        # python -X importtime was added in CPython 3.7
+        print('Unsupported interpreter {0} {1}, import times can only be '
+              'measured on CPython 3.7 or later'.format(
+                  sys.implementation.name,
+                  '.'.join(map(str, sys.version_info[:3])),
+              ))
+        return
+
+    # The first run may compile bytecode so it is not measured
+    measure()
+    runs = [measure() for _ in range(args.repeat)]
+    totals = [dict((m, t) for t, m in run)['colorise'] for run in runs]
+    best = runs[totals.index(min(totals))]
+
+    print('{0:<40} {1:>12}'.format('module', 'cumulative'))
+
+    for elapsed, module in sorted(best, reverse=True)[:args.top]:
+        print('{0:<40} {1:>9.3f} ms'.format(module, elapsed * 1e3))
+
+    print()
+    print('best import time: {0:.3f} ms'.format(min(totals) * 1e3))
+
+    if args.max_time is not None and min(totals) > args.max_time:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Run microbenchmarks of colorise's public entry points.
+
+Every benchmark writes to an in-memory stream and is run with the number of
+supported colors forced to 8, 16, 88, 256 and true-color so results do not
+depend on the terminal running the benchmarks. Output using the Windows
+console API is not benchmarked.
+
+Save results as JSON and compare a later run against them:
+
+    python benchmarks/run.py --save baseline.json
+    python benchmarks/run.py --compare baseline.json --threshold 0.1
+
+The comparison exits with a non-zero status if any benchmark is slower than
+the baseline by more than the threshold.
+
+"""
+
+import argparse
+import importlib
+import io
+import json
+import platform
+import sys
+import timeit
+import unittest.mock
+
+import colorise
+import colorise.cluts
+import colorise.nix.cluts
+from colorise.attributes import Attr
+from colorise.color_tools import closest_color, get_clut_index
+
+COLOR_COUNTS = [8, 16, 88, 256, 2**24]
+
+COLOR_FORMATS = [
+    ('name', 'red'),
+    ('index', 201),
+    ('hex', '#a696ff'),
+    ('short_hex', '#abf'),
+    ('rgb', 'rgb(167;151;255)'),
+    ('hls', 'hls(0.6919;0.7940;1.0)'),
+    ('hsv', 'hsv(249;41;100)'),
+]
+
+# Colors used for looking up the closest color in a CLUT
+RGB_COLORS = [(167, 151, 255), (12, 200, 34), (255, 255, 255), (90, 90, 91)]
+
+TEXT = 'The quick brown fox jumps over the lazy dog'
+
+
+def get_cluts():
+    """Return a list of CLUT names and CLUTs to benchmark."""
+    cluts = [
+        ('system', colorise.nix.cluts._NIX_SYSTEM_COLORS),
+        ('xterm88', colorise.nix.cluts.get_xterm_clut_88()),
+        ('xterm256', colorise.nix.cluts.get_xterm_clut_256()),
+    ]
+
+    try:
+        win_cluts = importlib.import_module('colorise.win.cluts')
+        cluts.append(('windows', win_cluts._WINDOWS_CLUT))
+    except ImportError:
+        pass
+
+    return cluts
+
+
+def force_num_colors(color_count):
+    """Return a context manager that forces the number of supported colors."""
+    # Load the platform-specific functions which are otherwise only loaded on
+    # first use
+    colorise.num_colors()
+    module = sys.modules[colorise._num_colors.__module__]
+
+    return unittest.mock.patch.object(
+        module,
+        '_probe_num_colors',
+        return_value=color_count,
+    )
+
+
+def output_benchmarks(stream):
+    """Return benchmarks of functions that write colored output."""
+    style = colorise.Style(fg='red', bg='blue', attributes=[Attr.Bold])
+    template = colorise.compile('{fg=red}[{0}]{reset} {1}')
+    indices = list(range(0, len(TEXT), 3))
+    spans = [(i, i + 5, style) for i in range(0, len(TEXT), 8)]
+
+    def set_reset_color():
+        colorise.set_color(fg='red', bg='blue', file=stream)
+        colorise.reset_color(file=stream)
+
+    return [
+        ('cprint', lambda: colorise.cprint(TEXT, fg='red', file=stream)),
+        ('cprint_style', lambda: colorise.cprint(TEXT, style=style,
+                                                  file=stream)),
+        ('fprint', lambda: colorise.fprint(
+            '{fg=red}Hello {bg=blue,bold}world {reset}' + TEXT,
+            file=stream,
+        )),
+        ('compiled_template', lambda: template.print('INFO', TEXT,
+                                                     file=stream)),
+        ('highlight', lambda: colorise.highlight(TEXT, indices, fg='red',
+                                                 file=stream)),
+        ('highlight_spans', lambda: colorise.highlight_spans(TEXT, spans,
+                                                             file=stream)),
+        ('set_reset_color', set_reset_color),
+    ]
+
+
+def color_benchmarks(color_count):
+    """Return benchmarks of color resolution for each color format."""
+    def make(value, cached):
+        if cached:
+            return lambda: colorise.cluts.get_color(value, color_count,
+                                                    colorise.nix.cluts)
+
+        return lambda: colorise.cluts._resolve_color(
+            value,
+            color_count,
+            colorise.nix.cluts,
+            False,
+            [],
+            sys.stdout,
+        )
+
+    benchmarks = []
+
+    for name, value in COLOR_FORMATS:
+        benchmarks.append(('get_color_' + name, make(value, True)))
+        benchmarks.append(('resolve_color_' + name, make(value, False)))
+
+    return benchmarks
+
+
+def clut_benchmarks():
+    """Return benchmarks of closest color look-ups for each CLUT."""
+    def linear(clut):
+        return lambda: [closest_color(rgb, clut) for rgb in RGB_COLORS]
+
+    def indexed(clut):
+        index = get_clut_index(clut)
+
+        return lambda: [index.closest(rgb) for rgb in RGB_COLORS]
+
+    benchmarks = []
+
+    for name, clut in get_cluts():
+        benchmarks.append(('closest_color_' + name, linear(clut)))
+        benchmarks.append(('clut_index_' + name, indexed(clut)))
+
+    return benchmarks
+
+
+def measure(func, repeat, min_time):
+    """Return the best time per call of a function in seconds."""
+    timer = timeit.Timer(func)
+    number = 1
+
+    # Find a number of calls that takes at least min_time
+    while True:
+        elapsed = timer.timeit(number)
+
+        if elapsed >= min_time:
+            break
+
+        number *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed))
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(name_filter, repeat, min_time):
+    """Run all benchmarks and return a mapping of names to results."""
+    results = {}
+
+    for color_count in COLOR_COUNTS:
+        stream = io.StringIO()
+
+        with force_num_colors(color_count):
+            colorise.refresh_capabilities()
+            benchmarks = output_benchmarks(stream) +\
+                color_benchmarks(color_count)
+
+            for name, func in benchmarks:
+                name = '{0}[{1}]'.format(name, color_count)
+
+                if name_filter and name_filter not in name:
+                    continue
+
+                results[name] = measure(func, repeat, min_time)
+                print('{0:<40} {1:>12.3f} us'.format(name,
+                                                     results[name] * 1e6))
+
+                # Avoid growing the stream indefinitely
+                stream.seek(0)
+                stream.truncate()
+
+    colorise.refresh_capabilities()
+
+    for name, func in clut_benchmarks():
+        if name_filter and name_filter not in name:
+            continue
+
+        results[name] = measure(func, repeat, min_time)
+        print('{0:<40} {1:>12.3f} us'.format(name, results[name] * 1e6))
+
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print a comparison with a baseline and return True on regressions."""
+    regressed = False
+
+    print()
+    print('{0:<40} {1:>12} {2:>12} {3:>8}'.format('benchmark', 'baseline',
+                                                  'current', 'ratio'))
+
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+
+        ratio = results[name] / baseline[name]
+        flag = ''
+
+        if ratio > 1 + threshold:
+            flag = 'REGRESSION'
+            regressed = True
+        elif ratio < 1 - threshold:
+            flag = 'improved'
+
+        print('{0:<40} {1:>9.3f} us {2:>9.3f} us {3:>8.2f} {4}'.format(
+            name,
+            baseline[name] * 1e6,
+            results[name] * 1e6,
+            ratio,
+            flag,
+        ))
+
+    return regressed
+
+
+def main():
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', default='',
+                        help='Only run benchmarks whose name contains this')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Number of timing repetitions per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='Minimum time in seconds of each repetition')
+    parser.add_argument('--save', metavar='PATH',
+                        help='Save results as JSON to this path')
+    parser.add_argument('--compare', metavar='PATH',
+                        help='Compare results with a saved baseline')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    results = run(args.filter, args.repeat, args.min_time)
+
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump({
+                'colorise': colorise.__version__,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+                'results': results,
+            }, fh, indent=4, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)['results']
+
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,19 +3,17 @@
 
 """Output a 8-bit colored sprite of Mario."""
 
-import colorise
+import colorise.image
+from colorise.cluts import to_rgb
 
 
 def mario():
     """Print a mario sprite to stdout."""
-    width = 12
-    height = 16
-
     # Source: https://github.com/BrianEnigma/NES_Sprite_Display
     yellow = '#e39d25'
     red = '#b13425'
     green = '#6a6b04'
-    color_table = [None, red, green, yellow]
+    color_table = [None, to_rgb(red), to_rgb(green), to_rgb(yellow)]
 
     mario_pixels = [
         [0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 0, 0],
@@ -36,11 +34,11 @@ def mario():
         [2, 2, 2, 2, 0, 0, 0, 0, 2, 2, 2, 2],
     ]
 
-    for y in range(0, height):
-        for x in range(0, width):
-            colorise.cprint('  ', bg=color_table[mario_pixels[y][x]], end='')
-
-        print()
+    # Two pixels are drawn per character so the whole sprite is output with
+    # a single write
+    colorise.image.render([
+        [color_table[idx] for idx in row] for row in mario_pixels
+    ])
 
 
 if __name__ == "__main__":
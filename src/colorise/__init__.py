@@ -4,15 +4,20 @@
 """Python module for easy, cross-platform colored output to the terminal."""
 
 import atexit
+import functools
 import itertools
 import os
-import platform
 import sys
 
-import colorise.formatter
+import colorise.capabilities
+import colorise.instrumentation
+import colorise.policy
 from colorise.attributes import Attr  # noqa: F401
+from colorise.instrumentation import flush as _flush, write as _write
+from colorise.nix.color_functions import RESET_SEQUENCE as _RESET_SEQUENCE
+from colorise.style import Style
 
-_SYSTEM_OS = platform.system().lower()
+_SYSTEM_OS = sys.platform
 
 __author__ = 'Alexander Asp Bock'
 __version__ = '1.0.1'
@@ -22,36 +27,113 @@ __all__ = [
     'redefine_colors',
     'color_names',
     'num_colors',
+    'refresh_capabilities',
+    'set_output_policy',
+    'colors_enabled',
+    'enable_stats',
+    'stats',
+    'reset_stats',
+    'enable_minimal_escapes',
     'set_color',
     'reset_color',
     'cprint',
+    'cformat',
     'fprint',
-    'highlight'
+    'fformat',
+    'compile',
+    'highlight',
+    'hformat',
+    'highlight_spans',
+    'hformat_spans',
+    'highlight_stream',
+    'gradient',
+    'gformat',
+    'buffered',
+    'Style',
 ]
 
-# Determine which platform-specific color manager to import
-if _SYSTEM_OS.startswith('win'):
-    from colorise.win.color_functions import (
-        num_colors as _num_colors,
-        redefine_colors as _redefine_colors,
-        reset_color as _reset_color,
-        set_color as _set_color,
-    )
-    from colorise.win.win32_functions import (
-        can_redefine_colors as _can_redefine_colors,
-        restore_console_modes,
-    )
+# Set when the platform-specific functions have been imported
+_backend_loaded = False
+
+# Set when minimal escapes are enabled by colorise.sgr which is only imported
+# when they are first enabled
+_minimal_escapes = False
+
+
+def _load_backend():
+    """Import the platform-specific color functions.
+
+    This is deferred until colors are first used so importing colorise stays
+    cheap, in particular on Windows where it loads and sets up kernel32.
+
+    """
+    global _backend_loaded
+    global _can_redefine_colors, _num_colors, _redefine_colors
+    global _reset_color, _set_color, _set_style, _supports_ansi
+
+    if _SYSTEM_OS.startswith('win'):
+        from colorise.win.color_functions import (
+            num_colors as _num_colors,
+            redefine_colors as _redefine_colors,
+            reset_color as _reset_color,
+            set_color as _set_color,
+            set_style as _set_style,
+            supports_ansi as _supports_ansi,
+        )
+        from colorise.win.win32_functions import (
+            can_redefine_colors as _can_redefine_colors,
+        )
+    else:
+        from colorise.nix.cluts import can_redefine_colors as _can_redefine_colors
+        from colorise.nix.color_functions import (
+            num_colors as _num_colors,
+            redefine_colors as _redefine_colors,
+            reset_color as _reset_color,
+            set_color as _set_color,
+            set_style as _set_style,
+            supports_ansi as _supports_ansi,
+        )
+
+    _backend_loaded = True
+
+
+def _lazy_backend_function(name):
+    """Return a placeholder that loads the backend and calls a function.
+
+    Loading the backend replaces all placeholders so later calls go directly
+    to the platform-specific functions. Placeholders that were stored
+    elsewhere before that keep working.
+
+    """
+    def load_and_call(*args, **kwargs):
+        if not _backend_loaded:
+            _load_backend()
+
+        return globals()[name](*args, **kwargs)
+
+    return load_and_call
+
 
+_can_redefine_colors = _lazy_backend_function('_can_redefine_colors')
+_num_colors = _lazy_backend_function('_num_colors')
+_redefine_colors = _lazy_backend_function('_redefine_colors')
+_reset_color = _lazy_backend_function('_reset_color')
+_set_color = _lazy_backend_function('_set_color')
+_set_style = _lazy_backend_function('_set_style')
+_supports_ansi = _lazy_backend_function('_supports_ansi')
+
+
+def _restore_console_modes():
+    """Restore the console modes on Windows if they could have changed."""
+    if _backend_loaded:
+        from colorise.win.win32_functions import restore_console_modes
+
+        restore_console_modes()
+
+
+if _SYSTEM_OS.startswith('win'):
     # Ensure that the console mode set before colorise was loaded is restored
-    atexit.register(restore_console_modes)
-else:
-    from colorise.nix.cluts import can_redefine_colors as _can_redefine_colors
-    from colorise.nix.color_functions import (
-        num_colors as _num_colors,
-        redefine_colors as _redefine_colors,
-        reset_color as _reset_color,
-        set_color as _set_color,
-    )
+    atexit.register(_restore_console_modes)
 
 
 def num_colors():
@@ -59,6 +141,106 @@ def num_colors():
     return _num_colors()
 
 
+def refresh_capabilities():
+    """Invalidate cached terminal capabilities so they are detected again.
+
+    Capabilities are also refreshed automatically when any of the environment
+    variables used for detection change.
+
+    """
+    colorise.capabilities.refresh()
+
+
+def set_output_policy(policy):
+    """Set the policy that decides whether colors are output.
+
+    The policy is one of:
+
+    * 'environment' (default): Output colors unless the NO_COLOR environment
+      variable is set to a non-empty value. A FORCE_COLOR environment
+      variable set to anything but an empty value or '0' forces colors on.
+    * 'auto': Like 'environment' but also disable colors when writing to
+      streams that are not terminals, when TERM is 'dumb' or when CLICOLOR is
+      '0' unless CLICOLOR_FORCE is set to anything but '0'.
+    * 'always' and 'never': Always or never output colors.
+
+    When colors are disabled, all functions behave as if enabled=False was
+    passed and colors are never resolved. Decisions are cached per stream so
+    call :py:func:`refresh_capabilities` after changing these environment
+    variables at runtime.
+
+    """
+    colorise.policy.set_policy(policy)
+
+
+def colors_enabled(file=sys.stdout):
+    """Return True if the output policy allows colors for a stream."""
+    return colorise.policy.colors_enabled(file)
+
+
+def enable_stats(enabled=True):
+    """Enable or disable collection of statistics returned by stats.
+
+    Statistics are disabled by default and add negligible overhead when
+    disabled.
+
+    """
+    colorise.instrumentation.enable(enabled)
+
+
+def stats():
+    """Return a dictionary of statistics collected since the last reset.
+
+    Statistics are only collected after calling :py:func:`enable_stats` and
+    include:
+
+    * 'writes', 'flushes', 'characters_written' and 'escape_bytes': Writes
+      and flushes issued to streams, the number of characters written and how
+      many of them were part of ANSI escape sequences.
+    * 'streams': The same counts per stream name (e.g. '<stdout>').
+    * 'set_color_calls' and 'reset_color_calls': Calls to
+      :py:func:`set_color` and :py:func:`reset_color`, including those made
+      internally when printing to consoles that do not support ANSI escape
+      sequences.
+    * 'capability_probes': Terminal capabilities that were not cached.
+    * 'color_lookups', 'color_cache_hits' and 'color_cache_misses': Colors
+      resolved and how many were found in the color cache.
+    * 'color_resolution_time' and 'approximation_time': Cumulative seconds
+      spent resolving colors and approximating them with the closest color
+      of a color look-up table.
+
+    """
+    return colorise.instrumentation.snapshot()
+
+
+def reset_stats():
+    """Reset all collected statistics to zero."""
+    colorise.instrumentation.reset()
+
+
+def enable_minimal_escapes(enabled=True):
+    """Enable or disable minimal escape sequences on ANSI streams.
+
+    Normally, colors and attributes are reset before and after all colored
+    output. With minimal escapes, the colors and attributes each stream was
+    left in are tracked instead and only the escape codes needed to change
+    them are written, e.g. nothing when printing in the same colors again or
+    only the code that turns off bold instead of resetting and setting the
+    colors again. This can considerably shrink colorful output such as
+    tables.
+
+    Colors and attributes are then no longer reset after each call so they
+    remain set for output written without colorise until changed by another
+    call, reset with :py:func:`reset_color` or reset when the interpreter
+    exits. Background colors are turned off before line endings. Output to
+    consoles that do not interpret ANSI escape sequences is not affected.
+
+    """
+    import colorise.sgr
+
+    colorise.sgr.enable(enabled)
+
+
 def can_redefine_colors(file):
     """Return True if the terminal supports redefinition of colors.
 
@@ -106,21 +288,103 @@ def color_names():
     ]
 
 
-def set_color(fg=None, bg=None, attributes=None, file=sys.stdout):
+def set_color(fg=None, bg=None, attributes=None, file=sys.stdout, style=None):
     """Set the current colors.
 
-    If no arguments are given, sets default colors.
+    If no arguments are given, sets default colors. A precompiled style can be
+    given instead of fg, bg and attributes.
 
     """
-    if attributes is None:
-        attributes = []
+    if colorise.instrumentation._enabled:
+        colorise.instrumentation.increment('set_color_calls')
+
+    if not colorise.policy.colors_enabled(file):
+        return
+    elif _minimal_escapes and _supports_ansi(file):
+        _set_style_minimal(_get_style(fg, bg, attributes, style), file)
+    elif style is not None:
+        _check_style_arguments(fg, bg, attributes)
+        _set_style(style, file)
+    else:
+        if attributes is None:
+            attributes = []
+
+        _set_color(fg, bg, attributes, file)
+
+
+def _set_style_minimal(style, file):
+    """Set a style writing only the escape codes that change the colors."""
+    state = colorise.sgr.get_state(file)
+
+    if state is None:
+        # The result of setting a style in an unknown state is also unknown
+        _set_style(style, file)
+        return
+
+    target = colorise.sgr.apply_style(state, style, num_colors())
+    sequence = colorise.sgr.transition(state, target)
+    colorise.sgr.set_state(file, target)
+
+    if sequence:
+        _write(file, sequence)
+
+
+def _check_style_arguments(fg, bg, attributes):
+    """Raise an error if a style is given together with loose arguments."""
+    if fg or bg or attributes:
+        raise ValueError('Cannot use a style together with fg, bg or '
+                         'attributes')
+
+
+def _get_style(fg, bg, attributes, style):
+    """Return the given style or a new style from loose arguments."""
+    if style is not None:
+        _check_style_arguments(fg, bg, attributes)
+
+        return style
+
+    return Style(fg, bg, attributes)
+
+
+def _index_ranges(indices):
+    """Return ranges of consecutive indices as start and end index pairs.
 
-    _set_color(fg, bg, attributes, file)
+    E.g. [0, 2, 3, 5, 6] -> [(0, 1), (2, 4), (5, 7)]
+
+    Duplicate indices are ignored.
+
+    """
+    # NOTE: The lambda syntax is necessary to support both Python 2 and 3
+    groups = itertools.groupby(
+        enumerate(sorted(set(indices))),
+        lambda x: x[0] - x[1],
+    )
+
+    for _, group in groups:
+        # Get the starting and ending indices of the group
+        group = list(group)
+
+        yield group[0][1], group[-1][1] + 1
 
 
 def reset_color(file=sys.stdout):
     """Reset all colors and attributes."""
-    _reset_color(file)
+    if colorise.instrumentation._enabled:
+        colorise.instrumentation.increment('reset_color_calls')
+
+    if not colorise.policy.colors_enabled(file):
+        return
+    elif _minimal_escapes and _supports_ansi(file):
+        sequence = colorise.sgr.transition(
+            colorise.sgr.get_state(file),
+            colorise.sgr.DEFAULT,
+        )
+        colorise.sgr.set_state(file, colorise.sgr.DEFAULT)
+
+        if sequence:
+            _write(file, sequence)
+    else:
+        _reset_color(file)
 
 
 def cprint(
@@ -131,12 +395,14 @@ def cprint(
     end=os.linesep,
     file=sys.stdout,
     enabled=True,
+    style=None,
 ):
     """Print a string to a target stream with colors and attributes.
 
     The fg and bg keywords specify foreground- and background colors while
-    attributes is a list of desired attributes. The remaining two keyword
-    arguments are the same as Python's built-in print function.
+    attributes is a list of desired attributes. Alternatively, a precompiled
+    style can be given instead. The remaining two keyword arguments are the
+    same as Python's built-in print function.
 
     Colors and attributes are reset before the function returns.
 
@@ -144,31 +410,109 @@ def cprint(
     if attributes is None:
         attributes = []
 
-    # Flush any remaining stuff before resetting colors
-    file.flush()
-
-    if not enabled:
-        file.write(string)
-        file.write(end)
-        file.flush()
+    if not enabled or not colorise.policy.colors_enabled(file):
+        _write_plain(file, string + end)
+    elif _supports_ansi(file):
+        # Colors are embedded in the output so write everything at once
+        if _minimal_escapes:
+            style = _get_style(fg, bg, attributes, style)
+            output = _format_minimal(string, [(0, len(string), style)], end,
+                                     file)
+        else:
+            output = _format_style(
+                string,
+                _get_style(fg, bg, attributes, style),
+            ) + end
+
+        _write(file, output)
     else:
+        # Flush any remaining stuff before resetting colors
+        _flush(file)
         reset_color(file)
-        set_color(fg, bg, attributes, file)
-        file.write(string)
-        file.flush()  # Flush before resetting colors
+        set_color(fg, bg, attributes, file, style)
+        _write(file, string)
+        _flush(file)  # Flush before resetting colors
         reset_color(file)
 
         # Make sure to print the end keyword after resetting so the next line
         # is not affected by a newline or similar
-        file.write(end)
-        file.flush()  # Flush before resetting colors
+        _write(file, end)
+
+    _flush(file)
 
 
-# Global color formatter instance
-_COLOR_FORMATTER = colorise.formatter.ColorFormatter(set_color, reset_color)
+def cformat(
+    string,
+    fg=None,
+    bg=None,
+    attributes=None,
+    enabled=True,
+    style=None,
+):
+    """Return a string with embedded ANSI escape sequences.
+
+    The arguments are the same as for :py:func:`cprint` and the result is what
+    cprint would output on terminals that interpret ANSI escape sequences,
+    excluding the ending. This allows output to be built and written in one
+    go.
+
+    """
+    if not enabled or not colorise.policy.colors_enabled():
+        return string
+
+    return _format_style(string, _get_style(fg, bg, attributes, style))
 
 
-def fprint(fmt, autoreset=True, end=os.linesep, file=sys.stdout, enabled=True):
+def _format_style(string, style):
+    """Return a string with embedded ANSI escape sequences for a style."""
+    return _RESET_SEQUENCE + style.ansi(num_colors()) + string +\
+        _RESET_SEQUENCE
+
+
+# Maximum number of compiled format strings cached by fprint and fformat
+_TEMPLATE_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=_TEMPLATE_CACHE_SIZE)
+def _get_cached_template(fmt, autoreset, styles):
+    """Return a cached template for fprint and fformat."""
+    return _make_template(fmt, autoreset, dict(styles), False)
+
+
+def _make_template(fmt, autoreset, styles, replacement_fields):
+    """Create a template using the platform-specific color functions."""
+    import colorise.template
+
+    if not _backend_loaded:
+        _load_backend()
+
+    return colorise.template.Template(
+        fmt,
+        _set_style,
+        reset_color,
+        num_colors,
+        _supports_ansi,
+        autoreset=autoreset,
+        styles=styles,
+        replacement_fields=replacement_fields,
+    )
+
+
+def _get_template(fmt, autoreset, styles):
+    """Return a template for fprint and fformat."""
+    styles = tuple(sorted(styles.items())) if styles else ()
+
+    return _get_cached_template(fmt, autoreset, styles)
+
+
+def fprint(
+    fmt,
+    autoreset=True,
+    end=os.linesep,
+    file=sys.stdout,
+    enabled=True,
+    styles=None,
+):
     """Print a string with color formatting.
 
     The autoreset keyword controls if colors and attributes are reset before
@@ -184,24 +528,53 @@ def fprint(fmt, autoreset=True, end=os.linesep, file=sys.stdout, enabled=True):
     would print 'Hi' in blue foreground colors but 'world' only with a red
     background color since colors are reset when '{bg=red}' is encountered.
 
+    The styles keyword is an optional mapping of names to precompiled styles
+    that can be used as format fields:
+
+    >>> warn = colorise.Style(fg='yellow')
+    >>> colorise.fprint('{warn}Careful', styles={'warn': warn})
+
     The remaining two keyword arguments are the same as Python's built-in print
     function.
 
     Colors and attribtues are reset before the function returns.
 
+    Format strings are parsed once and cached so fprint does not share any
+    mutable state between calls and is safe to call from multiple threads.
+
     """
-    _COLOR_FORMATTER.autoreset = autoreset
-    _COLOR_FORMATTER.file = file
-    _COLOR_FORMATTER.enabled = enabled
-    _COLOR_FORMATTER.format(fmt)
+    _get_template(fmt, autoreset, styles).print(
+        end=end,
+        file=file,
+        enabled=enabled,
+    )
 
-    if enabled:
-        file.flush()  # Flush before resetting colors
-        reset_color(file)
 
-    # Make sure to print the end keyword after resetting so the next line is
-    # not affected by a newline or similar
-    file.write(end)
+def compile(fmt, autoreset=True, styles=None):
+    """Compile a color format string into a reusable template.
+
+    The format string is parsed once and the returned template can be printed
+    many times with its print method which takes the same keyword arguments as
+    :py:func:`fprint` in addition to arguments for any replacement fields:
+
+    >>> template = colorise.compile('{fg=red}Error:{reset} {0}')
+    >>> template.print('File not found')
+
+    Unknown colors or attributes raise a ValueError immediately.
+
+    """
+    return _make_template(fmt, autoreset, styles, True)
+
+
+def fformat(fmt, autoreset=True, enabled=True, styles=None):
+    """Return a formatted string with embedded ANSI escape sequences.
+
+    The arguments are the same as for :py:func:`fprint` and the result is what
+    fprint would output on terminals that interpret ANSI escape sequences,
+    excluding the ending.
+
+    """
+    return _get_template(fmt, autoreset, styles).render(enabled=enabled)
 
 
 def highlight(
@@ -213,6 +586,7 @@ def highlight(
     end=os.linesep,
     file=sys.stdout,
     enabled=True,
+    style=None,
 ):
     """Highlight characters using indices and print to a target stream.
 
@@ -221,8 +595,9 @@ def highlight(
     are ignored.
 
     fg and bg specify foreground- and background colors while attributes is a
-    list of desired attributes. The remaining two keyword arguments are the
-    same as Python's built-in print function.
+    list of desired attributes. Alternatively, a precompiled style can be given
+    instead. The remaining two keyword arguments are the same as Python's
+    built-in print function.
 
     Colors and attribtues are reset before the function returns.
 
@@ -230,38 +605,44 @@ def highlight(
     if attributes is None:
         attributes = []
 
-    if not string or not indices or not (fg or bg or attributes)\
-            or not enabled:
-        file.write(string + end)
+    if not string or not indices or not (fg or bg or attributes or style)\
+            or not enabled or not colorise.policy.colors_enabled(file):
+        _write_plain(file, string + end)
         return
 
-    idx = 0
+    if _supports_ansi(file):
+        # Colors are embedded in the output so write everything at once
+        if _minimal_escapes:
+            style = _get_style(fg, bg, attributes, style)
+            runs = [
+                (start_idx, min(end_idx, len(string)), style)
+                for start_idx, end_idx in _index_ranges(indices)
+                if start_idx < len(string)
+            ]
+            output = _format_minimal(string, runs, end, file)
+        else:
+            output = hformat(string, indices, fg, bg, attributes,
+                             style=style) + end
+
+        _write(file, output)
+        return
 
-    # Group consecutive indices, e.g. [0, 2, 3, 5, 6] -> [(0), (2, 3), (5, 6)]
-    # NOTE: The lambda syntax is necessary to support both Python 2 and 3
-    groups = itertools.groupby(
-        enumerate(sorted(indices)),
-        lambda x: x[0] - x[1],
-    )
+    idx = 0
 
     # Flush any remaining stuff before resetting colors
-    file.flush()
+    _flush(file)
     reset_color(file)
 
-    for _, group in groups:
-        # Get the starting and ending indices of the group
-        group = list(group)
-        start_idx, end_idx = group[0][1], group[-1][1] + 1
-
+    for start_idx, end_idx in _index_ranges(indices):
         # Write anything up until the start index of the current group
-        file.write(string[idx:start_idx])
-        file.flush()
+        _write(file, string[idx:start_idx])
+        _flush(file)
 
-        set_color(fg, bg, attributes, file)
+        set_color(fg, bg, attributes, file, style)
 
         # Write the range of characters specified by the group
-        file.write(string[start_idx:end_idx])
-        file.flush()
+        _write(file, string[start_idx:end_idx])
+        _flush(file)
 
         reset_color(file)
 
@@ -270,9 +651,372 @@ def highlight(
 
     # Write anything that is left to write
     if idx < len(string):
-        file.write(string[idx:])
+        _write(file, string[idx:])
 
-    file.write(end)
+    _write(file, end)
+
+
+def hformat(
+    string,
+    indices,
+    fg=None,
+    bg=None,
+    attributes=None,
+    enabled=True,
+    style=None,
+):
+    """Return a highlighted string with embedded ANSI escape sequences.
+
+    The arguments are the same as for :py:func:`highlight` and the result is
+    what highlight would output on terminals that interpret ANSI escape
+    sequences, excluding the ending.
+
+    """
+    style = _get_style(fg, bg, attributes, style)
+
+    if not string or not indices or not style or not enabled\
+            or not colorise.policy.colors_enabled():
+        return string
+
+    sequence = style.ansi(num_colors())
+    parts = [_RESET_SEQUENCE]
+    idx = 0
+
+    for start_idx, end_idx in _index_ranges(indices):
+        parts.extend([
+            string[idx:start_idx],
+            sequence,
+            string[start_idx:end_idx],
+            _RESET_SEQUENCE,
+        ])
+        idx = end_idx
+
+    parts.append(string[idx:])
+
+    return ''.join(parts)
+
+
+def _format_runs(string, runs):
+    """Return a string with embedded ANSI escape sequences for styled runs.
+
+    Runs are sorted, non-overlapping (start, end, style) tuples.
+
+    """
+    color_count = num_colors()
+    parts = [_RESET_SEQUENCE]
+    idx = 0
+
+    for start_idx, end_idx, style in runs:
+        parts.extend([
+            string[idx:start_idx],
+            style.ansi(color_count),
+            string[start_idx:end_idx],
+            _RESET_SEQUENCE,
+        ])
+        idx = end_idx
+
+    parts.append(string[idx:])
+
+    return ''.join(parts)
+
+
+def _format_minimal(string, runs, end, file):
+    """Return output for styled runs using the least escape codes possible.
+
+    Escape codes only change the colors and attributes that the stream was
+    left in by previous output which is updated to the state left by this
+    output.
+
+    """
+    output, state = colorise.sgr.format_runs(
+        string,
+        runs,
+        colorise.sgr.get_state(file),
+        num_colors(),
+    )
+    sequence, state = colorise.sgr.format_end(end, state)
+    colorise.sgr.set_state(file, state)
+
+    return output + sequence + end
+
+
+def _write_plain(file, data):
+    """Write uncolored output to a target stream.
+
+    With minimal escapes enabled, colors left set on the stream are reset
+    first.
+
+    """
+    if _minimal_escapes:
+        data = colorise.sgr.plain_prefix(file) + data
+
+    _write(file, data)
+
+
+def _print_runs(string, runs, end, file):
+    """Print a string with styled runs to a target stream."""
+    if _supports_ansi(file):
+        # Colors are embedded in the output so write everything at once
+        if _minimal_escapes:
+            _write(file, _format_minimal(string, runs, end, file))
+        else:
+            _write(file, _format_runs(string, runs) + end)
+
+        return
+
+    idx = 0
+
+    # Flush any remaining stuff before resetting colors
+    _flush(file)
+    reset_color(file)
+
+    for start_idx, end_idx, style in runs:
+        _write(file, string[idx:start_idx])
+        _flush(file)
+        _set_style(style, file)
+        _write(file, string[start_idx:end_idx])
+        _flush(file)
+        reset_color(file)
+        idx = end_idx
+
+    _write(file, string[idx:])
+    _write(file, end)
+
+
+def highlight_spans(
+    string,
+    spans,
+    end=os.linesep,
+    file=sys.stdout,
+    enabled=True,
+):
+    """Highlight spans of characters with styles and print to a target stream.
+
+    Spans are (start, end, style) tuples where start is inclusive, end is
+    exclusive and style is a :py:class:`colorise.Style`. Spans do not have to
+    be sorted and may overlap in which case the foreground and background
+    colors of later spans take precedence while attributes are combined:
+
+    >>> error = colorise.Style(fg='red')
+    >>> match = colorise.Style(attributes=[colorise.Attr.Underline])
+    >>> colorise.highlight_spans('a = b +', [(0, 7, match), (6, 7, error)])
+
+    Parts of spans that are out of bounds are ignored. Unlike
+    :py:func:`colorise.highlight`, the work done depends on the number of
+    spans rather than the number of highlighted characters. The remaining two
+    keyword arguments are the same as Python's built-in print function.
+
+    Colors and attributes are reset before the function returns.
+
+    """
+    import colorise.spans
+
+    if not enabled or not colorise.policy.colors_enabled(file):
+        _write_plain(file, string + end)
+        return
+
+    runs = colorise.spans.merge_spans(len(string), spans)
+
+    if not runs:
+        _write_plain(file, string + end)
+        return
+
+    _print_runs(string, runs, end, file)
+
+
+def hformat_spans(string, spans, enabled=True):
+    """Return a string with spans highlighted using ANSI escape sequences.
+
+    The arguments are the same as for :py:func:`highlight_spans` and the
+    result is what highlight_spans would output on terminals that interpret
+    ANSI escape sequences, excluding the ending.
+
+    """
+    import colorise.spans
+
+    if not enabled or not colorise.policy.colors_enabled():
+        return string
+
+    runs = colorise.spans.merge_spans(len(string), spans)
+
+    if not runs:
+        return string
+
+    return _format_runs(string, runs)
+
+
+def highlight_stream(
+    patterns,
+    infile,
+    outfile=sys.stdout,
+    fg=None,
+    bg=None,
+    attributes=None,
+    enabled=True,
+    style=None,
+    chunk_size=None,
+    lookback=None,
+):
+    """Copy a stream to another stream and highlight regex matches.
+
+    The patterns argument is a regular expression or a list of them, either
+    as strings or compiled. Matches of any pattern are highlighted using the
+    given colors and attributes or precompiled style while all other text is
+    copied unchanged:
+
+    >>> with open('server.log') as log:
+    ...     colorise.highlight_stream(r'ERROR|WARNING', log, fg='red')
+
+    The input is read chunk_size characters at a time, 65536 by default, so
+    memory use is bounded regardless of its size. Matches that cross chunk
+    boundaries are found if they are at most lookback characters long, 1024
+    by default, while longer matches may be highlighted in several adjacent
+    pieces.
+
+    Colors and attributes are reset before the function returns.
+
+    """
+    import colorise.spans
+    import colorise.streaming
+
+    if chunk_size is None:
+        chunk_size = colorise.streaming._DEFAULT_CHUNK_SIZE
+
+    if lookback is None:
+        lookback = colorise.streaming._DEFAULT_LOOKBACK
+
+    style = _get_style(fg, bg, attributes, style)
+
+    if not style or not enabled or\
+            not colorise.policy.colors_enabled(outfile):
+        # Nothing is highlighted so copy the input without searching it
+        for text in colorise.streaming.iter_chunks(infile, chunk_size):
+            _write_plain(outfile, text)
+
+        _flush(outfile)
+        return
+
+    matches = colorise.streaming.iter_matches(
+        patterns,
+        infile,
+        chunk_size,
+        lookback,
+    )
+
+    for text, spans in matches:
+        if not spans:
+            _write_plain(outfile, text)
+        else:
+            # Matches of different patterns may overlap
+            runs = colorise.spans.merge_spans(
+                len(text),
+                [(start, end, style) for start, end in spans],
+            )
+            _print_runs(text, runs, '', outfile)
+
+    _flush(outfile)
+
+
+def gradient(
+    string,
+    stops,
+    space='rgb',
+    background=False,
+    attributes=None,
+    end=os.linesep,
+    file=sys.stdout,
+    enabled=True,
+):
+    """Print a string with colors along a gradient to a target stream.
+
+    Stops are one or more colors in any format supported by colorise that are
+    spread evenly across the string, e.g. ['red', '#0000ff'], and the colors
+    in between are interpolated in the 'rgb', 'hsv' or 'hls' color space.
+    Background colors are used instead of foreground colors if background is
+    True and attributes are applied to all characters:
+
+    >>> colorise.gradient('Hello world', ['#ff0000', '#0000ff'], space='hsv')
+
+    Neighbouring characters whose colors look the same on the terminal share
+    escape sequences so few are written when the terminal supports few
+    colors. The remaining two keyword arguments are the same as Python's
+    built-in print function.
+
+    Colors and attributes are reset before the function returns.
+
+    """
+    import colorise.gradients
+
+    if not string or not enabled or\
+            not colorise.policy.colors_enabled(file):
+        _write_plain(file, string + end)
+        return
+
+    runs = colorise.gradients.gradient_runs(
+        string,
+        stops,
+        num_colors(),
+        space,
+        background,
+        attributes,
+    )
+    _print_runs(string, runs, end, file)
+
+
+def gformat(
+    string,
+    stops,
+    space='rgb',
+    background=False,
+    attributes=None,
+    enabled=True,
+):
+    """Return a string colored along a gradient with ANSI escape sequences.
+
+    The arguments are the same as for :py:func:`gradient` and the result is
+    what gradient would output on terminals that interpret ANSI escape
+    sequences, excluding the ending.
+
+    """
+    import colorise.gradients
+
+    if not string or not enabled or not colorise.policy.colors_enabled():
+        return string
+
+    runs = colorise.gradients.gradient_runs(
+        string,
+        stops,
+        num_colors(),
+        space,
+        background,
+        attributes,
+    )
+
+    return _format_runs(string, runs)
+
+
+def buffered(
+    file=sys.stdout,
+    threshold=None,
+):
+    """Return a buffered stream that coalesces output to a target stream.
+
+    Use it as a context manager and pass it as the file argument to colorise
+    functions. Output is collected in memory and written to the target stream
+    in a single write when more than threshold characters, 65536 by default,
+    are buffered and when the context exits:
+
+    >>> with colorise.buffered(sys.stdout) as out:
+    ...     for line in lines:
+    ...         colorise.cprint(line, fg='red', file=out)
+
+    """
+    import colorise.buffering
+
+    if threshold is None:
+        threshold = colorise.buffering._DEFAULT_THRESHOLD
+
+    return colorise.buffering.BufferedStream(file, threshold)
 
 
 def safe_atexit_reset_colors():
@@ -286,6 +1030,12 @@ def safe_atexit_reset_colors():
     # evaluated after having been restored by pytest
     #
     # See https://github.com/pytest-dev/pytest/issues/5502
+    #
+    # Nothing can have been colored if the platform-specific functions were
+    # never loaded so avoid loading them just to exit
+    if not _backend_loaded:
+        return
+
     if not sys.stdout.closed:
         reset_color(sys.stdout)
 
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Colored output for asyncio applications.
+
+The functions in this module mirror :py:func:`colorise.cprint`,
+:py:func:`colorise.fprint` and :py:func:`colorise.highlight` but write to an
+:py:class:`asyncio.StreamWriter` or any object with a write method accepting
+bytes and a drain coroutine. Output is rendered with embedded ANSI escape
+sequences, written in one go and followed by awaiting drain so that slow
+consumers apply backpressure instead of blocking the event loop with a flush.
+
+>>> reader, writer = await asyncio.open_connection('localhost', 8888)
+>>> await colorise.aio.acprint(writer, 'Connected', fg='green')
+
+"""
+
+import os
+
+import colorise
+import colorise.instrumentation
+
+# Default encoding of output written to stream writers
+_DEFAULT_ENCODING = 'utf-8'
+
+
+async def _write(writer, string, end, encoding, errors):
+    """Encode and write a string to a stream writer and wait for it."""
+    data = string + end
+
+    if colorise.instrumentation._enabled:
+        colorise.instrumentation.record_write(writer, data)
+
+    writer.write(data.encode(encoding, errors))
+    await writer.drain()
+
+
+async def acprint(
+    writer,
+    string,
+    fg=None,
+    bg=None,
+    attributes=None,
+    end=os.linesep,
+    enabled=True,
+    style=None,
+    encoding=_DEFAULT_ENCODING,
+    errors='strict',
+):
+    """Write a string to a stream writer with colors and attributes.
+
+    The arguments are the same as for :py:func:`colorise.cprint` except that
+    output is written to the writer and encoded using encoding and errors.
+
+    """
+    await _write(
+        writer,
+        colorise.cformat(string, fg, bg, attributes, enabled, style),
+        end,
+        encoding,
+        errors,
+    )
+
+
+async def afprint(
+    writer,
+    fmt,
+    autoreset=True,
+    end=os.linesep,
+    enabled=True,
+    styles=None,
+    encoding=_DEFAULT_ENCODING,
+    errors='strict',
+):
+    """Write a string with color formatting to a stream writer.
+
+    The arguments are the same as for :py:func:`colorise.fprint` except that
+    output is written to the writer and encoded using encoding and errors.
+
+    """
+    await _write(
+        writer,
+        colorise.fformat(fmt, autoreset, enabled, styles),
+        end,
+        encoding,
+        errors,
+    )
+
+
+async def ahighlight(
+    writer,
+    string,
+    indices,
+    fg=None,
+    bg=None,
+    attributes=None,
+    end=os.linesep,
+    enabled=True,
+    style=None,
+    encoding=_DEFAULT_ENCODING,
+    errors='strict',
+):
+    """Write a string with highlighted characters to a stream writer.
+
+    The arguments are the same as for :py:func:`colorise.highlight` except
+    that output is written to the writer and encoded using encoding and
+    errors.
+
+    """
+    await _write(
+        writer,
+        colorise.hformat(string, indices, fg, bg, attributes, enabled, style),
+        end,
+        encoding,
+        errors,
+    )
@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Parsing of text with embedded ANSI escape sequences.
+
+Colored output from :py:func:`colorise.cformat` and friends contains escape
+sequences that take up no space on the terminal. This module strips them,
+measures the number of columns text takes up and truncates text without
+cutting escape sequences in half, e.g. to align colored table cells:
+
+>>> cell = colorise.cformat('漢字', fg='red')
+>>> colorise.ansi.visible_width(cell)
+4
+
+Escape sequences are found by a single precompiled pattern in one pass over
+the text and text without any escape sequences is handled without it.
+
+"""
+
+import re
+from bisect import bisect_right
+
+from colorise.sgr import DEFAULT, parse
+
+_ESCAPE = '\x1b'
+
+_CSI = _ESCAPE + '['
+
+# Any escape sequence, incomplete sequences at the end of a string included
+_SEQUENCE = re.compile(
+    r'\x1b(?:'
+    # Control sequences end with a final byte in the range @ to ~
+    r'\[[0-?]*[ -/]*[@-~]?'
+    # Control strings end with BEL or ST (ESC \)
+    r'|[\]PX^_].*?(?:\x07|\x1b\\|\Z)'
+    # Other sequences have optional intermediate bytes and a final byte
+    r'|[ -/]*[0-~]?'
+    r')',
+    re.DOTALL,
+)
+
+# The tables below contain the sorted start and end (exclusive) of ranges of
+# code points so a code point is in a table if bisect_right returns an odd
+# index. They were generated from the Unicode 14.0 database using Python's
+# unicodedata module where unassigned code points between ranges were merged
+# into them to keep the tables small.
+
+# Wide and fullwidth characters that take up two columns
+_WIDE = (
+    0x01100, 0x01160, 0x0231a, 0x0231c, 0x02329, 0x0232b, 0x023e9, 0x023ed,
+    0x023f0, 0x023f1, 0x023f3, 0x023f4, 0x025fd, 0x025ff, 0x02614, 0x02616,
+    0x02648, 0x02654, 0x0267f, 0x02680, 0x02693, 0x02694, 0x026a1, 0x026a2,
+    0x026aa, 0x026ac, 0x026bd, 0x026bf, 0x026c4, 0x026c6, 0x026ce, 0x026cf,
+    0x026d4, 0x026d5, 0x026ea, 0x026eb, 0x026f2, 0x026f4, 0x026f5, 0x026f6,
+    0x026fa, 0x026fb, 0x026fd, 0x026fe, 0x02705, 0x02706, 0x0270a, 0x0270c,
+    0x02728, 0x02729, 0x0274c, 0x0274d, 0x0274e, 0x0274f, 0x02753, 0x02756,
+    0x02757, 0x02758, 0x02795, 0x02798, 0x027b0, 0x027b1, 0x027bf, 0x027c0,
+    0x02b1b, 0x02b1d, 0x02b50, 0x02b51, 0x02b55, 0x02b56, 0x02e80, 0x0302a,
+    0x0302e, 0x0303f, 0x03041, 0x03097, 0x0309b, 0x03248, 0x03250, 0x04dc0,
+    0x04e00, 0x0a4c7, 0x0a960, 0x0a97d, 0x0ac00, 0x0d7a4, 0x0f900, 0x0fada,
+    0x0fe10, 0x0fe1a, 0x0fe30, 0x0fe6c, 0x0ff01, 0x0ff61, 0x0ffe0, 0x0ffe7,
+    0x16fe0, 0x16fe4, 0x16ff0, 0x1b2fc, 0x1f004, 0x1f005, 0x1f0cf, 0x1f0d0,
+    0x1f18e, 0x1f18f, 0x1f191, 0x1f19b, 0x1f200, 0x1f321, 0x1f32d, 0x1f336,
+    0x1f337, 0x1f37d, 0x1f37e, 0x1f394, 0x1f3a0, 0x1f3cb, 0x1f3cf, 0x1f3d4,
+    0x1f3e0, 0x1f3f1, 0x1f3f4, 0x1f3f5, 0x1f3f8, 0x1f43f, 0x1f440, 0x1f441,
+    0x1f442, 0x1f4fd, 0x1f4ff, 0x1f53e, 0x1f54b, 0x1f54f, 0x1f550, 0x1f568,
+    0x1f57a, 0x1f57b, 0x1f595, 0x1f597, 0x1f5a4, 0x1f5a5, 0x1f5fb, 0x1f650,
+    0x1f680, 0x1f6c6, 0x1f6cc, 0x1f6cd, 0x1f6d0, 0x1f6d3, 0x1f6d5, 0x1f6e0,
+    0x1f6eb, 0x1f6ed, 0x1f6f4, 0x1f6fd, 0x1f7e0, 0x1f7f1, 0x1f90c, 0x1f93b,
+    0x1f93c, 0x1f946, 0x1f947, 0x1fa00, 0x1fa70, 0x1faf7, 0x20000, 0x3fffe,
+)
+
+# Control characters, combining marks, format characters except the soft
+# hyphen, Hangul medial vowels and final consonants and the zero width space
+# which take up no columns
+_ZERO_WIDTH = (
+    0x00000, 0x00020, 0x0007f, 0x000a0, 0x00300, 0x00370, 0x00483, 0x0048a,
+    0x00591, 0x005be, 0x005bf, 0x005c0, 0x005c1, 0x005c3, 0x005c4, 0x005c6,
+    0x005c7, 0x005c8, 0x00600, 0x00606, 0x00610, 0x0061b, 0x0061c, 0x0061d,
+    0x0064b, 0x00660, 0x00670, 0x00671, 0x006d6, 0x006de, 0x006df, 0x006e5,
+    0x006e7, 0x006e9, 0x006ea, 0x006ee, 0x0070f, 0x00710, 0x00711, 0x00712,
+    0x00730, 0x0074b, 0x007a6, 0x007b1, 0x007eb, 0x007f4, 0x007fd, 0x007fe,
+    0x00816, 0x0081a, 0x0081b, 0x00824, 0x00825, 0x00828, 0x00829, 0x0082e,
+    0x00859, 0x0085c, 0x00890, 0x008a0, 0x008ca, 0x00903, 0x0093a, 0x0093b,
+    0x0093c, 0x0093d, 0x00941, 0x00949, 0x0094d, 0x0094e, 0x00951, 0x00958,
+    0x00962, 0x00964, 0x00981, 0x00982, 0x009bc, 0x009bd, 0x009c1, 0x009c5,
+    0x009cd, 0x009ce, 0x009e2, 0x009e4, 0x009fe, 0x00a03, 0x00a3c, 0x00a3d,
+    0x00a41, 0x00a52, 0x00a70, 0x00a72, 0x00a75, 0x00a76, 0x00a81, 0x00a83,
+    0x00abc, 0x00abd, 0x00ac1, 0x00ac9, 0x00acd, 0x00ace, 0x00ae2, 0x00ae4,
+    0x00afa, 0x00b02, 0x00b3c, 0x00b3d, 0x00b3f, 0x00b40, 0x00b41, 0x00b45,
+    0x00b4d, 0x00b57, 0x00b62, 0x00b64, 0x00b82, 0x00b83, 0x00bc0, 0x00bc1,
+    0x00bcd, 0x00bce, 0x00c00, 0x00c01, 0x00c04, 0x00c05, 0x00c3c, 0x00c3d,
+    0x00c3e, 0x00c41, 0x00c46, 0x00c57, 0x00c62, 0x00c64, 0x00c81, 0x00c82,
+    0x00cbc, 0x00cbd, 0x00cbf, 0x00cc0, 0x00cc6, 0x00cc7, 0x00ccc, 0x00cce,
+    0x00ce2, 0x00ce4, 0x00d00, 0x00d02, 0x00d3b, 0x00d3d, 0x00d41, 0x00d45,
+    0x00d4d, 0x00d4e, 0x00d62, 0x00d64, 0x00d81, 0x00d82, 0x00dca, 0x00dcb,
+    0x00dd2, 0x00dd7, 0x00e31, 0x00e32, 0x00e34, 0x00e3b, 0x00e47, 0x00e4f,
+    0x00eb1, 0x00eb2, 0x00eb4, 0x00ebd, 0x00ec8, 0x00ece, 0x00f18, 0x00f1a,
+    0x00f35, 0x00f36, 0x00f37, 0x00f38, 0x00f39, 0x00f3a, 0x00f71, 0x00f7f,
+    0x00f80, 0x00f85, 0x00f86, 0x00f88, 0x00f8d, 0x00fbd, 0x00fc6, 0x00fc7,
+    0x0102d, 0x01031, 0x01032, 0x01038, 0x01039, 0x0103b, 0x0103d, 0x0103f,
+    0x01058, 0x0105a, 0x0105e, 0x01061, 0x01071, 0x01075, 0x01082, 0x01083,
+    0x01085, 0x01087, 0x0108d, 0x0108e, 0x0109d, 0x0109e, 0x01160, 0x01200,
+    0x0135d, 0x01360, 0x01712, 0x01715, 0x01732, 0x01734, 0x01752, 0x01754,
+    0x01772, 0x01774, 0x017b4, 0x017b6, 0x017b7, 0x017be, 0x017c6, 0x017c7,
+    0x017c9, 0x017d4, 0x017dd, 0x017de, 0x0180b, 0x01810, 0x01885, 0x01887,
+    0x018a9, 0x018aa, 0x01920, 0x01923, 0x01927, 0x01929, 0x01932, 0x01933,
+    0x01939, 0x0193c, 0x01a17, 0x01a19, 0x01a1b, 0x01a1c, 0x01a56, 0x01a57,
+    0x01a58, 0x01a61, 0x01a62, 0x01a63, 0x01a65, 0x01a6d, 0x01a73, 0x01a80,
+    0x01ab0, 0x01b04, 0x01b34, 0x01b35, 0x01b36, 0x01b3b, 0x01b3c, 0x01b3d,
+    0x01b42, 0x01b43, 0x01b6b, 0x01b74, 0x01b80, 0x01b82, 0x01ba2, 0x01ba6,
+    0x01ba8, 0x01baa, 0x01bab, 0x01bae, 0x01be6, 0x01be7, 0x01be8, 0x01bea,
+    0x01bed, 0x01bee, 0x01bef, 0x01bf2, 0x01c2c, 0x01c34, 0x01c36, 0x01c38,
+    0x01cd0, 0x01cd3, 0x01cd4, 0x01ce1, 0x01ce2, 0x01ce9, 0x01ced, 0x01cee,
+    0x01cf4, 0x01cf5, 0x01cf8, 0x01cfa, 0x01dc0, 0x01e00, 0x0200b, 0x02010,
+    0x0202a, 0x0202f, 0x02060, 0x02070, 0x020d0, 0x020f1, 0x02cef, 0x02cf2,
+    0x02d7f, 0x02d80, 0x02de0, 0x02e00, 0x0302a, 0x0302e, 0x03099, 0x0309b,
+    0x0a66f, 0x0a673, 0x0a674, 0x0a67e, 0x0a69e, 0x0a6a0, 0x0a6f0, 0x0a6f2,
+    0x0a802, 0x0a803, 0x0a806, 0x0a807, 0x0a80b, 0x0a80c, 0x0a825, 0x0a827,
+    0x0a82c, 0x0a82d, 0x0a8c4, 0x0a8c6, 0x0a8e0, 0x0a8f2, 0x0a8ff, 0x0a900,
+    0x0a926, 0x0a92e, 0x0a947, 0x0a952, 0x0a980, 0x0a983, 0x0a9b3, 0x0a9b4,
+    0x0a9b6, 0x0a9ba, 0x0a9bc, 0x0a9be, 0x0a9e5, 0x0a9e6, 0x0aa29, 0x0aa2f,
+    0x0aa31, 0x0aa33, 0x0aa35, 0x0aa37, 0x0aa43, 0x0aa44, 0x0aa4c, 0x0aa4d,
+    0x0aa7c, 0x0aa7d, 0x0aab0, 0x0aab1, 0x0aab2, 0x0aab5, 0x0aab7, 0x0aab9,
+    0x0aabe, 0x0aac0, 0x0aac1, 0x0aac2, 0x0aaec, 0x0aaee, 0x0aaf6, 0x0aaf7,
+    0x0abe5, 0x0abe6, 0x0abe8, 0x0abe9, 0x0abed, 0x0abee, 0x0fb1e, 0x0fb1f,
+    0x0fe00, 0x0fe10, 0x0fe20, 0x0fe30, 0x0feff, 0x0ff00, 0x0fff9, 0x0fffc,
+    0x101fd, 0x101fe, 0x102e0, 0x102e1, 0x10376, 0x1037b, 0x10a01, 0x10a10,
+    0x10a38, 0x10a40, 0x10ae5, 0x10ae7, 0x10d24, 0x10d28, 0x10eab, 0x10ead,
+    0x10f46, 0x10f51, 0x10f82, 0x10f86, 0x11001, 0x11002, 0x11038, 0x11047,
+    0x11070, 0x11071, 0x11073, 0x11075, 0x1107f, 0x11082, 0x110b3, 0x110b7,
+    0x110b9, 0x110bb, 0x110bd, 0x110be, 0x110c2, 0x110ce, 0x11100, 0x11103,
+    0x11127, 0x1112c, 0x1112d, 0x11135, 0x11173, 0x11174, 0x11180, 0x11182,
+    0x111b6, 0x111bf, 0x111c9, 0x111cd, 0x111cf, 0x111d0, 0x1122f, 0x11232,
+    0x11234, 0x11235, 0x11236, 0x11238, 0x1123e, 0x1123f, 0x112df, 0x112e0,
+    0x112e3, 0x112eb, 0x11300, 0x11302, 0x1133b, 0x1133d, 0x11340, 0x11341,
+    0x11366, 0x11375, 0x11438, 0x11440, 0x11442, 0x11445, 0x11446, 0x11447,
+    0x1145e, 0x1145f, 0x114b3, 0x114b9, 0x114ba, 0x114bb, 0x114bf, 0x114c1,
+    0x114c2, 0x114c4, 0x115b2, 0x115b6, 0x115bc, 0x115be, 0x115bf, 0x115c1,
+    0x115dc, 0x115de, 0x11633, 0x1163b, 0x1163d, 0x1163e, 0x1163f, 0x11641,
+    0x116ab, 0x116ac, 0x116ad, 0x116ae, 0x116b0, 0x116b6, 0x116b7, 0x116b8,
+    0x1171d, 0x11720, 0x11722, 0x11726, 0x11727, 0x1172c, 0x1182f, 0x11838,
+    0x11839, 0x1183b, 0x1193b, 0x1193d, 0x1193e, 0x1193f, 0x11943, 0x11944,
+    0x119d4, 0x119dc, 0x119e0, 0x119e1, 0x11a01, 0x11a0b, 0x11a33, 0x11a39,
+    0x11a3b, 0x11a3f, 0x11a47, 0x11a48, 0x11a51, 0x11a57, 0x11a59, 0x11a5c,
+    0x11a8a, 0x11a97, 0x11a98, 0x11a9a, 0x11c30, 0x11c3e, 0x11c3f, 0x11c40,
+    0x11c92, 0x11ca8, 0x11caa, 0x11cb1, 0x11cb2, 0x11cb4, 0x11cb5, 0x11cb7,
+    0x11d31, 0x11d46, 0x11d47, 0x11d48, 0x11d90, 0x11d92, 0x11d95, 0x11d96,
+    0x11d97, 0x11d98, 0x11ef3, 0x11ef5, 0x13430, 0x13439, 0x16af0, 0x16af5,
+    0x16b30, 0x16b37, 0x16f4f, 0x16f50, 0x16f8f, 0x16f93, 0x16fe4, 0x16fe5,
+    0x1bc9d, 0x1bc9f, 0x1bca0, 0x1cf47, 0x1d167, 0x1d16a, 0x1d173, 0x1d183,
+    0x1d185, 0x1d18c, 0x1d1aa, 0x1d1ae, 0x1d242, 0x1d245, 0x1da00, 0x1da37,
+    0x1da3b, 0x1da6d, 0x1da75, 0x1da76, 0x1da84, 0x1da85, 0x1da9b, 0x1dab0,
+    0x1e000, 0x1e02b, 0x1e130, 0x1e137, 0x1e2ae, 0x1e2af, 0x1e2ec, 0x1e2f0,
+    0x1e8d0, 0x1e8d7, 0x1e944, 0x1e94b, 0xe0001, 0xe01f0,
+)
+
+
+def char_width(char):
+    """Return the number of columns a character takes up on a terminal."""
+    code = ord(char)
+
+    if 0x20 <= code < 0x7f:
+        return 1
+    elif bisect_right(_ZERO_WIDTH, code) & 1:
+        return 0
+    elif bisect_right(_WIDE, code) & 1:
+        return 2
+
+    return 1
+
+
+try:
+    _isascii = str.isascii
+except AttributeError:  # Python < 3.7
+    def _isascii(text):
+        """Return True if a non-empty string only contains ASCII."""
+        return max(text) < '\x80'
+
+
+def _text_width(text):
+    """Return the number of columns text without escape sequences takes up."""
+    if not text:
+        return 0
+
+    if _isascii(text) and text.isprintable():
+        return len(text)
+
+    return sum(map(char_width, text))
+
+
+def _scan(string):
+    """Yield (text, sequence) pairs of text followed by an escape sequence.
+
+    The last sequence is empty.
+
+    """
+    idx = 0
+
+    for match in _SEQUENCE.finditer(string):
+        yield string[idx:match.start()], match.group()
+        idx = match.end()
+
+    yield string[idx:], ''
+
+
+def strip(string):
+    """Return a string without escape sequences."""
+    if _ESCAPE not in string:
+        return string
+
+    return _SEQUENCE.sub('', string)
+
+
+def visible_width(string):
+    """Return the number of columns a string takes up on a terminal.
+
+    Escape sequences take up no columns, wide East Asian characters take up
+    two and combining characters take up none.
+
+    """
+    if _ESCAPE not in string:
+        return _text_width(string)
+
+    return sum(map(_text_width, _SEQUENCE.split(string)))
+
+
+def _cut(text, columns):
+    """Return the length of the longest prefix of text that fits in columns."""
+    if _isascii(text) and text.isprintable():
+        return min(len(text), columns)
+
+    used = 0
+
+    for idx, char in enumerate(text):
+        used += char_width(char)
+
+        if used > columns:
+            return idx
+
+    return len(text)
+
+
+def truncate(string, width, placeholder=''):
+    """Truncate a string to at most a given number of columns.
+
+    If the string is too wide, text is cut off and replaced by the
+    placeholder so the result fits in width columns. Escape sequences are
+    never cut in half and all of them are kept so that colors set by the
+    string are reset as before.
+
+    """
+    if visible_width(string) <= width:
+        return string
+
+    placeholder_width = visible_width(placeholder)
+
+    if placeholder_width > width:
+        placeholder = truncate(placeholder, width)
+        placeholder_width = width
+
+    remaining = width - placeholder_width
+    truncated = False
+    parts = []
+
+    for text, sequence in _scan(string):
+        if not truncated:
+            text_width = _text_width(text)
+
+            if text_width <= remaining:
+                parts.append(text)
+                remaining -= text_width
+            else:
+                parts.append(text[:_cut(text, remaining)])
+                parts.append(placeholder)
+                truncated = True
+
+        parts.append(sequence)
+
+    return ''.join(parts)
+
+
+def iter_runs(string):
+    """Yield (state, text) pairs of text and its SGR state.
+
+    The state is a :py:class:`colorise.sgr.SgrState` that starts out as the
+    default state and is updated by each SGR escape sequence. Other escape
+    sequences are skipped and consecutive text in the same state is yielded
+    together.
+
+    """
+    state = DEFAULT
+    parts = []
+
+    for text, sequence in _scan(string):
+        if text:
+            parts.append(text)
+
+        if sequence.startswith(_CSI) and sequence.endswith('m'):
+            try:
+                _, new_state = parse(sequence, state)
+            except (IndexError, ValueError):
+                # Ignore sequences with parameters that are not understood
+                new_state = state
+
+            if new_state != state:
+                if parts:
+                    yield state, ''.join(parts)
+                    parts = []
+
+                state = new_state
+
+    if parts:
+        yield state, ''.join(parts)
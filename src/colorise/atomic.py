@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Line-atomic colored output shared by several processes.
+
+When several processes write to the same terminal or pipe, the separate
+writes made by each colorise call may interleave so lines end up mixed and
+colors leak into the wrong output. An :py:class:`AtomicWriter` collects
+output until a line is complete and then writes all complete lines with a
+single call to :py:func:`os.write`. Writes of at most :py:data:`PIPE_BUF`
+bytes to a pipe are atomic on POSIX systems so lines from different processes
+never interleave:
+
+>>> out = colorise.atomic.AtomicWriter(sys.stdout)
+>>> colorise.cprint('Building target', fg='green', file=out)
+
+Output longer than :py:data:`PIPE_BUF` bytes cannot be written atomically. It
+is written line by line unless a :py:class:`Collector` is given in which case
+it is handed to a separate process that writes the output of all workers one
+message at a time.
+
+"""
+
+import multiprocessing
+import os
+import sys
+
+try:
+    from select import PIPE_BUF
+except ImportError:
+    # The minimum required by POSIX
+    PIPE_BUF = 512
+
+
+def _fileno(target):
+    """Return the file descriptor of a stream or file descriptor."""
+    if isinstance(target, int):
+        return target
+
+    return target.fileno()
+
+
+def _write_all(fd, data):
+    """Write all bytes to a file descriptor."""
+    while data:
+        data = data[os.write(fd, data):]
+
+
+def _split(data, size):
+    """Split bytes into chunks of whole lines of at most size bytes.
+
+    Lines longer than size are returned as chunks of their own.
+
+    """
+    chunks = []
+    chunk = b''
+
+    for line in data.splitlines(True):
+        if chunk and len(chunk) + len(line) > size:
+            chunks.append(chunk)
+            chunk = b''
+
+        chunk += line
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def _collect(queue, fd):
+    """Write messages from a queue to a file descriptor until None."""
+    while True:
+        data = queue.get()
+
+        try:
+            if data is None:
+                return
+
+            _write_all(fd, data)
+        finally:
+            queue.task_done()
+
+
+class Collector:
+    """A process that writes output from several processes one at a time.
+
+    The collector is started when it is created and must be created before
+    the worker processes it is passed to, e.g. as an argument or through
+    inheritance. Close it when all workers are done.
+
+    The target is a stream or file descriptor which the collector process
+    must be able to write to. With the spawn start method, only the standard
+    streams are inherited by the collector.
+
+    """
+
+    def __init__(self, target=sys.stdout, context=None):
+        """Initialise and start the collector."""
+        context = context or multiprocessing
+        self._fd = _fileno(target)
+        self._queue = context.JoinableQueue()
+        self._process = context.Process(
+            target=_collect,
+            args=(self._queue, self._fd),
+            name='colorise.atomic.Collector',
+        )
+        self._process.daemon = True
+        self._process.start()
+
+    def write(self, data):
+        """Write bytes and wait until all queued output has been written."""
+        self._queue.put(data)
+        self._queue.join()
+
+    def close(self):
+        """Write all queued output and stop the collector process."""
+        if self._process is None:
+            raise ValueError('Only the creating process can close a collector')
+
+        if self._process.is_alive():
+            self._queue.put(None)
+            self._process.join()
+
+    def __getstate__(self):  # noqa: D105
+        # Worker processes only need the queue
+        return {'_fd': self._fd, '_queue': self._queue, '_process': None}
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        self.close()
+
+
+class AtomicWriter:
+    """A stream that writes complete lines atomically.
+
+    Output is collected until a line ends and all complete lines are then
+    written to the target, a stream or file descriptor, with a single call to
+    :py:func:`os.write` if they fit into :py:data:`PIPE_BUF` bytes. Flushing
+    does not write incomplete lines, they are written by
+    :py:meth:`flush_buffer` and when the writer is closed.
+
+    Output longer than the threshold, which defaults to
+    :py:data:`PIPE_BUF` bytes, is written by the collector if one is given.
+    Long output written by a collector may still be split by short lines
+    written directly by other processes so use a threshold of 0 to write
+    everything through the collector if that matters.
+
+    """
+
+    def __init__(
+        self,
+        target=sys.stdout,
+        collector=None,
+        threshold=PIPE_BUF,
+        encoding=None,
+    ):
+        """Initialise the writer."""
+        self._fd = _fileno(target)
+        self._collector = collector
+        self._threshold = threshold
+        self._encoding = encoding or getattr(target, 'encoding', None) or\
+            'utf-8'
+        self._parts = []
+        self._closed = False
+
+        # Only whole lines are written so text streams must be flushed first
+        if not isinstance(target, int):
+            target.flush()
+
+    @property
+    def encoding(self):
+        """Return the encoding of the output."""
+        return self._encoding
+
+    @property
+    def closed(self):
+        """Return True if the writer has been closed."""
+        return self._closed
+
+    def fileno(self):
+        """Return the file descriptor written to."""
+        return self._fd
+
+    def isatty(self):
+        """Return True if the file descriptor is a terminal."""
+        return os.isatty(self._fd)
+
+    def write(self, data):
+        """Collect data and write all complete lines."""
+        if self._closed:
+            raise ValueError('I/O operation on closed atomic writer')
+
+        self._parts.append(data)
+
+        if '\n' in data:
+            text = ''.join(self._parts)
+            idx = text.rindex('\n') + 1
+            self._parts = [text[idx:]] if idx < len(text) else []
+            self._write(text[:idx].encode(self._encoding))
+
+        return len(data)
+
+    def _write(self, data):
+        """Write bytes, atomically if they are short enough."""
+        if len(data) <= self._threshold:
+            _write_all(self._fd, data)
+        elif self._collector is not None:
+            self._collector.write(data)
+        else:
+            for chunk in _split(data, min(self._threshold, PIPE_BUF)):
+                _write_all(self._fd, chunk)
+
+    def flush(self):
+        """Do nothing, complete lines have already been written."""
+
+    def flush_buffer(self):
+        """Write collected output including an incomplete line."""
+        if self._parts:
+            data = ''.join(self._parts)
+            self._parts = []
+            self._write(data.encode(self._encoding))
+
+    def close(self):
+        """Write any collected output.
+
+        The target is not closed.
+
+        """
+        if not self._closed:
+            self.flush_buffer()
+            self._closed = True
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        self.close()
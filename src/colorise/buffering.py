@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""In-memory buffering of colored output."""
+
+# Default number of buffered characters before output is written out
+_DEFAULT_THRESHOLD = 2**16
+
+
+class BufferedStream:
+    """Collects output in memory and writes it to a stream in one go.
+
+    Flushing a buffered stream does nothing so the many small writes and
+    flushes made when printing colored output are coalesced into a single
+    write to the underlying stream. Buffered output is written when the
+    buffer exceeds a threshold, when :py:meth:`flush_buffer` is called or when
+    the stream is closed.
+
+    On Windows consoles that cannot interpret ANSI escape sequences, buffered
+    output is written before each console API call so colors are applied in
+    the correct order.
+
+    """
+
+    def __init__(self, stream, threshold=_DEFAULT_THRESHOLD):
+        """Initialise the buffered stream."""
+        self._stream = stream
+        self._threshold = threshold
+        self._parts = []
+        self._size = 0
+        self._closed = False
+
+    @property
+    def stream(self):
+        """Return the underlying stream."""
+        return self._stream
+
+    @property
+    def threshold(self):
+        """Return the number of characters that triggers a write."""
+        return self._threshold
+
+    @property
+    def closed(self):
+        """Return True if the buffered stream has been closed."""
+        return self._closed
+
+    @property
+    def encoding(self):
+        """Return the encoding of the underlying stream."""
+        return getattr(self._stream, 'encoding', None)
+
+    def fileno(self):
+        """Return the file descriptor of the underlying stream."""
+        return self._stream.fileno()
+
+    def isatty(self):
+        """Return True if the underlying stream is a terminal."""
+        return self._stream.isatty()
+
+    def write(self, data):
+        """Buffer data and return the number of characters buffered."""
+        if self._closed:
+            raise ValueError('I/O operation on closed buffered stream')
+
+        self._parts.append(data)
+        self._size += len(data)
+
+        if self._size >= self._threshold:
+            self.flush_buffer()
+
+        return len(data)
+
+    def flush(self):
+        """Do nothing, output is only written as described above."""
+
+    def flush_buffer(self):
+        """Write all buffered output to the underlying stream."""
+        if self._parts:
+            data = ''.join(self._parts)
+            self._parts = []
+            self._size = 0
+            self._stream.write(data)
+
+    def close(self):
+        """Write any buffered output and flush the underlying stream.
+
+        The underlying stream is not closed.
+
+        """
+        if not self._closed:
+            self.flush_buffer()
+            self._stream.flush()
+            self._closed = True
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        self.close()
+
+
+def unwrap(file):
+    """Return the underlying stream of a possibly buffered stream.
+
+    Any buffered output is written to the underlying stream first.
+
+    """
+    if isinstance(file, BufferedStream):
+        file.flush_buffer()
+
+        return file.stream
+
+    return file
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Caching of detected terminal capabilities.
+
+Probing a terminal for its capabilities can be expensive (e.g. initialising
+curses or querying the Windows console) and the result rarely changes while a
+program is running. Probed values are therefore cached per stream and
+automatically invalidated when any of the environment variables that influence
+detection change. Call :py:func:`refresh` to explicitly invalidate the cache,
+for example after a stream has been redirected.
+
+"""
+
+import os
+
+import colorise.instrumentation
+
+# Environment variables that affect the detected capabilities
+_ENVIRONMENT_VARIABLES = (
+    'COLORTERM',
+    'TERM',
+    'TERM_PROGRAM',
+    'TERM_PROGRAM_VERSION',
+    'ConEmuANSI',
+)
+
+
+class CapabilityCache:
+    """Cache of probed capabilities tied to a set of environment variables."""
+
+    def __init__(self, variables):
+        """Initialise the cache with the environment variables to watch."""
+        self._variables = tuple(variables)
+        self._environment = None
+        self._cache = {}
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Add a function that is called whenever the cache is invalidated."""
+        self._listeners.append(listener)
+
+    def _invalidate(self):
+        # Replace instead of clearing the dictionary so concurrent readers
+        # never observe a partially invalidated cache
+        self._cache = {}
+
+        for listener in self._listeners:
+            listener()
+
+    def get(self, key, probe, *args):
+        """Return the cached value for a key or probe for it if missing.
+
+        The probe is called with any extra arguments. Exceptions raised by the
+        probe are propagated and nothing is cached.
+
+        """
+        environment = tuple(os.environ.get(name) for name in self._variables)
+
+        if environment != self._environment:
+            self._invalidate()
+            self._environment = environment
+
+        cache = self._cache
+
+        try:
+            return cache[key]
+        except KeyError:
+            if colorise.instrumentation._enabled:
+                colorise.instrumentation.increment('capability_probes')
+
+            value = probe(*args)
+            cache[key] = value
+
+            return value
+
+    def clear(self):
+        """Invalidate all cached values."""
+        self._invalidate()
+        self._environment = None
+
+
+_CACHE = CapabilityCache(_ENVIRONMENT_VARIABLES)
+
+
+def stream_key(file):
+    """Return a key identifying a stream.
+
+    This is the file descriptor of the stream if it has one, otherwise None.
+
+    """
+    try:
+        return file.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def cached(key, probe, *args):
+    """Return a cached capability, calling probe with args if necessary."""
+    return _CACHE.get(key, probe, *args)
+
+
+def add_listener(listener):
+    """Add a function that is called whenever capabilities are invalidated.
+
+    This allows other caches that depend on the terminal capabilities to be
+    invalidated along with them.
+
+    """
+    _CACHE.add_listener(listener)
+
+
+def refresh():
+    """Invalidate all cached capabilities so they are probed again."""
+    _CACHE.clear()
@@ -12,9 +12,13 @@ If you have corrections or suggestions, please submit an issue.
 
 """
 
+import functools
 import re
 import sys
 
+import colorise.capabilities
+import colorise.instrumentation
+import colorise.nix.cluts
 from colorise.color_tools import hls_to_rgb, hsv_to_rgb
 
 _DELIMITER = ';'
@@ -53,6 +57,9 @@ _FORMATS = [
     (_HSV_RE.match, 'hsv')
 ]
 
+# Default maximum number of memoized color resolutions
+_DEFAULT_CACHE_SIZE = 1024
+
 
 def match_color_formats(value):
     """Return the color format of the first format to match the given value."""
@@ -73,10 +80,81 @@ def get_color(
     attributes=None,
     file=sys.stdout,
 ):
-    """Return the color given by a color format."""
+    """Return the color given by a color format.
+
+    Resolved colors are memoized in a bounded least-recently-used cache keyed
+    on the color format, color count, background flag, attributes and CLUT
+    module. The target stream is not part of the key since the resolved color
+    only depends on the capabilities of the terminal. Invalid color formats
+    are never cached and always raise an error.
+
+    """
     if attributes is None:
         attributes = []
 
+    if colorise.instrumentation._enabled:
+        colorise.instrumentation.increment('color_lookups')
+
+        with colorise.instrumentation.timed('color_resolution_time'):
+            return _get_color(value, color_count, cluts, bg, attributes, file)
+
+    return _get_color(value, color_count, cluts, bg, attributes, file)
+
+
+def _get_color(value, color_count, cluts, bg, attributes, file):
+    """Return the color given by a color format using the color cache."""
+    if isinstance(value, (str, int)):
+        return _cached_resolve_color(
+            value,
+            color_count,
+            cluts,
+            bg,
+            tuple(attributes),
+        )
+
+    return _resolve_color(value, color_count, cluts, bg, attributes, file)
+
+
+def color_cache_info():
+    """Return hits, misses, maximum size and current size of the color cache.
+
+    The result is a named tuple as returned by functools.lru_cache.
+
+    """
+    return _cached_resolve_color.cache_info()
+
+
+def clear_color_cache():
+    """Clear the color cache and its statistics."""
+    _cached_resolve_color.cache_clear()
+
+
+def set_color_cache_size(maxsize):
+    """Set the maximum size of the color cache and clear it.
+
+    A maxsize of None makes the cache unbounded while 0 disables caching.
+
+    """
+    global _cached_resolve_color
+
+    _cached_resolve_color = _make_cached_resolve_color(maxsize)
+
+
+def _make_cached_resolve_color(maxsize):
+    """Return a memoized version of _resolve_color."""
+    @functools.lru_cache(maxsize=maxsize)
+    def cached_resolve_color(value, color_count, cluts, bg, attributes):
+        if colorise.instrumentation._enabled:
+            colorise.instrumentation.increment('color_cache_misses')
+
+        return _resolve_color(value, color_count, cluts, bg, list(attributes),
+                              sys.stdout)
+
+    return cached_resolve_color
+
+
+def _resolve_color(value, color_count, cluts, bg, attributes, file):
+    """Resolve a color format into a color for a given color count."""
     match, colorspace = match_color_formats(value)
 
     if colorspace == 'name':
@@ -91,19 +169,59 @@ def get_color(
             attributes,
             file
         )
-    elif colorspace == 'hex':
+
+    rgb = _match_to_rgb(value, match, colorspace)
+
+    return cluts.get_rgb_color(color_count, bg, rgb, attributes, sys.stdout)
+
+
+def _match_to_rgb(value, match, colorspace):
+    """Return the RGB components of a matched hex, HLS, HSV or RGB color."""
+    if colorspace == 'hex':
         value = match.group(2)
-        rgb = [int(value[i:i + 2], 16) for i in range(0, 6, 2)]
+        return [int(value[i:i + 2], 16) for i in range(0, 6, 2)]
     elif colorspace == 'short_hex':
         value = match.group(2)
-        rgb = [int(value[i] + value[i], 16) for i in range(0, 3)]
-    elif colorspace == 'hsv':
-        rgb = hsv_to_rgb(*[float(c) for c in match.group(2).split(_DELIMITER)])
-    elif colorspace == 'hls':
-        rgb = hls_to_rgb(*[float(c) for c in match.group(2).split(_DELIMITER)])
+        return [int(value[i] + value[i], 16) for i in range(0, 3)]
+    elif colorspace in ('hsv', 'hls'):
+        components = [float(c) for c in match.group(2).split(_DELIMITER)]
+
+        if colorspace == 'hsv':
+            return hsv_to_rgb(*components)
+
+        return hls_to_rgb(*components)
     elif colorspace == 'rgb':
-        rgb = [int(c.strip()) for c in match.group(2).split(_DELIMITER)]
-    else:
-        raise ValueError("Unknown or invalid color format '{0}'".format(value))
+        return [int(c.strip()) for c in match.group(2).split(_DELIMITER)]
 
-    return cluts.get_rgb_color(color_count, bg, rgb, attributes, sys.stdout)
+    raise ValueError("Unknown or invalid color format '{0}'".format(value))
+
+
+def to_rgb(value):
+    """Return an RGB tuple for a color format or an RGB tuple.
+
+    Color names and indices use the colors of the standard xterm palette
+    which may differ from the colors a terminal actually displays.
+
+    """
+    if isinstance(value, (tuple, list)):
+        if len(value) != 3 or not all(0 <= c <= 255 for c in value):
+            raise ValueError('RGB colors must have three components in range '
+                             '0-255 inclusive')
+
+        return tuple(int(c) for c in value)
+
+    match, colorspace = match_color_formats(value)
+
+    if colorspace == 'name':
+        return colorise.nix.cluts.name_to_rgb(value)
+    elif colorspace == 'index':
+        return colorise.nix.cluts.index_to_rgb(int(value))
+
+    return tuple(_match_to_rgb(value, match, colorspace))
+
+
+_cached_resolve_color = _make_cached_resolve_color(_DEFAULT_CACHE_SIZE)
+
+# Resolved colors may depend on the terminal (e.g. iTerm uses a different
+# CLUT), so discard them whenever the terminal capabilities are refreshed
+colorise.capabilities.add_listener(clear_color_cache)
@@ -1,12 +1,20 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""Functions for converting and comparing colors."""
+"""Functions for converting and comparing colors.
+
+The batch functions accept any sequence of colors. If NumPy is installed and a
+NumPy array is given, the conversion is vectorized and a NumPy array is
+returned instead of a list.
+
+"""
 
 import colorsys
 import math
 import operator
 
+import colorise.instrumentation
+
 
 def hls_to_rgb(hue, lightness, saturation):
     """Convert HLS (hue, lightness, saturation) values to RGB."""
@@ -30,9 +38,322 @@ def color_difference(rgb1, rgb2):
     return sum(abs(i - j) for i, j in zip(rgb1, rgb2))
 
 
-def closest_color(rgb, clut):
-    """Return the CLUT index of the closest RGB color to a given RGB tuple."""
+def closest_color(rgb, clut, metric=color_difference):
+    """Return the CLUT index of the closest RGB color to a given RGB tuple.
+
+    This scans the entire CLUT. Use :py:func:`get_clut_index` for repeated
+    lookups in the same CLUT.
+
+    """
     # Generate a list of tuples of CLUT indices and the color difference value
-    indexed_diffs = ((idx, color_difference(rgb, clut[idx])) for idx in clut)
+    indexed_diffs = ((idx, metric(rgb, clut[idx])) for idx in clut)
 
     return min(indexed_diffs, key=operator.itemgetter(1))[0]
+
+
+class ClutIndex:
+    """Precomputed index for finding the closest color in a CLUT.
+
+    The RGB cube is divided into cells and for each cell we compute the CLUT
+    entries that can possibly be closest to any color within that cell. A
+    lookup then only compares against those candidates instead of the entire
+    CLUT. Cells are computed lazily the first time a color within them is
+    looked up.
+
+    Results are identical to :py:func:`closest_color`, including which index
+    is returned for ties, provided that the metric only depends on the
+    absolute differences of the color components and never decreases when a
+    difference increases. This holds for both the default Manhattan distance
+    and the Euclidean distance.
+
+    """
+
+    def __init__(self, clut, metric=color_difference, cell_size=16):
+        """Initialise the index for a CLUT and a distance metric."""
+        if cell_size < 1 or 256 % cell_size != 0:
+            raise ValueError('Cell size must be a divisor of 256')
+
+        self._clut = clut
+        self._metric = metric
+        self._cell_size = cell_size
+        self._cells_per_axis = 256 // cell_size
+        self._entries = list(clut.items())
+        self._cells = [None] * self._cells_per_axis**3
+
+    @property
+    def clut(self):
+        """Return the indexed CLUT."""
+        return self._clut
+
+    @property
+    def metric(self):
+        """Return the distance metric of the index."""
+        return self._metric
+
+    def closest(self, rgb):
+        """Return the CLUT index of the closest RGB color to an RGB tuple."""
+        if colorise.instrumentation._enabled:
+            with colorise.instrumentation.timed('approximation_time'):
+                return self._closest(rgb)
+
+        return self._closest(rgb)
+
+    def _closest(self, rgb):
+        r, g, b = rgb
+
+        if not (0 <= r < 256 and 0 <= g < 256 and 0 <= b < 256):
+            # Colors outside the RGB cube are not covered by any cell
+            return closest_color(rgb, self._clut, self._metric)
+
+        size = self._cell_size
+        axis = self._cells_per_axis
+        ri, gi, bi = int(r // size), int(g // size), int(b // size)
+        cell = (ri * axis + gi) * axis + bi
+        candidates = self._cells[cell]
+
+        if candidates is None:
+            candidates = self._compute_cell(ri, gi, bi)
+            self._cells[cell] = candidates
+
+        if len(candidates) == 1:
+            return candidates[0][0]
+
+        metric = self._metric
+        best_idx, best_diff = None, None
+
+        for idx, color in candidates:
+            diff = metric(rgb, color)
+
+            if best_diff is None or diff < best_diff:
+                best_idx, best_diff = idx, diff
+
+        return best_idx
+
+    def _compute_cell(self, ri, gi, bi):
+        """Return the CLUT entries that can be closest to a color in a cell."""
+        size = self._cell_size
+        lows = (ri * size, gi * size, bi * size)
+        origin = (0, 0, 0)
+        bounds = []
+
+        for idx, color in self._entries:
+            min_diffs, max_diffs = [], []
+
+            for low, component in zip(lows, color):
+                high = low + size - 1
+
+                if component < low:
+                    min_diffs.append(low - component)
+                elif component > high:
+                    min_diffs.append(component - high)
+                else:
+                    min_diffs.append(0)
+
+                max_diffs.append(max(abs(component - low),
+                                     abs(component - high)))
+
+            bounds.append((
+                idx,
+                color,
+                self._metric(origin, min_diffs),
+                self._metric(origin, max_diffs),
+            ))
+
+        # No color in the cell can be further away from its closest entry
+        # than the smallest maximum distance to any entry, so any entry whose
+        # minimum distance exceeds it can never be the closest
+        threshold = min(bound[3] for bound in bounds)
+
+        return [(idx, color) for idx, color, min_diff, _ in bounds
+                if min_diff <= threshold]
+
+
+# Shared CLUT indices keyed on the identity of the CLUT and the metric
+_CLUT_INDICES = {}
+
+
+def get_clut_index(clut, metric=color_difference):
+    """Return a shared index for a CLUT and a metric, creating it if needed.
+
+    Indices are keyed on the identity of the CLUT so a CLUT that is modified
+    in place must be invalidated with :py:func:`invalidate_clut_index`.
+
+    """
+    key = (id(clut), metric)
+    index = _CLUT_INDICES.get(key)
+
+    # The index holds a reference to its CLUT so the identity of a live CLUT
+    # is never reused, but check it anyway in case the CLUT was invalidated
+    if index is None or index.clut is not clut:
+        index = ClutIndex(clut, metric)
+        _CLUT_INDICES[key] = index
+
+    return index
+
+
+def invalidate_clut_index(clut=None):
+    """Discard the shared indices of a CLUT or all indices if None."""
+    if clut is None:
+        _CLUT_INDICES.clear()
+    else:
+        for key in [key for key in _CLUT_INDICES if key[0] == id(clut)]:
+            del _CLUT_INDICES[key]
+
+
+# Number of unique colors compared against a CLUT at a time when vectorized
+_NUMPY_BLOCK_SIZE = 4096
+
+
+def _is_ndarray(value):
+    """Return True if value is a NumPy array without importing NumPy."""
+    value_type = type(value)
+
+    return value_type.__name__ == 'ndarray' and\
+        value_type.__module__ == 'numpy'
+
+
+def hls_to_rgb_batch(colors):
+    """Convert a sequence of HLS colors to RGB.
+
+    Each color is converted exactly as by :py:func:`hls_to_rgb`.
+
+    """
+    if _is_ndarray(colors):
+        import numpy
+
+        return _numpy_hls_to_rgb(numpy, colors)
+
+    return [hls_to_rgb(*color) for color in colors]
+
+
+def hsv_to_rgb_batch(colors):
+    """Convert a sequence of HSV colors to RGB.
+
+    Each color is converted exactly as by :py:func:`hsv_to_rgb`.
+
+    """
+    if _is_ndarray(colors):
+        import numpy
+
+        return _numpy_hsv_to_rgb(numpy, colors)
+
+    return [hsv_to_rgb(*color) for color in colors]
+
+
+def closest_colors(colors, clut, metric=color_difference):
+    """Return the CLUT indices of the closest colors to a sequence of colors.
+
+    This gives the same results as calling :py:func:`closest_color` for each
+    color but each unique color is only looked up once using a shared
+    :py:class:`ClutIndex`. NumPy arrays of shape (..., 3) are vectorized for
+    the default metric and return an array of indices of shape (...).
+
+    """
+    if _is_ndarray(colors):
+        import numpy
+
+        if metric is color_difference:
+            return _numpy_closest_colors(numpy, colors, clut)
+
+        return numpy.array(
+            closest_colors(colors.reshape(-1, 3).tolist(), clut, metric),
+        ).reshape(colors.shape[:-1])
+
+    index = get_clut_index(clut, metric)
+    found = {}
+    result = []
+
+    for color in colors:
+        color = tuple(color)
+
+        try:
+            result.append(found[color])
+        except KeyError:
+            idx = index.closest(color)
+            found[color] = idx
+            result.append(idx)
+
+    return result
+
+
+def _numpy_closest_colors(numpy, colors, clut):
+    """Vectorized closest_colors for the default metric."""
+    keys = numpy.array(list(clut))
+    palette = numpy.array([clut[key] for key in clut], dtype=numpy.int64)
+    flat = colors.reshape(-1, 3).astype(numpy.int64)
+    unique, inverse = numpy.unique(flat, axis=0, return_inverse=True)
+    closest = numpy.empty(len(unique), dtype=numpy.intp)
+
+    for start in range(0, len(unique), _NUMPY_BLOCK_SIZE):
+        block = unique[start:start + _NUMPY_BLOCK_SIZE]
+        diffs = numpy.abs(block[:, None, :] - palette[None, :, :]).sum(axis=2)
+
+        # argmin returns the first minimum like min does in closest_color
+        closest[start:start + _NUMPY_BLOCK_SIZE] = diffs.argmin(axis=1)
+
+    return keys[closest][inverse.reshape(-1)].reshape(colors.shape[:-1])
+
+
+def _numpy_hsv_to_rgb(numpy, colors):
+    """Vectorized version of colorsys.hsv_to_rgb scaled like hsv_to_rgb."""
+    colors = numpy.asarray(colors, dtype=float)
+    hue = colors[..., 0] / 360.
+    saturation = colors[..., 1] / 100.
+    value = colors[..., 2] / 100.
+
+    i = (hue * 6.0).astype(int)
+    f = (hue * 6.0) - i
+    p = value * (1.0 - saturation)
+    q = value * (1.0 - saturation * f)
+    t = value * (1.0 - saturation * (1.0 - f))
+    i = i % 6
+
+    rgb = numpy.stack([
+        numpy.choose(i, [value, q, p, p, t, value]),
+        numpy.choose(i, [t, value, value, q, p, p]),
+        numpy.choose(i, [p, p, t, value, value, q]),
+    ], axis=-1)
+
+    gray = (saturation == 0.0)[..., None]
+    rgb = numpy.where(gray, value[..., None], rgb)
+
+    return (rgb * 255.).astype(int)
+
+
+def _numpy_hls_to_rgb(numpy, colors):
+    """Vectorized version of colorsys.hls_to_rgb scaled like hls_to_rgb."""
+    colors = numpy.asarray(colors, dtype=float)
+    hue = colors[..., 0]
+    lightness = colors[..., 1]
+    saturation = colors[..., 2]
+
+    m2 = numpy.where(
+        lightness <= 0.5,
+        lightness * (1.0 + saturation),
+        lightness + saturation - (lightness * saturation),
+    )
+    m1 = 2.0 * lightness - m2
+
+    def component(offset):
+        h = (hue + offset) % 1.0
+
+        return numpy.select(
+            [h < 1.0 / 6.0, h < 0.5, h < 2.0 / 3.0],
+            [
+                m1 + (m2 - m1) * h * 6.0,
+                m2,
+                m1 + (m2 - m1) * (2.0 / 3.0 - h) * 6.0,
+            ],
+            m1,
+        )
+
+    rgb = numpy.stack([
+        component(1.0 / 3.0),
+        component(0.0),
+        component(-(1.0 / 3.0)),
+    ], axis=-1)
+
+    gray = (saturation == 0.0)[..., None]
+    rgb = numpy.where(gray, lightness[..., None], rgb)
+
+    return numpy.ceil(rgb * 255.).astype(int)
@@ -0,0 +1,277 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Immutable strings with colors and attributes."""
+
+import _thread
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+import colorise
+
+# Styles by id where id 0 means no style
+_styles = [None]
+
+# Ids of styles
+_style_ids = {}
+
+_lock = _thread.allocate_lock()
+
+# Parts returned by str.split without a separator
+_WORD_RE = re.compile(r'\S+')
+
+
+def _style_id(style):
+    """Return the id of a style, registering it if necessary."""
+    if not style:
+        return 0
+
+    try:
+        return _style_ids[style]
+    except KeyError:
+        with _lock:
+            if style not in _style_ids:
+                _style_ids[style] = len(_styles)
+                _styles.append(style)
+
+            return _style_ids[style]
+
+
+def _append_run(ends, ids, end, style_id):
+    """Append a run to run arrays, merging it with an equally styled run."""
+    if end <= (ends[-1] if ends else 0):
+        # Empty runs are left out
+        return
+
+    if ids and ids[-1] == style_id:
+        ends[-1] = end
+    else:
+        ends.append(end)
+        ids.append(style_id)
+
+
+def _concat(parts):
+    """Return the concatenation of strings and colored strings."""
+    texts = []
+    ends = array('L')
+    ids = array('I')
+    offset = 0
+
+    for part in parts:
+        if isinstance(part, str):
+            _append_run(ends, ids, offset + len(part), 0)
+            texts.append(part)
+            offset += len(part)
+        elif isinstance(part, ColoredString):
+            for end, style_id in zip(part._ends, part._ids):
+                _append_run(ends, ids, offset + end, style_id)
+
+            texts.append(part._text)
+            offset += len(part._text)
+        else:
+            raise TypeError(
+                'Expected str or ColoredString, got {0}'.format(
+                    type(part).__name__,
+                ),
+            )
+
+    return ColoredString._from_runs(''.join(texts), ends, ids)
+
+
+class ColoredString:
+    """An immutable string with colors and attributes.
+
+    Colored strings are stored as plain text along with the ends and style
+    ids of runs of equally styled characters. Concatenating, slicing, joining
+    and splitting them works on the text and runs without generating any
+    escape sequences which are only generated, using the cached escape
+    sequences of each style, when a colored string is printed or rendered:
+
+    >>> from colorise.colored_string import ColoredString
+    >>> name = ColoredString('colorise', fg='green')
+    >>> line = 'Welcome to ' + name + '!'
+    >>> line[11:16].print()
+
+    Converting a colored string with str returns its plain text.
+
+    """
+
+    __slots__ = ('_text', '_ends', '_ids')
+
+    def __init__(self, text='', fg=None, bg=None, attributes=None,
+                 style=None):
+        """Initialise the colored string."""
+        style = colorise._get_style(fg, bg, attributes, style)
+        self._text = text
+        self._ends = array('L', [len(text)] if text else [])
+        self._ids = array('I', [_style_id(style)] if text else [])
+
+    @classmethod
+    def _from_runs(cls, text, ends, ids):
+        """Create a colored string from text and run arrays."""
+        colored_string = cls.__new__(cls)
+        colored_string._text = text
+        colored_string._ends = ends
+        colored_string._ids = ids
+
+        return colored_string
+
+    @property
+    def text(self):
+        """Return the plain text of the colored string."""
+        return self._text
+
+    def runs(self):
+        """Return (start, end, style) tuples for all runs of characters.
+
+        The style of unstyled runs is None.
+
+        """
+        runs = []
+        start = 0
+
+        for end, style_id in zip(self._ends, self._ids):
+            runs.append((start, end, _styles[style_id]))
+            start = end
+
+        return runs
+
+    def spans(self):
+        """Return (start, end, style) tuples for all styled runs."""
+        return [run for run in self.runs() if run[2] is not None]
+
+    def join(self, iterable):
+        """Concatenate strings and colored strings separated by this one."""
+        parts = []
+
+        for part in iterable:
+            if parts:
+                parts.append(self)
+
+            parts.append(part)
+
+        return _concat(parts)
+
+    def _split_ranges(self, sep, maxsplit):
+        """Return the (start, end) ranges of the parts of a split."""
+        text = self._text
+        ranges = []
+        start = 0
+
+        if sep is None:
+            for match in _WORD_RE.finditer(text):
+                if len(ranges) == maxsplit:
+                    ranges.append((match.start(), len(text)))
+                    break
+
+                ranges.append(match.span())
+
+            return ranges
+
+        if not sep:
+            raise ValueError('empty separator')
+
+        while len(ranges) != maxsplit:
+            idx = text.find(sep, start)
+
+            if idx < 0:
+                break
+
+            ranges.append((start, idx))
+            start = idx + len(sep)
+
+        ranges.append((start, len(text)))
+
+        return ranges
+
+    def split(self, sep=None, maxsplit=-1):
+        """Split the colored string like :py:meth:`str.split`."""
+        return [
+            self[start:end] for start, end in self._split_ranges(sep, maxsplit)
+        ]
+
+    def print(self, end=os.linesep, file=sys.stdout, enabled=True):
+        """Print the colored string to a target stream.
+
+        The arguments are the same as for :py:func:`colorise.cprint`.
+
+        """
+        colorise.highlight_spans(self._text, self.spans(), end, file,
+                                 enabled)
+
+    def render(self, enabled=True):
+        """Return the colored string with embedded ANSI escape sequences."""
+        return colorise.hformat_spans(self._text, self.spans(), enabled)
+
+    def __len__(self):  # noqa: D105
+        return len(self._text)
+
+    def __str__(self):  # noqa: D105
+        return self._text
+
+    def __getitem__(self, key):  # noqa: D105
+        if isinstance(key, int):
+            if key < 0:
+                key += len(self._text)
+
+            if not 0 <= key < len(self._text):
+                raise IndexError('ColoredString index out of range')
+
+            key = slice(key, key + 1)
+
+        start, stop, step = key.indices(len(self._text))
+
+        if step != 1:
+            return _concat(self[idx] for idx in range(start, stop, step))
+
+        if stop <= start:
+            return ColoredString()
+
+        first = bisect_right(self._ends, start)
+        last = bisect_left(self._ends, stop)
+        ends = array('L', [
+            min(end, stop) - start for end in self._ends[first:last + 1]
+        ])
+
+        return ColoredString._from_runs(
+            self._text[start:stop],
+            ends,
+            self._ids[first:last + 1],
+        )
+
+    def __add__(self, other):  # noqa: D105
+        if not isinstance(other, (str, ColoredString)):
+            return NotImplemented
+
+        return _concat([self, other])
+
+    def __radd__(self, other):  # noqa: D105
+        if not isinstance(other, str):
+            return NotImplemented
+
+        return _concat([other, self])
+
+    def __eq__(self, other):  # noqa: D105
+        if not isinstance(other, ColoredString):
+            return NotImplemented
+
+        return self._text == other._text and self._ends == other._ends and\
+            self._ids == other._ids
+
+    def __ne__(self, other):  # noqa: D105
+        result = self.__eq__(other)
+
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):  # noqa: D105
+        return hash((self._text, self._ends.tobytes(), self._ids.tobytes()))
+
+    def __repr__(self):  # noqa: D105
+        return '{0}({1!r}, spans={2!r})'.format(
+            self.__class__.__name__,
+            self._text,
+            self.spans(),
+        )
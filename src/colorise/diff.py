@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Colored line and character differences between texts.
+
+Lines are compared first and changed lines are then compared character by
+character so the exact changes within a line are emphasised:
+
+>>> colorise.diff.print_diff(expected.splitlines(), actual.splitlines())
+
+Large files can be compared with :py:func:`print_diff_stream` which only keeps
+a window of lines from each file in memory.
+
+"""
+
+import difflib
+import os
+import sys
+
+import colorise
+from colorise.attributes import Attr
+from colorise.style import Style
+
+# Tags of diffed lines which are also used as line prefixes
+EQUAL = ' '
+DELETE = '-'
+INSERT = '+'
+
+# Default styles of deleted and inserted lines and of changed characters
+DELETE_STYLE = Style(fg='red')
+INSERT_STYLE = Style(fg='green')
+CHANGE_STYLE = Style(attributes=[Attr.Reverse])
+
+# Default maximum product of the lengths of two lines that are compared
+# character by character, longer lines are only compared as a whole
+_DEFAULT_MAX_LINE_WORK = 10**6
+
+# Default number of lines read from each file at a time by the streaming diff
+_DEFAULT_WINDOW = 1000
+
+
+def _strip(line):
+    """Remove any line ending from a line."""
+    return line.rstrip('\r\n')
+
+
+def _char_changes(a, b, max_line_work):
+    """Return ranges of changed characters in two lines."""
+    if len(a) * len(b) > max_line_work:
+        return [], []
+
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    a_changes = []
+    b_changes = []
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != 'equal':
+            if i1 < i2:
+                a_changes.append((i1, i2))
+
+            if j1 < j2:
+                b_changes.append((j1, j2))
+
+    return a_changes, b_changes
+
+
+def _diff_opcodes(a, b, opcodes, max_line_work):
+    """Yield diffed lines for a list of opcodes."""
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == 'equal':
+            for line in a[i1:i2]:
+                yield EQUAL, line, []
+        elif tag == 'delete':
+            for line in a[i1:i2]:
+                yield DELETE, line, []
+        elif tag == 'insert':
+            for line in b[j1:j2]:
+                yield INSERT, line, []
+        else:
+            # Compare replaced lines pairwise and show all deleted lines
+            # before all inserted lines
+            pairs = min(i2 - i1, j2 - j1)
+            changes = [
+                _char_changes(a[i1 + k], b[j1 + k], max_line_work)
+                for k in range(pairs)
+            ]
+
+            for k, line in enumerate(a[i1:i2]):
+                yield DELETE, line, changes[k][0] if k < pairs else []
+
+            for k, line in enumerate(b[j1:j2]):
+                yield INSERT, line, changes[k][1] if k < pairs else []
+
+
+def diff_lines(a, b, max_line_work=_DEFAULT_MAX_LINE_WORK):
+    """Compare two sequences of lines.
+
+    Yields (tag, line, changes) tuples where tag is one of EQUAL, DELETE or
+    INSERT, line is the line without its line ending and changes is a list of
+    (start, end) ranges of changed characters in the line.
+
+    Lines whose lengths multiplied exceed max_line_work are not compared
+    character by character which bounds the time spent on each line.
+
+    """
+    a = [_strip(line) for line in a]
+    b = [_strip(line) for line in b]
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+
+    for diffed in _diff_opcodes(a, b, matcher.get_opcodes(), max_line_work):
+        yield diffed
+
+
+def _read_lines(file, lines, count):
+    """Read lines from a file until there are count lines or it ends.
+
+    Returns True if the end of the file was reached.
+
+    """
+    while len(lines) < count:
+        line = file.readline()
+
+        if not line:
+            return True
+
+        lines.append(_strip(line))
+
+    return False
+
+
+def diff_stream(
+    afile,
+    bfile,
+    window=_DEFAULT_WINDOW,
+    max_line_work=_DEFAULT_MAX_LINE_WORK,
+):
+    """Compare two files line by line using a bounded amount of memory.
+
+    Yields the same tuples as :py:func:`diff_lines`. Up to window lines are
+    read from each file and compared. Differences up to the last matching
+    lines are yielded and the remaining lines are compared again together
+    with the following lines. Changes spanning more than window lines may
+    therefore be reported less precisely than by :py:func:`diff_lines`.
+
+    """
+    if window < 1:
+        raise ValueError('Window must be positive')
+
+    a = []
+    b = []
+    a_eof = b_eof = False
+
+    while True:
+        a_eof = a_eof or _read_lines(afile, a, window)
+        b_eof = b_eof or _read_lines(bfile, b, window)
+
+        if not a and not b:
+            break
+
+        matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+        opcodes = matcher.get_opcodes()
+        end = len(opcodes)
+
+        if not (a_eof and b_eof):
+            # Keep lines after the last matching lines for the next window
+            # unless nothing matched at all
+            for idx in range(len(opcodes) - 1, -1, -1):
+                if opcodes[idx][0] == 'equal':
+                    end = idx + 1
+                    break
+
+        for diffed in _diff_opcodes(a, b, opcodes[:end], max_line_work):
+            yield diffed
+
+        _, _, i2, _, j2 = opcodes[end - 1]
+        a = a[i2:]
+        b = b[j2:]
+
+        if a_eof and b_eof and not a and not b:
+            break
+
+
+def format_diff(
+    diffed_lines,
+    delete_style=DELETE_STYLE,
+    insert_style=INSERT_STYLE,
+    change_style=CHANGE_STYLE,
+    enabled=True,
+):
+    """Yield diffed lines as strings with embedded ANSI escape sequences.
+
+    Each line is prefixed by its tag and does not include a line ending.
+    Deleted and inserted lines use delete_style and insert_style while
+    changed characters additionally use change_style.
+
+    """
+    line_styles = {DELETE: delete_style, INSERT: insert_style}
+
+    for tag, line, changes in diffed_lines:
+        text = tag + line
+        yield colorise.hformat_spans(
+            text,
+            _spans(tag, text, changes, line_styles, change_style),
+            enabled,
+        )
+
+
+def _spans(tag, text, changes, line_styles, change_style):
+    """Return the highlighted spans of a diffed line including its tag."""
+    if tag == EQUAL:
+        return []
+
+    return [(0, len(text), line_styles[tag])] + [
+        (start + 1, end + 1, change_style) for start, end in changes
+    ]
+
+
+def _print_diffed_lines(
+    diffed_lines,
+    end,
+    file,
+    enabled,
+    delete_style,
+    insert_style,
+    change_style,
+):
+    """Print diffed lines to a target stream."""
+    line_styles = {DELETE: delete_style, INSERT: insert_style}
+
+    # Coalesce the output of all lines into few writes
+    with colorise.buffered(file) as out:
+        for tag, line, changes in diffed_lines:
+            text = tag + line
+            colorise.highlight_spans(
+                text,
+                _spans(tag, text, changes, line_styles, change_style),
+                end=end,
+                file=out,
+                enabled=enabled,
+            )
+
+
+def print_diff(
+    a,
+    b,
+    end=os.linesep,
+    file=sys.stdout,
+    enabled=True,
+    delete_style=DELETE_STYLE,
+    insert_style=INSERT_STYLE,
+    change_style=CHANGE_STYLE,
+    max_line_work=_DEFAULT_MAX_LINE_WORK,
+):
+    """Print the differences between two sequences of lines.
+
+    Each line is printed with a prefix of ' ', '-' or '+' for equal, deleted
+    and inserted lines followed by end. Deleted and inserted lines use
+    delete_style and insert_style while changed characters additionally use
+    change_style. See :py:func:`diff_lines` for max_line_work.
+
+    """
+    _print_diffed_lines(
+        diff_lines(a, b, max_line_work),
+        end,
+        file,
+        enabled,
+        delete_style,
+        insert_style,
+        change_style,
+    )
+
+
+def print_diff_stream(
+    afile,
+    bfile,
+    end=os.linesep,
+    file=sys.stdout,
+    enabled=True,
+    delete_style=DELETE_STYLE,
+    insert_style=INSERT_STYLE,
+    change_style=CHANGE_STYLE,
+    window=_DEFAULT_WINDOW,
+    max_line_work=_DEFAULT_MAX_LINE_WORK,
+):
+    """Print the differences between two files using bounded memory.
+
+    The arguments are the same as for :py:func:`print_diff`. See
+    :py:func:`diff_stream` for window.
+
+    """
+    _print_diffed_lines(
+        diff_stream(afile, bfile, window, max_line_work),
+        end,
+        file,
+        enabled,
+        delete_style,
+        insert_style,
+        change_style,
+    )
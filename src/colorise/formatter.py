@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""ColorFormatter class for colorise.fprint.
+"""Parsing of color format fields.
 
-This class extends the string.Formatter class.
+The functions in this module parse the color format fields of
+:py:func:`colorise.fprint` and :py:func:`colorise.fformat` which are compiled
+into templates by :py:mod:`colorise.template`. The :py:class:`ColorFormatter`
+class is deprecated and only kept for backwards compatibility.
 
 """
 
@@ -12,6 +15,64 @@ import string
 
 from colorise.attributes import Attr
 
+_COLOR_FIELD_RE = re.compile('[fb]g=')
+
+
+def is_color_format(field_name, attribute_names=None):
+    """Return True if any part of a format field is a color or attribute."""
+    if not field_name:
+        return False
+
+    if attribute_names is None:
+        attribute_names = Attr.names_with_aliases()
+
+    for part in field_name.split(','):
+        part = part.strip()
+
+        if _COLOR_FIELD_RE.match(part) or part in attribute_names:
+            return True
+
+    return False
+
+
+def parse_color_format(colors, attribute_names=None):
+    """Parse and extract the color format from a format field.
+
+    Returns a list of the foreground color, foreground attributes, background
+    color and background attributes.
+
+    """
+    result = [None, [], None, []]
+
+    if not colors:
+        return result
+
+    if attribute_names is None:
+        attribute_names = Attr.names_with_aliases()
+
+    is_fg = False
+
+    for color in colors.split(','):
+        color = color.strip()
+
+        if _COLOR_FIELD_RE.match(color):
+            index = 0 if color[0] == 'f' else 2
+
+            if result[index]:
+                raise ValueError('Duplicate {0}ground color format'
+                                 .format('back' if index > 0 else 'fore'))
+
+            result[index] = color[3:]
+            is_fg = index == 0
+        elif color in attribute_names:
+            # This is an attribute
+            result[1 if is_fg else 3].append(Attr.from_name(color))
+        else:
+            raise ValueError("Unknown color format or attribute '{0}'"
+                             .format(color))
+
+    return result
+
 
 class ColorFormatter(string.Formatter):
     """Class for formatting strings containing color syntax.
@@ -22,6 +83,10 @@ class ColorFormatter(string.Formatter):
     interpret ANSI escape sequences since they have no way of embedding colors
     into strings but instead set colors through an API call.
 
+    This class is deprecated. :py:func:`colorise.fprint` no longer uses it
+    and it is only kept for backwards compatibility so it does not support
+    precompiled styles.
+
     """
 
     def __init__(self, set_color_func, reset_func):
@@ -102,33 +167,7 @@ class ColorFormatter(string.Formatter):
 
     def _parse_color_format(self, colors):
         """Parse and extract the color format from a format field."""
-        result = [None, [], None, []]
-
-        if not colors:
-            return result
-
-        is_fg = False
-
-        for color in colors.split(','):
-            color = color.strip()
-
-            if re.match('[fb]g=', color):
-                index = 0 if color[0] == 'f' else 2
-
-                if result[index]:
-                    raise ValueError('Duplicate {0}ground color format'
-                                     .format('back' if index > 0 else 'fore'))
-
-                result[index] = color[3:]
-                is_fg = index == 0
-            elif color in self._attribute_names:
-                # This is an attribute
-                result[1 if is_fg else 3].append(Attr.from_name(color))
-            else:
-                raise ValueError("Unknown color format or attribute '{0}'"
-                                 .format(color))
-
-        return result
+        return parse_color_format(colors, self._attribute_names)
 
     def vformat(self, format_string, args, kwargs):
         """Hijack the internals of string.Formatter.vformat.
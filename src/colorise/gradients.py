@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Color gradients across text.
+
+Colors are interpolated between evenly spaced color stops in the RGB, HSV or
+HLS color space for each character. Adjacent characters whose colors look the
+same after being approximated for the terminal are merged into a single run
+so only one escape sequence is needed for them.
+
+"""
+
+import colorsys
+
+from colorise.cluts import to_rgb
+from colorise.color_tools import hls_to_rgb, hsv_to_rgb
+from colorise.style import Style
+
+# Supported color spaces for interpolation
+SPACES = ('rgb', 'hsv', 'hls')
+
+# Attribute values that are drawn across whitespace using the foreground
+# color, i.e. underline and reverse
+_VISIBLE_ON_WHITESPACE = frozenset([4, 7])
+
+
+def _lerp(a, b, t):
+    """Linearly interpolate between two values."""
+    return a + (b - a) * t
+
+
+def _lerp_hue(a, b, t):
+    """Interpolate between two hues in [0, 1) along the shortest arc."""
+    delta = (b - a + 0.5) % 1.0 - 0.5
+
+    return (a + delta * t) % 1.0
+
+
+def _to_space(rgb, space):
+    """Convert an RGB tuple to components in a color space."""
+    r, g, b = (c / 255. for c in rgb)
+
+    if space == 'hsv':
+        return colorsys.rgb_to_hsv(r, g, b)
+    elif space == 'hls':
+        return colorsys.rgb_to_hls(r, g, b)
+
+    return tuple(rgb)
+
+
+def _from_space(components, space):
+    """Convert components in a color space to an RGB tuple."""
+    if space == 'hsv':
+        hue, saturation, value = components
+
+        return hsv_to_rgb(hue * 360., saturation * 100., value * 100.)
+    elif space == 'hls':
+        return hls_to_rgb(*components)
+
+    return tuple(int(round(c)) for c in components)
+
+
+def _interpolate(a, b, t, space):
+    """Interpolate between two colors in a color space."""
+    if space == 'rgb':
+        return tuple(_lerp(x, y, t) for x, y in zip(a, b))
+
+    # The hue is the first component of both HSV and HLS
+    return (_lerp_hue(a[0], b[0], t),) +\
+        tuple(_lerp(x, y, t) for x, y in zip(a[1:], b[1:]))
+
+
+def interpolate(stops, count, space='rgb'):
+    """Return a list of count RGB tuples along a gradient.
+
+    Stops are colors in any format supported by colorise or RGB tuples and
+    are spread evenly across the gradient. Hues are interpolated along the
+    shortest way around the color wheel in the HSV and HLS spaces.
+
+    """
+    if space not in SPACES:
+        raise ValueError(
+            "Unknown color space '{0}', must be one of {1}".format(
+                space,
+                ', '.join(SPACES),
+            ),
+        )
+
+    if not stops:
+        raise ValueError('A gradient needs at least one color stop')
+
+    points = [_to_space(to_rgb(stop), space) for stop in stops]
+
+    if len(points) == 1 or count == 1:
+        return [_from_space(points[0], space)] * count
+
+    segments = len(points) - 1
+    colors = []
+
+    for idx in range(count):
+        position = idx * segments / (count - 1)
+        segment = min(int(position), segments - 1)
+        colors.append(_from_space(
+            _interpolate(
+                points[segment],
+                points[segment + 1],
+                position - segment,
+                space,
+            ),
+            space,
+        ))
+
+    return colors
+
+
+def gradient_runs(
+    text,
+    stops,
+    color_count,
+    space='rgb',
+    bg=False,
+    attributes=None,
+):
+    """Return styled runs that color text along a gradient.
+
+    Runs are sorted, non-overlapping (start, end, style) tuples. Adjacent
+    characters whose colors have the same escape sequence for the given color
+    count share a run. When coloring the foreground, whitespace joins the
+    preceding run since its color is not visible.
+
+    """
+    attributes = list(attributes or [])
+    styles = {}
+    runs = []
+    join_whitespace = not bg and\
+        not _VISIBLE_ON_WHITESPACE.intersection(a.value for a in attributes)
+    start = 0
+    current = None
+    current_sequence = None
+
+    for idx, rgb in enumerate(interpolate(stops, len(text), space)):
+        if join_whitespace and current is not None and text[idx].isspace():
+            continue
+
+        try:
+            style = styles[rgb]
+        except KeyError:
+            color = 'rgb({0};{1};{2})'.format(*rgb)
+
+            if bg:
+                style = Style(bg=color, attributes=attributes)
+            else:
+                style = Style(fg=color, attributes=attributes)
+
+            styles[rgb] = style
+
+        sequence = style.ansi(color_count)
+
+        if sequence != current_sequence:
+            if current is not None:
+                runs.append((start, idx, current))
+
+            start = idx
+            current = style
+            current_sequence = sequence
+
+    if current is not None:
+        runs.append((start, len(text), current))
+
+    return runs
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Rendering of RGB pixels in the terminal.
+
+Each terminal cell shows two vertically adjacent pixels using the upper half
+block character '▀' with the foreground color set to the upper pixel and the
+background color set to the lower pixel. Transparent pixels are left in the
+default colors. Colors are approximated once per unique color using the
+terminal's color look-up table, neighbouring cells with the same colors share
+an escape sequence and each image is written in one go:
+
+>>> pixels = [[(255, 0, 0), (0, 0, 255)], [(0, 255, 0), None]]
+>>> colorise.image.render(pixels)
+
+"""
+
+import os
+import sys
+
+import colorise
+import colorise.nix.cluts
+import colorise.policy
+from colorise.color_tools import _is_ndarray, closest_colors
+from colorise.instrumentation import flush as _flush, write as _write
+from colorise.style import Style
+
+# Characters whose upper and lower halves are drawn with the foreground color
+UPPER_HALF_BLOCK = '▀'
+LOWER_HALF_BLOCK = '▄'
+
+_RESET_SEQUENCE = '\x1b[0m'
+
+# SGR parameters of transparent pixels which use the default colors
+_DEFAULT_FG = '39'
+_DEFAULT_BG = '49'
+
+
+def _pixel_rows(pixels, width, height):
+    """Return rows of RGB tuples or None for transparent pixels."""
+    if _is_ndarray(pixels):
+        pixels = pixels.tolist()
+
+    if width is not None and height is not None and len(pixels) and\
+            isinstance(pixels[0], int):
+        # A flat sequence of RGB components such as an array or bytes
+        if len(pixels) != width * height * 3:
+            raise ValueError(
+                'Expected {0} RGB components for a {1}x{2} image but got '
+                '{3}'.format(width * height * 3, width, height, len(pixels)),
+            )
+
+        stride = width * 3
+
+        return [
+            [
+                tuple(pixels[y * stride + x:y * stride + x + 3])
+                for x in range(0, stride, 3)
+            ]
+            for y in range(height)
+        ]
+
+    rows = pixels[:height] if height is not None else pixels
+
+    return [
+        [
+            None if pixel is None else tuple(pixel)
+            for pixel in (row[:width] if width is not None else row)
+        ]
+        for row in rows
+    ]
+
+
+def _quantize(colors, color_count):
+    """Return foreground SGR parameters for a list of unique RGB colors."""
+    if color_count == 2**24:
+        return ['38;2;{0};{1};{2}'.format(*rgb) for rgb in colors]
+
+    clut = colorise.nix.cluts.get_clut(color_count)
+    params = []
+
+    for key in closest_colors(colors, clut):
+        if color_count <= 16:
+            # System colors are keyed by their escape code
+            params.append(str(key))
+        else:
+            params.append('38;5;{0}'.format(key))
+
+    return params
+
+
+def _to_bg(param):
+    """Convert foreground SGR parameters into background parameters."""
+    if param.startswith('38;'):
+        return '48;' + param[3:]
+
+    return str(int(param) + 10)
+
+
+def _cell(upper, lower, fg_params, bg_params):
+    """Return (fg, bg, character, fg params, bg params) for a terminal cell."""
+    if upper is not None:
+        return (
+            upper,
+            lower,
+            UPPER_HALF_BLOCK,
+            fg_params[upper],
+            bg_params[lower],
+        )
+    elif lower is not None:
+        # The default foreground color would show in the upper half
+        return lower, None, LOWER_HALF_BLOCK, fg_params[lower], _DEFAULT_BG
+
+    return None, None, ' ', _DEFAULT_FG, _DEFAULT_BG
+
+
+def _cell_rows(rows, color_count):
+    """Return rows of cells for pairs of pixel rows."""
+    unique = list({
+        pixel for row in rows for pixel in row if pixel is not None
+    })
+    fg_params = dict(zip(unique, _quantize(unique, color_count)))
+    bg_params = {color: _to_bg(param) for color, param in fg_params.items()}
+    bg_params[None] = _DEFAULT_BG
+    cell_rows = []
+
+    for y in range(0, len(rows), 2):
+        top = rows[y]
+        bottom = rows[y + 1] if y + 1 < len(rows) else []
+        cell_rows.append([
+            _cell(
+                upper,
+                bottom[x] if x < len(bottom) else None,
+                fg_params,
+                bg_params,
+            )
+            for x, upper in enumerate(top)
+        ])
+
+    return cell_rows
+
+
+def _runs(cells):
+    """Yield (start, end, cell) tuples for runs of identical cells."""
+    start = 0
+
+    for x in range(1, len(cells) + 1):
+        if x == len(cells) or cells[x][2:] != cells[start][2:]:
+            yield start, x, cells[start]
+            start = x
+
+
+def format_image(pixels, width=None, height=None, color_count=None):
+    """Return an image as a string with embedded ANSI escape sequences.
+
+    The pixels are either rows of RGB tuples, a NumPy array of shape
+    (height, width, 3) or a flat sequence of RGB components such as an
+    array.array or bytes in which case width and height must be given.
+    Pixels that are None are transparent. Otherwise, only the first height
+    rows and width columns are used.
+
+    Colors are approximated for the given color count which defaults to the
+    number of colors supported by the terminal. Each line ends with
+    os.linesep.
+
+    """
+    if color_count is None:
+        color_count = colorise.num_colors()
+
+    lines = []
+
+    for cells in _cell_rows(_pixel_rows(pixels, width, height), color_count):
+        parts = []
+
+        for start, end, cell in _runs(cells):
+            parts.append('\x1b[{0};{1}m'.format(cell[3], cell[4]))
+            parts.append(cell[2] * (end - start))
+
+        parts.append(_RESET_SEQUENCE)
+        lines.append(''.join(parts))
+
+    if not lines:
+        return ''
+
+    return _RESET_SEQUENCE + os.linesep.join(lines) + os.linesep
+
+
+def _rgb_format(rgb):
+    """Return a colorise color format for an RGB tuple or None."""
+    return None if rgb is None else 'rgb({0};{1};{2})'.format(*rgb)
+
+
+def _print_console(pixels, width, height, file):
+    """Print an image to a console that does not interpret ANSI sequences."""
+    rows = _pixel_rows(pixels, width, height)
+    lines = []
+    spans = []
+    offset = 0
+
+    for cells in _cell_rows(rows, colorise.num_colors()):
+        for start, end, cell in _runs(cells):
+            spans.append((
+                offset + start,
+                offset + end,
+                Style(fg=_rgb_format(cell[0]), bg=_rgb_format(cell[1])),
+            ))
+
+        lines.append(''.join(cell[2] for cell in cells))
+        offset += len(cells) + len(os.linesep)
+
+    if lines:
+        colorise.highlight_spans(os.linesep.join(lines), spans, file=file)
+
+
+def render(pixels, width=None, height=None, file=sys.stdout):
+    """Print an image to a target stream.
+
+    The arguments are the same as for :py:func:`format_image`. Each image is
+    written to the stream in a single write. Nothing is written if colors are
+    disabled by the output policy.
+
+    """
+    if not colorise.policy.colors_enabled(file):
+        return
+
+    if not colorise._supports_ansi(file):
+        _print_console(pixels, width, height, file)
+        return
+
+    _write(file, format_image(pixels, width, height))
+    _flush(file)
+
+    if colorise._minimal_escapes:
+        # The image ends with a reset
+        colorise.sgr.set_state(file, colorise.sgr.DEFAULT)
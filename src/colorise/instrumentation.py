@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Opt-in counters and timers of the work done by colorise.
+
+Statistics are disabled by default and each instrumented code path only
+checks a single flag so the overhead is negligible unless they are enabled
+with :py:func:`enable`. Text is counted in characters and escape sequences in
+bytes (which are the same since they only contain ASCII characters).
+
+"""
+
+import _thread
+import time
+
+# Regular expression for the ANSI escape sequences emitted by colorise which is
+# compiled when statistics are first recorded to keep imports cheap
+_ESCAPE_RE = None
+
+_COUNTERS = (
+    'writes',
+    'flushes',
+    'characters_written',
+    'escape_bytes',
+    'set_color_calls',
+    'reset_color_calls',
+    'capability_probes',
+    'color_lookups',
+    'color_cache_misses',
+)
+
+_TIMERS = (
+    'color_resolution_time',
+    'approximation_time',
+)
+
+_STREAM_COUNTERS = (
+    'writes',
+    'flushes',
+    'characters_written',
+    'escape_bytes',
+)
+
+# Checked by instrumented code before recording anything
+_enabled = False
+
+_lock = _thread.allocate_lock()
+_counters = dict.fromkeys(_COUNTERS + _TIMERS, 0)
+_streams = {}
+
+
+def enable(enabled=True):
+    """Enable or disable collection of statistics."""
+    global _enabled
+
+    _enabled = enabled
+
+
+def is_enabled():
+    """Return True if statistics are being collected."""
+    return _enabled
+
+
+def reset():
+    """Reset all statistics to zero."""
+    with _lock:
+        _counters.update(dict.fromkeys(_COUNTERS + _TIMERS, 0))
+        _streams.clear()
+
+
+def snapshot():
+    """Return a dictionary of the current statistics.
+
+    The 'streams' entry maps the name of each stream written to onto its own
+    write, flush and character counts.
+
+    """
+    with _lock:
+        stats = dict(_counters)
+        stats['streams'] = {
+            name: dict(counts) for name, counts in _streams.items()
+        }
+
+    stats['enabled'] = _enabled
+    stats['color_cache_hits'] =\
+        stats['color_lookups'] - stats['color_cache_misses']
+
+    return stats
+
+
+def _stream_name(file):
+    """Return a name identifying a stream."""
+    # Attribute buffered output to the stream it is eventually written to
+    stream = getattr(file, 'stream', file)
+    name = getattr(stream, 'name', None)
+
+    if isinstance(name, str):
+        return name
+
+    return '<{0}>'.format(type(stream).__name__)
+
+
+def _stream_counts(file):
+    """Return the counters of a stream, must be called with the lock held."""
+    name = _stream_name(file)
+
+    try:
+        return _streams[name]
+    except KeyError:
+        counts = _streams[name] = dict.fromkeys(_STREAM_COUNTERS, 0)
+
+        return counts
+
+
+def increment(name, amount=1):
+    """Increment a counter."""
+    with _lock:
+        _counters[name] += amount
+
+
+def add_time(name, seconds):
+    """Add to a cumulative timer."""
+    with _lock:
+        _counters[name] += seconds
+
+
+def record_write(file, data):
+    """Record a write of a string to a stream."""
+    global _ESCAPE_RE
+
+    if _ESCAPE_RE is None:
+        import re
+
+        _ESCAPE_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+    escape_bytes = sum(len(match) for match in _ESCAPE_RE.findall(data))
+
+    with _lock:
+        stream_counts = _stream_counts(file)
+
+        for counts in (_counters, stream_counts):
+            counts['writes'] += 1
+            counts['characters_written'] += len(data)
+            counts['escape_bytes'] += escape_bytes
+
+
+def record_flush(file):
+    """Record a flush of a stream."""
+    with _lock:
+        _counters['flushes'] += 1
+        _stream_counts(file)['flushes'] += 1
+
+
+def write(file, data):
+    """Write a string to a stream and record it if enabled."""
+    if _enabled:
+        record_write(file, data)
+
+    file.write(data)
+
+
+def flush(file):
+    """Flush a stream and record it if enabled."""
+    if _enabled:
+        record_flush(file)
+
+    file.flush()
+
+
+class _Timer:
+    """Context manager that adds the time spent within it to a timer."""
+
+    def __init__(self, name):
+        """Initialise the timer."""
+        self._name = name
+        self._start = None
+
+    def __enter__(self):  # noqa: D105
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):  # noqa: D105
+        add_time(self._name, time.perf_counter() - self._start)
+
+
+def timed(name):
+    """Return a context manager that adds the time spent within to a timer."""
+    return _Timer(name)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Colored logging.
+
+:py:class:`ColorHandler` is a :py:class:`logging.Handler` that colors each
+record according to its level. Records are rendered into a single string with
+the escape sequences of a precompiled style embedded on the logging thread and
+handed to a background thread through a bounded queue. The background thread
+writes everything that has been queued in one go and flushes the stream so
+application threads never wait for a write or a flush unless the queue is full.
+
+>>> handler = colorise.logging.ColorHandler()
+>>> logging.getLogger().addHandler(handler)
+
+"""
+
+import logging
+import queue
+import sys
+import threading
+import traceback
+
+import colorise
+import colorise.policy
+from colorise.attributes import Attr
+from colorise.instrumentation import flush as _flush, write as _write
+from colorise.nix.color_functions import RESET_SEQUENCE as _RESET_SEQUENCE
+from colorise.style import Style
+
+# Default styles by level, records use the style of the closest level at or
+# below their own
+DEFAULT_STYLES = {
+    logging.DEBUG: Style(fg='cyan'),
+    logging.INFO: Style(),
+    logging.WARNING: Style(fg='yellow'),
+    logging.ERROR: Style(fg='red'),
+    logging.CRITICAL: Style(fg='red', attributes=[Attr.Bold]),
+}
+
+# Default maximum number of records waiting to be written
+_DEFAULT_QUEUE_SIZE = 1024
+
+# Tells the writer thread to stop
+_STOP = object()
+
+
+class ColorHandler(logging.Handler):
+    """A logging handler that writes colored records from a background thread.
+
+    The styles map levels to :py:class:`colorise.Style` instances and default
+    to :py:data:`DEFAULT_STYLES`. The escape sequences of each style are
+    resolved once per level when it is first used.
+
+    At most queue_size records wait to be written, after which logging blocks
+    until the background thread catches up instead of using more memory.
+    Calling :py:meth:`flush` waits until all queued records have been written
+    and :py:meth:`close` stops the background thread. Both are called by
+    :py:func:`logging.shutdown` at exit.
+
+    """
+
+    terminator = '\n'
+
+    def __init__(
+        self,
+        stream=None,
+        styles=None,
+        queue_size=_DEFAULT_QUEUE_SIZE,
+        level=logging.NOTSET,
+    ):
+        """Initialise the handler and start its writer thread."""
+        super().__init__(level)
+        self._stream = sys.stderr if stream is None else stream
+        self._styles = dict(DEFAULT_STYLES if styles is None else styles)
+        self._levels = sorted(self._styles, reverse=True)
+        self._prefixes = {}
+        self._color_count = None
+        self._ansi = None
+        self._closed = False
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(
+            target=self._run,
+            name='colorise.logging.ColorHandler',
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def stream(self):
+        """Return the stream that records are written to."""
+        return self._stream
+
+    def get_style(self, levelno):
+        """Return the style for a level or None if it has no style."""
+        for level in self._levels:
+            if level <= levelno:
+                return self._styles[level]
+
+        return None
+
+    def _prefix(self, levelno):
+        """Return the escape sequence written before a record of a level."""
+        try:
+            return self._prefixes[levelno]
+        except KeyError:
+            if self._color_count is None:
+                self._color_count = colorise.num_colors()
+
+            style = self.get_style(levelno)
+            prefix = _RESET_SEQUENCE
+
+            if style:
+                prefix += style.ansi(self._color_count)
+
+            self._prefixes[levelno] = prefix
+
+            return prefix
+
+    def render(self, record):
+        """Return a formatted record with embedded escape sequences."""
+        message = self.format(record)
+
+        if not colorise.policy.colors_enabled(self._stream):
+            return message + self.terminator
+
+        return self._prefix(record.levelno) + message + _RESET_SEQUENCE +\
+            self.terminator
+
+    def emit(self, record):
+        """Queue a record to be written by the writer thread."""
+        try:
+            if self._ansi is None:
+                self._ansi = colorise._supports_ansi(self._stream)
+
+            if self._ansi:
+                item = self.render(record)
+            else:
+                # Consoles without ANSI support are colored by the writer
+                # thread using console API calls
+                item = (self.format(record), self.get_style(record.levelno))
+
+            if self._closed:
+                self._write_items([item])
+            else:
+                self._queue.put(item)
+        except Exception:
+            self.handleError(record)
+
+    def _write_items(self, items):
+        """Write rendered records to the stream."""
+        parts = []
+
+        for item in items:
+            if isinstance(item, tuple):
+                if parts:
+                    _write(self._stream, ''.join(parts))
+                    parts = []
+
+                message, style = item
+                colorise.cprint(message, style=style or Style(),
+                                end=self.terminator, file=self._stream)
+            elif item is not _STOP:
+                parts.append(item)
+
+        if parts:
+            data = ''.join(parts)
+
+            if colorise._minimal_escapes:
+                # Rendered records end with a reset unless colors are disabled
+                data = colorise.sgr.plain_prefix(self._stream) + data
+
+            _write(self._stream, data)
+
+        _flush(self._stream)
+
+    def _run(self):
+        """Write queued records until the handler is closed."""
+        while True:
+            items = [self._queue.get()]
+
+            # Write all records that were queued in the meantime at once
+            try:
+                while items[-1] is not _STOP:
+                    items.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                self._write_items(items)
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc(file=sys.stderr)
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+            if items[-1] is _STOP:
+                return
+
+    def flush(self):
+        """Wait until all queued records have been written."""
+        if not self._closed:
+            self._queue.join()
+
+    def close(self):
+        """Write all queued records and stop the writer thread."""
+        self.acquire()
+
+        try:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(_STOP)
+                self._thread.join()
+        finally:
+            self.release()
+
+        super().close()
@@ -4,8 +4,9 @@
 """Nix color look-up tables (CLUTs) and functions."""
 
 import collections
+import functools
 
-from colorise.color_tools import closest_color
+from colorise.color_tools import get_clut_index
 from colorise.terminal import terminal_name
 
 _COLOR_ESCAPE_CODE = '\x1b['
@@ -64,53 +65,84 @@ _NIX_SYSTEM_COLOR_NAMES['lightgrey'] = 37
 _NIX_SYSTEM_COLOR_NAMES['magenta'] = 35
 _NIX_SYSTEM_COLOR_NAMES['lightmagenta'] = 95
 
+# RGB values of the 16 system colors of xterm by color index
+_XTERM_SYSTEM_COLORS = [
+    (0x00, 0x00, 0x00),  # black
+    (0xcd, 0x00, 0x00),  # red
+    (0x00, 0xcd, 0x00),  # green
+    (0xcd, 0xcd, 0x00),  # yellow
+    (0x00, 0x00, 0xee),  # blue
+    (0xcd, 0x00, 0xcd),  # purple
+    (0x00, 0xcd, 0xcd),  # cyan
+    (0xe5, 0xe5, 0xe5),  # lightgray
+    (0x7f, 0x7f, 0x7f),  # gray
+    (0xff, 0x00, 0x00),  # lightred
+    (0x00, 0xff, 0x00),  # lightgreen
+    (0xff, 0xff, 0x00),  # lightyellow
+    (0x5c, 0x5c, 0xff),  # lightblue
+    (0xff, 0x00, 0xff),  # lightpurple
+    (0x00, 0xff, 0xff),  # lightcyan
+    (0xff, 0xff, 0xff),  # white
+]
+
 # xterm 88-color look-up table (based on 88colres.h)
 _XTERM_CLUT_88_STEPS = [0x00, 0x8b, 0xcd, 0xff]
 _XTERM_CLUT_88_GRAYSCALE = [46, 92, 113, 139, 162, 185, 208, 231]
-_XTERM_CLUT_88 = collections.OrderedDict(_NIX_SYSTEM_COLORS)
-
-_XTERM_CLUT_88.update(
-    zip(
-        range(16, 88),
-        [
-            (r, g, b)
-            for r in _XTERM_CLUT_88_STEPS
-            for g in _XTERM_CLUT_88_STEPS
-            for b in _XTERM_CLUT_88_STEPS
-        ],
-    )
-)
-
-_XTERM_CLUT_88.update(
-    zip(
-        range(80, 89),
-        [(g, g, g) for g in _XTERM_CLUT_88_GRAYSCALE],
-    )
-)
 
 # xterm 256-color look-up table
 _XTERM_CLUT_256_STEPS = [0x00, 0x5f, 0x87, 0xaf, 0xd7, 0xff]
 _XTERM_CLUT_256_GRAYSCALE = [8 + 10 * i for i in range(24)]
-_XTERM_CLUT_256 = collections.OrderedDict(_NIX_SYSTEM_COLORS)
-
-_XTERM_CLUT_256.update(
-    zip(
-        range(16, 232),
-        [
-            (r, g, b)
-            for r in _XTERM_CLUT_256_STEPS
-            for g in _XTERM_CLUT_256_STEPS
-            for b in _XTERM_CLUT_256_STEPS
-        ],
+
+
+def _build_xterm_clut(steps, cube_end, grayscale, grayscale_end):
+    """Build an xterm CLUT from its color cube steps and grayscale ramp."""
+    clut = collections.OrderedDict(_NIX_SYSTEM_COLORS)
+
+    clut.update(
+        zip(
+            range(16, cube_end),
+            [(r, g, b) for r in steps for g in steps for b in steps],
+        )
+    )
+
+    clut.update(
+        zip(
+            range(cube_end, grayscale_end),
+            [(g, g, g) for g in grayscale],
+        )
     )
-)
 
-_XTERM_CLUT_256.update(
-    zip(
-        range(232, 256),
-        [(g, g, g) for g in _XTERM_CLUT_256_GRAYSCALE],
+    return clut
+
+
+@functools.lru_cache(maxsize=None)
+def get_xterm_clut_88():
+    """Return the xterm 88-color look-up table.
+
+    The table is built the first time it is needed.
+
+    """
+    return _build_xterm_clut(
+        _XTERM_CLUT_88_STEPS,
+        80,
+        _XTERM_CLUT_88_GRAYSCALE,
+        89,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_xterm_clut_256():
+    """Return the xterm 256-color look-up table.
+
+    The table is built the first time it is needed.
+
+    """
+    return _build_xterm_clut(
+        _XTERM_CLUT_256_STEPS,
+        232,
+        _XTERM_CLUT_256_GRAYSCALE,
+        256,
     )
-)
 
 
 def get_prefix(color_count, bg):
@@ -122,13 +154,16 @@ def get_clut(color_count):
     """Return the appropriate color look-up table."""
     if terminal_name() == 'iTerm.app' and color_count == 88:
         # Uses the 256 color table for 88 color indices
-        return _XTERM_CLUT_256
+        return get_xterm_clut_256()
+
+    if color_count == 88:
+        return get_xterm_clut_88()
+    elif color_count == 256:
+        return get_xterm_clut_256()
 
     return {
         8: _NIX_SYSTEM_COLORS,
         16: _NIX_SYSTEM_COLORS,
-        88: _XTERM_CLUT_88,
-        256: _XTERM_CLUT_256,
     }[color_count]
 
 
@@ -166,17 +201,42 @@ def color_from_index(idx, color_count, bg, attributes, file):
         else:
             # Approximate > 88 color index with 256 color clut
             return prefix,\
-                closest_color(_XTERM_CLUT_256[idx], _XTERM_CLUT_88)
+                get_clut_index(get_xterm_clut_88()).closest(
+                    get_xterm_clut_256()[idx],
+                )
     else:
         if idx <= 16:
             return _COLOR_PREFIX_16, idx + 10 * int(bg)
         else:
             # Approximate > 16 color index with 256 color clut
-            key = closest_color(_XTERM_CLUT_256[idx], _NIX_SYSTEM_COLORS)
+            key = get_clut_index(_NIX_SYSTEM_COLORS).closest(
+                get_xterm_clut_256()[idx],
+            )
 
             return _COLOR_PREFIX_16, key + 10 * int(bg)
 
 
+def name_to_rgb(name):
+    """Return the xterm RGB values of a color name."""
+    if name not in _NIX_SYSTEM_COLOR_NAMES:
+        raise ValueError("Unknown color name '{0}'".format(name))
+
+    code = _NIX_SYSTEM_COLOR_NAMES[name]
+
+    return _XTERM_SYSTEM_COLORS[code - 30 if code < 90 else code - 82]
+
+
+def index_to_rgb(idx):
+    """Return the xterm RGB values of a color index."""
+    if idx < 0 or idx > 255:
+        raise ValueError('Color index must be in range 0-255 inclusive')
+
+    if idx < 16:
+        return _XTERM_SYSTEM_COLORS[idx]
+
+    return get_xterm_clut_256()[idx]
+
+
 def get_rgb_color(color_count, bg, rgb, attributes, file):
     """Get the color for an RGB triple or approximate it if necessary."""
     prefix = get_prefix(color_count, bg)
@@ -184,7 +244,7 @@ def get_rgb_color(color_count, bg, rgb, attributes, file):
     if color_count < 2**24:
         # No true-color capabilities and color was given as a true-color value,
         # approximate to closest color given current capabilities
-        color_idx = closest_color(rgb, get_clut(color_count))
+        color_idx = get_clut_index(get_clut(color_count)).closest(rgb)
 
         if color_count <= 16:
             return prefix, color_idx + 10 * int(bg)
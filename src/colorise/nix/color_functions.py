@@ -6,15 +6,28 @@
 import os
 import sys
 
+import colorise.capabilities
 import colorise.error
 import colorise.nix.cluts
 from colorise.attributes import Attr
 from colorise.cluts import get_color
+from colorise.instrumentation import write as _write
 from colorise.terminal import terminal_name
 
 
 def num_colors():
-    """Attempt to get the number of colors supported by the terminal."""
+    """Attempt to get the number of colors supported by the terminal.
+
+    The terminal of the original standard output is probed once per process
+    and the result is cached until the relevant environment variables change
+    or the cache is explicitly refreshed.
+
+    """
+    return colorise.capabilities.cached('num_colors', _probe_num_colors)
+
+
+def _probe_num_colors():
+    """Probe the terminal for the number of colors it supports."""
     colorterm = os.environ.get('COLORTERM')
 
     if colorterm in ('truecolor', '24bit'):
@@ -58,6 +71,10 @@ def to_ansi(*codes):
         '{0}m'.format(';'.join(str(c) for c in codes))
 
 
+# Escape sequence that resets all colors and attributes
+RESET_SEQUENCE = to_ansi(Attr.Reset.value)
+
+
 def attributes_to_codes(attributes):
     """Convert a set of attributes to ANSI escape codes."""
     return [int(attr.value) for attr in attributes]
@@ -65,7 +82,24 @@ def attributes_to_codes(attributes):
 
 def reset_color(file=sys.stdout):
     """Reset all colors and attributes."""
-    file.write(to_ansi(Attr.Reset.value))
+    _write(file, RESET_SEQUENCE)
+
+
+def get_sequence(fg, bg, attributes, color_count):
+    """Return the ANSI escape sequence for a set of colors and attributes."""
+    codes = []
+
+    if attributes:
+        codes.append(to_ansi(*attributes_to_codes(attributes)))
+
+    if Attr.Reset not in attributes:
+        for colorspec, isbg in ((fg, False), (bg, True)):
+            if colorspec:
+                prefix, color = get_color(colorspec, color_count,
+                                          colorise.nix.cluts, isbg)
+                codes.append(prefix.format(color))
+
+    return ''.join(codes)
 
 
 def set_color(
@@ -85,22 +119,23 @@ def set_color(
     if attributes is None:
         attributes = []
 
-    codes = []
+    sequence = get_sequence(fg, bg, attributes, num_colors_func())
 
-    if attributes:
-        codes.append(to_ansi(*attributes_to_codes(attributes)))
+    if sequence:
+        _write(file, sequence)
 
-    if Attr.Reset not in attributes:
-        color_count = num_colors_func()
 
-        for colorspec, isbg in ((fg, False), (bg, True)):
-            if colorspec:
-                prefix, color = get_color(colorspec, color_count,
-                                          colorise.nix.cluts, isbg)
-                codes.append(prefix.format(color))
+def set_style(style, file=sys.stdout, num_colors_func=num_colors):
+    """Set the colors and attributes of a precompiled style."""
+    sequence = style.ansi(num_colors_func())
+
+    if sequence:
+        _write(file, sequence)
+
 
-    if codes:
-        file.write(''.join(codes))
+def supports_ansi(file):
+    """Return True if colors are set via ANSI escape sequences for a stream."""
+    return True
 
 
 def redefine_colors(color_map, file=sys.stdout):
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Deciding whether colors are output to a stream.
+
+The output policy decides whether colorise outputs colors at all. When colors
+are disabled by the policy, output is written as plain text without resolving
+any colors, exactly as if ``enabled=False`` had been passed.
+
+Decisions are made once per stream and policy, without re-reading the
+environment on every call, and are forgotten along with cached capabilities,
+e.g. when :py:func:`colorise.refresh_capabilities` is called.
+
+"""
+
+import os
+
+import colorise.capabilities
+
+# Always output colors
+ALWAYS = 'always'
+
+# Never output colors
+NEVER = 'never'
+
+# Output colors unless disabled by the NO_COLOR environment variable or forced
+# by FORCE_COLOR
+ENVIRONMENT = 'environment'
+
+# Like ENVIRONMENT but also disable colors for streams that are not terminals,
+# for TERM=dumb and for CLICOLOR=0 unless forced by CLICOLOR_FORCE
+AUTO = 'auto'
+
+_POLICIES = (ALWAYS, NEVER, ENVIRONMENT, AUTO)
+
+# The current output policy
+_policy = ENVIRONMENT
+
+# Cached decisions by policy and stream key
+_decisions = {}
+
+
+def set_policy(policy):
+    """Set the output policy."""
+    global _policy
+
+    if policy not in _POLICIES:
+        raise ValueError(
+            'Unknown output policy {0!r}, must be one of {1}'.format(
+                policy,
+                ', '.join(repr(p) for p in _POLICIES),
+            ),
+        )
+
+    _policy = policy
+
+
+def get_policy():
+    """Return the output policy."""
+    return _policy
+
+
+def _is_set(name):
+    """Return True if an environment variable is set to a non-empty value."""
+    return bool(os.environ.get(name))
+
+
+def _isatty(file):
+    """Return True if a stream is connected to a terminal."""
+    try:
+        return file.isatty()
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _probe_colors_enabled(policy, file):
+    """Decide whether colors are output to a stream given a policy."""
+    if _is_set('NO_COLOR'):
+        return False
+
+    if os.environ.get('FORCE_COLOR', '0') not in ('', '0'):
+        return True
+
+    if policy == ENVIRONMENT:
+        return True
+
+    if os.environ.get('CLICOLOR_FORCE', '0') != '0':
+        return True
+
+    if os.environ.get('TERM') == 'dumb' or os.environ.get('CLICOLOR') == '0':
+        return False
+
+    return file is None or _isatty(file)
+
+
+def colors_enabled(file=None):
+    """Return True if colors should be output to a stream.
+
+    If file is None, only the environment is taken into account which is used
+    when formatting strings whose destination is unknown.
+
+    """
+    policy = _policy
+
+    if policy == ALWAYS:
+        return True
+    elif policy == NEVER:
+        return False
+
+    if policy == AUTO and file is not None:
+        key = colorise.capabilities.stream_key(file)
+
+        if key is None:
+            # Streams without file descriptors cannot be told apart by key
+            # and checking them is cheap
+            return _probe_colors_enabled(policy, file)
+    else:
+        key = file = None
+
+    try:
+        return _decisions[policy, key]
+    except KeyError:
+        enabled = _probe_colors_enabled(policy, file)
+        _decisions[policy, key] = enabled
+
+        return enabled
+
+
+def _clear_decisions():
+    """Forget all decisions."""
+    global _decisions
+
+    # Replace instead of clearing so concurrent readers are not affected
+    _decisions = {}
+
+
+colorise.capabilities.add_listener(_clear_decisions)
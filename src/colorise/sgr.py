@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Tracking of Select Graphic Rendition (SGR) state for minimal output.
+
+By default, colorise resets colors and attributes before and after all
+colored output. When minimal escapes are enabled, the SGR state each ANSI
+stream was left in is remembered instead and only the escape codes needed to
+go from that state to the next one are written. Colors therefore remain set
+between calls until they are changed, reset with
+:py:func:`colorise.reset_color` or reset when the interpreter exits.
+
+"""
+
+import colorise
+from colorise.instrumentation import flush as _flush, write as _write
+
+_ESCAPE_CODE = '\x1b['
+
+# SGR parameters that turn attributes off, 22 turns off both bold and faint
+_ATTRIBUTE_OFF = {1: 22, 2: 22, 3: 23, 4: 24, 5: 25, 7: 27}
+
+# SGR attribute codes that are visible on whitespace, i.e. underline and
+# reverse
+_VISIBLE_ON_WHITESPACE = frozenset([4, 7])
+
+# SGR parameters that turn the default foreground and background colors back
+# on
+_DEFAULT_FG = '39'
+_DEFAULT_BG = '49'
+
+# Set when minimal escapes are enabled
+_enabled = False
+
+# Last known SGR state of each stream, created when first enabled
+_states = None
+
+
+class SgrState:
+    """Colors and attributes set on a terminal by SGR escape sequences.
+
+    The foreground and background colors are stored as the SGR parameters
+    that set them, e.g. '31' or '38;5;201', or None for default colors while
+    attributes are a frozenset of SGR attribute codes.
+
+    """
+
+    __slots__ = ('_fg', '_bg', '_attributes')
+
+    def __init__(self, fg=None, bg=None, attributes=frozenset()):
+        """Initialise the state."""
+        self._fg = fg
+        self._bg = bg
+        self._attributes = frozenset(attributes)
+
+    @property
+    def fg(self):
+        """Return the SGR parameters of the foreground color."""
+        return self._fg
+
+    @property
+    def bg(self):
+        """Return the SGR parameters of the background color."""
+        return self._bg
+
+    @property
+    def attributes(self):
+        """Return the SGR codes of the attributes."""
+        return self._attributes
+
+    def params(self):
+        """Return the SGR parameters that set this state after a reset."""
+        params = [str(code) for code in sorted(self._attributes)]
+
+        if self._fg:
+            params.append(self._fg)
+
+        if self._bg:
+            params.append(self._bg)
+
+        return params
+
+    def combine(self, other):
+        """Return the state after setting another state on top of this one."""
+        return SgrState(
+            other.fg or self._fg,
+            other.bg or self._bg,
+            self._attributes | other.attributes,
+        )
+
+    def without_bg(self):
+        """Return this state with the default background color."""
+        return SgrState(self._fg, None, self._attributes)
+
+    def __eq__(self, other):  # noqa: D105
+        if not isinstance(other, SgrState):
+            return NotImplemented
+
+        return self._fg == other.fg and self._bg == other.bg and\
+            self._attributes == other.attributes
+
+    def __ne__(self, other):  # noqa: D105
+        result = self.__eq__(other)
+
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):  # noqa: D105
+        return hash((self._fg, self._bg, self._attributes))
+
+    def __bool__(self):  # noqa: D105
+        return bool(self._fg or self._bg or self._attributes)
+
+    def __repr__(self):  # noqa: D105
+        return '{0}(fg={1!r}, bg={2!r}, attributes={3!r})'.format(
+            self.__class__.__name__,
+            self._fg,
+            self._bg,
+            sorted(self._attributes),
+        )
+
+
+# State of a terminal after a reset
+DEFAULT = SgrState()
+
+
+def to_sequence(params):
+    """Return an escape sequence for a list of SGR parameters."""
+    if not params:
+        return ''
+
+    return _ESCAPE_CODE + ';'.join(params) + 'm'
+
+
+def parse(sequence, state=DEFAULT):
+    """Return the state after writing escape sequences in a given state.
+
+    Returns a (reset, state) tuple where reset is True if the sequences
+    contain a full reset.
+
+    """
+    fg = state.fg
+    bg = state.bg
+    attributes = set(state.attributes)
+    reset = False
+
+    for part in sequence.split(_ESCAPE_CODE)[1:]:
+        params = part.rstrip('m').split(';')
+        idx = 0
+
+        while idx < len(params):
+            code = int(params[idx] or 0)
+
+            if code in (38, 48):
+                # Extended colors take two or four more parameters
+                count = 2 if params[idx + 1] == '5' else 4
+                color = ';'.join(params[idx:idx + count + 1])
+                idx += count
+
+                if code == 38:
+                    fg = color
+                else:
+                    bg = color
+            elif 30 <= code <= 37 or 90 <= code <= 97:
+                fg = str(code)
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                bg = str(code)
+            elif code == 39:
+                fg = None
+            elif code == 49:
+                bg = None
+            elif code == 0:
+                fg = bg = None
+                attributes.clear()
+                reset = True
+            elif code == 22:
+                attributes -= {1, 2}
+            elif code in _ATTRIBUTE_OFF.values():
+                attributes -= {
+                    a for a, off in _ATTRIBUTE_OFF.items() if off == code
+                }
+            else:
+                attributes.add(code)
+
+            idx += 1
+
+    return reset, SgrState(fg, bg, attributes)
+
+
+def _compile_style(fg, bg, attributes, color_count):
+    """Return the reset flag and SGR state of a style's escape sequence."""
+    from colorise.nix.color_functions import get_sequence
+
+    return parse(get_sequence(fg, bg, attributes, color_count))
+
+
+def apply_style(state, style, color_count):
+    """Return the state after setting a style in a given state.
+
+    The parsed state of the style is cached on the style.
+
+    """
+    reset, style_state = style.resolve(
+        ('sgr', color_count),
+        _compile_style,
+        color_count,
+    )
+
+    if reset or state is None:
+        return style_state
+
+    return state.combine(style_state)
+
+
+def transition(current, target):
+    """Return the shortest escape sequence that changes one state to another.
+
+    The current state may be None if it is unknown in which case colors and
+    attributes are reset first.
+
+    """
+    if current == target:
+        return ''
+
+    full = to_sequence(['0'] + target.params())
+
+    if current is None:
+        return full
+
+    off = set()
+
+    for code in current.attributes - target.attributes:
+        if code not in _ATTRIBUTE_OFF:
+            return full
+
+        off.add(_ATTRIBUTE_OFF[code])
+
+    on = target.attributes - current.attributes
+
+    if 22 in off:
+        # Turning off bold also turns off faint and vice versa
+        on |= target.attributes & {1, 2}
+
+    params = [str(code) for code in sorted(off)] +\
+        [str(code) for code in sorted(on)]
+
+    if target.fg != current.fg:
+        params.append(target.fg or _DEFAULT_FG)
+
+    if target.bg != current.bg:
+        params.append(target.bg or _DEFAULT_BG)
+
+    delta = to_sequence(params)
+
+    return delta if len(delta) < len(full) else full
+
+
+def _blank(state):
+    """Return True if whitespace looks the same in a state as by default."""
+    return state is not None and not state.bg and\
+        not state.attributes & _VISIBLE_ON_WHITESPACE
+
+
+def before_text(state, target, text):
+    """Return the escape sequence to write before text and the new state.
+
+    Whitespace looks the same in all states without a background color,
+    underline or reverse so the state is left unchanged for whitespace in
+    such states.
+
+    """
+    if text.isspace() and _blank(state) and _blank(target):
+        return '', state
+
+    return transition(state, target), target
+
+
+def format_runs(string, runs, state, color_count):
+    """Format styled runs of a string starting in a given state.
+
+    Runs are sorted, non-overlapping (start, end, style) tuples. Returns the
+    string with embedded escape sequences and the state it leaves the
+    terminal in.
+
+    """
+    parts = []
+    idx = 0
+
+    for start, end, style in runs:
+        if idx < start:
+            sequence, state = before_text(state, DEFAULT, string[idx:start])
+            parts.append(sequence)
+            parts.append(string[idx:start])
+
+        target = apply_style(DEFAULT, style, color_count)
+        sequence, state = before_text(state, target, string[start:end])
+        parts.append(sequence)
+        parts.append(string[start:end])
+        idx = end
+
+    if idx < len(string):
+        sequence, state = before_text(state, DEFAULT, string[idx:])
+        parts.append(sequence)
+        parts.append(string[idx:])
+
+    return ''.join(parts), state
+
+
+def format_end(end, state):
+    """Return the escape sequence to write before an ending and the new state.
+
+    Background colors are turned off before endings so they do not fill the
+    next line when the terminal scrolls.
+
+    """
+    if end and state is not None and state.bg:
+        target = state.without_bg()
+
+        return transition(state, target), target
+
+    return '', state
+
+
+def plain_prefix(file):
+    """Return the escape sequence to write before uncolored output.
+
+    This is only non-empty for streams that are known to have colors or
+    attributes set.
+
+    """
+    state = get_state(file)
+
+    if not state:
+        return ''
+
+    set_state(file, DEFAULT)
+
+    return transition(state, DEFAULT)
+
+
+def enable(enabled=True):
+    """Enable or disable minimal escapes.
+
+    Disabling minimal escapes resets the colors and attributes of all streams
+    that are known to have them set.
+
+    """
+    global _enabled, _states
+
+    _enabled = bool(enabled)
+    colorise._minimal_escapes = _enabled
+
+    if _enabled and _states is None:
+        import weakref
+
+        _states = weakref.WeakKeyDictionary()
+    elif not _enabled and _states is not None:
+        states, _states = _states, None
+
+        for file, state in list(states.items()):
+            if state and not getattr(file, 'closed', False):
+                _write(file, transition(state, DEFAULT))
+                _flush(file)
+
+
+def is_enabled():
+    """Return True if minimal escapes are enabled."""
+    return _enabled
+
+
+def _target(file):
+    """Return the stream that a possibly buffered stream writes to."""
+    import colorise.buffering
+
+    while isinstance(file, colorise.buffering.BufferedStream):
+        file = file.stream
+
+    return file
+
+
+def get_state(file):
+    """Return the last known state of a stream or None if it is unknown."""
+    if _states is None:
+        return None
+
+    try:
+        return _states.get(_target(file))
+    except TypeError:
+        # The stream cannot be weakly referenced
+        return None
+
+
+def set_state(file, state):
+    """Remember the state of a stream."""
+    if _states is None:
+        return
+
+    try:
+        _states[_target(file)] = state
+    except TypeError:
+        pass
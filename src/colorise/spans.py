@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Merging of possibly overlapping styled spans into non-overlapping runs."""
+
+import heapq
+
+from colorise.style import Style
+
+
+def _top(heap, ended):
+    """Return the value of the most recent active span in a heap or None."""
+    while heap and heap[0][0] in ended:
+        heapq.heappop(heap)
+
+    return heap[0][1] if heap else None
+
+
+def merge_spans(length, spans):
+    """Merge spans into sorted, non-overlapping runs of styles.
+
+    Spans are (start, end, style) tuples where start is inclusive and end is
+    exclusive. Spans are clipped to the range [0, length) and may overlap in
+    which case their styles are combined: Foreground and background colors of
+    later spans take precedence while attributes are combined. Only ranges
+    covered by at least one span are returned as (start, end, style) tuples
+    and adjacent runs with equal styles are merged.
+
+    The spans are merged in O(n log n) time in the number of spans regardless
+    of the length of the covered ranges.
+
+    """
+    clipped = []
+
+    for order, (start, end, style) in enumerate(spans):
+        start = max(start, 0)
+        end = min(end, length)
+
+        if start < end and style:
+            clipped.append((start, order, end, style))
+
+    clipped.sort()
+
+    if all(clipped[i][2] <= clipped[i + 1][0]
+           for i in range(len(clipped) - 1)):
+        # Fast path for the common case of non-overlapping spans
+        return _coalesce([(start, end, style)
+                          for start, _, end, style in clipped])
+
+    return _sweep(clipped)
+
+
+def _coalesce(runs):
+    """Merge adjacent runs with equal styles."""
+    merged = []
+
+    for run in runs:
+        if merged and merged[-1][1] == run[0] and merged[-1][2] == run[2]:
+            merged[-1] = (merged[-1][0], run[1], run[2])
+        else:
+            merged.append(run)
+
+    return merged
+
+
+def _sweep(spans):
+    """Combine the styles of overlapping spans sorted by start position."""
+    events = []
+
+    for start, order, end, style in spans:
+        # Sort ends before starts at the same position so adjacent spans
+        # do not overlap
+        events.append((start, 1, order, style))
+        events.append((end, 0, order, style))
+
+    events.sort(key=lambda event: event[:3])
+
+    fg_heap = []
+    bg_heap = []
+    attribute_counts = {}
+    attributes = ()
+    active = 0
+    ended = set()
+    styles = {}
+    runs = []
+    idx = 0
+    event_count = len(events)
+
+    while idx < event_count:
+        pos = events[idx][0]
+        attributes_changed = False
+
+        # Apply all events at the current position
+        while idx < event_count and events[idx][0] == pos:
+            _, is_start, order, style = events[idx]
+            idx += 1
+
+            if is_start:
+                active += 1
+
+                if style.fg is not None:
+                    heapq.heappush(fg_heap, (-order, style.fg))
+
+                if style.bg is not None:
+                    heapq.heappush(bg_heap, (-order, style.bg))
+
+                for attribute in style.attributes:
+                    attribute_counts[attribute] =\
+                        attribute_counts.get(attribute, 0) + 1
+                    attributes_changed = True
+            else:
+                active -= 1
+                ended.add(-order)
+
+                for attribute in style.attributes:
+                    attribute_counts[attribute] -= 1
+                    attributes_changed = True
+
+        # Attributes are recomputed even when no spans are active so they do
+        # not carry over to later spans
+        if attributes_changed:
+            attributes = tuple(sorted(
+                (attr for attr, count in attribute_counts.items()
+                 if count > 0),
+                key=lambda attr: attr.value,
+            ))
+
+        if not active or idx == event_count:
+            continue
+
+        key = (_top(fg_heap, ended), _top(bg_heap, ended), attributes)
+
+        # Reuse merged styles so each combination is only resolved once
+        try:
+            merged = styles[key]
+        except KeyError:
+            merged = styles[key] = Style(*key)
+
+        if runs and runs[-1][1] == pos and runs[-1][2] is merged:
+            runs[-1] = (runs[-1][0], events[idx][0], merged)
+        else:
+            runs.append((pos, events[idx][0], merged))
+
+    return runs
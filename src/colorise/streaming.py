@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Chunked regular expression matching over file-like objects."""
+
+import re
+
+# Default number of characters read from an input stream at a time
+_DEFAULT_CHUNK_SIZE = 2**16
+
+# Default number of characters kept back so matches can cross chunks
+_DEFAULT_LOOKBACK = 2**10
+
+
+def compile_patterns(patterns):
+    """Return a list of compiled regular expressions.
+
+    The patterns argument is a pattern or an iterable of patterns where each
+    pattern is either a string or a compiled regular expression.
+
+    """
+    if isinstance(patterns, (str, type(re.compile('')))):
+        patterns = [patterns]
+
+    return [re.compile(pattern) for pattern in patterns]
+
+
+def iter_chunks(infile, chunk_size=_DEFAULT_CHUNK_SIZE):
+    """Yield chunks of at most chunk_size characters read from a stream."""
+    if chunk_size < 1:
+        raise ValueError('Chunk size must be positive')
+
+    while True:
+        chunk = infile.read(chunk_size)
+
+        if not chunk:
+            break
+
+        yield chunk
+
+
+def iter_matches(
+    patterns,
+    infile,
+    chunk_size=_DEFAULT_CHUNK_SIZE,
+    lookback=_DEFAULT_LOOKBACK,
+):
+    """Read a stream in chunks and yield pieces of text with their matches.
+
+    Yields (text, spans) pairs where spans is a list of (start, end) tuples
+    relative to text for each match of any of the patterns. Concatenating all
+    yielded text gives the input.
+
+    The last lookback characters of each chunk are held back and searched
+    again with the next chunk so matches of up to lookback characters that
+    cross a chunk boundary are found. The same number of already yielded
+    characters is kept as context so anchors and lookbehind assertions work
+    across chunks. Longer matches may be split into several adjacent matches.
+    Memory use is bounded by chunk_size and lookback regardless of the size
+    of the input.
+
+    """
+    if chunk_size < 1:
+        raise ValueError('Chunk size must be positive')
+
+    if lookback < 0:
+        raise ValueError('Lookback must not be negative')
+
+    patterns = compile_patterns(patterns)
+    context = ''
+    pending = ''
+    eof = False
+
+    while not eof:
+        chunk = infile.read(chunk_size)
+        eof = not chunk
+        pending += chunk
+
+        if not pending:
+            break
+
+        buffer = context + pending
+        offset = len(context)
+        cut = len(buffer) if eof else max(len(buffer) - lookback, offset)
+        matches = sorted(
+            match.span()
+            for pattern in patterns
+            for match in pattern.finditer(buffer, offset)
+            if match.end() > match.start()
+        )
+        spans = []
+
+        for start, end in matches:
+            if start >= cut:
+                # Searched again with the next chunk
+                break
+
+            # Matches that straddle the cut are moved to the current piece
+            # of text
+            cut = max(cut, end)
+            spans.append((start - offset, end - offset))
+
+        if cut == offset:
+            # Not enough input to produce anything yet
+            continue
+
+        text = buffer[offset:cut]
+
+        yield text, spans
+
+        pending = buffer[cut:]
+        context = buffer[max(cut - lookback, 0):cut]
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Precompiled styles of colors and attributes."""
+
+
+class Style:
+    """A reusable combination of foreground, background and attributes.
+
+    Resolving colors and attributes into something a terminal understands
+    requires parsing the color formats and possibly approximating them. A
+    style does this once for each color capability it is used with and caches
+    the result so subsequent uses only write the already resolved output.
+
+    >>> warning = colorise.Style(fg='yellow', attributes=[Attr.Bold])
+    >>> colorise.cprint('Careful!', style=warning)
+
+    """
+
+    __slots__ = ('_fg', '_bg', '_attributes', '_compiled')
+
+    def __init__(self, fg=None, bg=None, attributes=None):
+        """Initialise the style."""
+        self._fg = fg
+        self._bg = bg
+        self._attributes = tuple(attributes) if attributes else ()
+        self._compiled = {}
+
+    @property
+    def fg(self):
+        """Return the foreground color of the style."""
+        return self._fg
+
+    @property
+    def bg(self):
+        """Return the background color of the style."""
+        return self._bg
+
+    @property
+    def attributes(self):
+        """Return the attributes of the style."""
+        return self._attributes
+
+    def resolve(self, key, compiler, *args):
+        """Return the compiled style for a key, compiling it if necessary.
+
+        The compiler is called with the foreground, background and list of
+        attributes of the style followed by any extra arguments and its result
+        is cached under the given key.
+
+        """
+        try:
+            return self._compiled[key]
+        except KeyError:
+            compiled = compiler(self._fg, self._bg, list(self._attributes),
+                                *args)
+            self._compiled[key] = compiled
+
+            return compiled
+
+    def ansi(self, color_count):
+        """Return the ANSI escape sequence that sets the style."""
+        try:
+            return self._compiled[color_count]
+        except KeyError:
+            from colorise.nix.color_functions import get_sequence
+
+            return self.resolve(color_count, get_sequence, color_count)
+
+    def __bool__(self):  # noqa: D105
+        return bool(self._fg or self._bg or self._attributes)
+
+    def __eq__(self, other):  # noqa: D105
+        if not isinstance(other, Style):
+            return NotImplemented
+
+        return (self._fg, self._bg, self._attributes) ==\
+            (other._fg, other._bg, other._attributes)
+
+    def __hash__(self):  # noqa: D105
+        return hash((self._fg, self._bg, self._attributes))
+
+    def __repr__(self):  # noqa: D105
+        return '{0}(fg={1!r}, bg={2!r}, attributes={3!r})'.format(
+            self.__class__.__name__,
+            self._fg,
+            self._bg,
+            list(self._attributes),
+        )
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Streaming colored tables.
+
+:py:func:`render` prints rows from any iterable as an aligned table without
+holding the whole table in memory. Column widths are either given up front or
+computed from a bounded sample of the first rows and rows are written in
+blocks with one write each:
+
+>>> colorise.table.render(
+...     ((name, size) for name, size in files),
+...     columns=['Name', 'Size'],
+...     styles=[colorise.Style(fg='blue'), None],
+... )
+
+"""
+
+import itertools
+import numbers
+import os
+import sys
+
+import colorise
+from colorise.ansi import truncate, visible_width
+from colorise.attributes import Attr
+from colorise.instrumentation import flush as _flush
+from colorise.style import Style
+
+# Default style of the header row
+HEADER_STYLE = Style(attributes=[Attr.Bold])
+
+# Default number of rows used to compute column widths
+_DEFAULT_SAMPLE_SIZE = 1000
+
+# Default number of rows written at once
+_DEFAULT_BLOCK_SIZE = 256
+
+# Marks cells that were cut off to fit their column
+_PLACEHOLDER = '…'
+
+
+def _cell_text(value):
+    """Return the text of a cell."""
+    if value is None:
+        return ''
+
+    return value if isinstance(value, str) else str(value)
+
+
+def _is_number(value):
+    """Return True if a cell value is a number."""
+    return isinstance(value, numbers.Number) and not isinstance(value, bool)
+
+
+def _column_widths(header, sample, column_count):
+    """Return the widths of columns needed to fit the header and a sample."""
+    widths = [0] * column_count
+
+    for row in itertools.chain([header] if header else [], sample):
+        for idx, value in enumerate(row[:column_count]):
+            widths[idx] = max(widths[idx], visible_width(_cell_text(value)))
+
+    return widths
+
+
+def _column_alignments(sample, column_count):
+    """Right align columns whose sampled values are all numbers."""
+    alignments = []
+
+    for idx in range(column_count):
+        values = [
+            row[idx] for row in sample
+            if idx < len(row) and row[idx] is not None
+        ]
+        numeric = values and all(_is_number(value) for value in values)
+        alignments.append('>' if numeric else '<')
+
+    return alignments
+
+
+def _cell_style(style, value):
+    """Return the style of a cell given the style or condition of a column."""
+    if style is None or isinstance(style, Style):
+        return style
+
+    return style(value)
+
+
+def _format_block(rows, widths, alignments, separator):
+    """Return the text and styled spans of a block of rows."""
+    lines = []
+    spans = []
+    offset = 0
+
+    for row, row_styles in rows:
+        parts = []
+        line_offset = offset
+        styled_end = 0
+
+        for idx, width in enumerate(widths):
+            value = row[idx] if idx < len(row) else None
+            text = _cell_text(value)
+            text_width = visible_width(text)
+
+            if text_width > width:
+                text = truncate(text, width, _PLACEHOLDER)
+                text_width = visible_width(text)
+
+            padding = ' ' * (width - text_width)
+
+            if idx:
+                parts.append(separator)
+                offset += len(separator)
+
+            if alignments[idx] == '>':
+                parts.append(padding)
+                offset += len(padding)
+                padding = ''
+
+            style = _cell_style(row_styles[idx], value)
+
+            if style and text:
+                spans.append((offset, offset + len(text), style))
+                styled_end = offset + len(text) - line_offset
+
+            parts.append(text)
+            parts.append(padding)
+            offset += len(text) + len(padding)
+
+        # Leave out padding at the end of lines
+        line = ''.join(parts)
+        line = line[:max(len(line.rstrip(' ')), styled_end)]
+        lines.append(line)
+        offset = line_offset + len(line) + len(os.linesep)
+
+    lines.append('')
+
+    return os.linesep.join(lines), spans
+
+
+def render(
+    rows,
+    columns=None,
+    styles=None,
+    widths=None,
+    alignments=None,
+    sample_size=_DEFAULT_SAMPLE_SIZE,
+    block_size=_DEFAULT_BLOCK_SIZE,
+    separator='  ',
+    header_style=HEADER_STYLE,
+    file=sys.stdout,
+    enabled=True,
+):
+    """Print rows of values as an aligned table to a target stream.
+
+    Rows are sequences of cell values from any iterable. Values are converted
+    to text with str, None is an empty cell and values may already contain
+    colors, e.g. from :py:func:`colorise.cformat`. If columns is given, it is
+    a sequence of header names printed in the header style.
+
+    Styles is a sequence with an entry for each column that is either a
+    :py:class:`colorise.Style`, None for no style or a callable that is given
+    a cell value and returns the style of the cell or None.
+
+    Widths is a sequence of column widths. If it is not given, the widths are
+    the widest values among the header and the first sample_size rows. Cells
+    that are too wide for their column are truncated. Alignments is a
+    sequence of '<' or '>' for left or right aligned columns and defaults to
+    right aligning columns whose sampled values are all numbers.
+
+    Rows are written block_size rows at a time with a single write.
+
+    """
+    rows = iter(rows)
+    header = list(columns) if columns else None
+    sample = [] if widths else list(itertools.islice(rows, sample_size))
+
+    if widths:
+        column_count = len(widths)
+    else:
+        column_count = max(
+            itertools.chain([len(header or [])], (len(row) for row in sample)),
+        )
+        widths = _column_widths(header, sample, column_count)
+
+    if column_count == 0:
+        return
+
+    if alignments is None:
+        alignments = _column_alignments(sample, column_count)
+
+    styles = list(styles or []) + [None] * (column_count - len(styles or []))
+    block = []
+
+    if header:
+        block.append((header, [header_style] * column_count))
+
+    for row in itertools.chain(sample, rows):
+        block.append((row, styles))
+
+        if len(block) >= block_size:
+            _write_block(block, widths, alignments, separator, file, enabled)
+            block = []
+
+    if block:
+        _write_block(block, widths, alignments, separator, file, enabled)
+
+
+def _write_block(block, widths, alignments, separator, file, enabled):
+    """Write a block of rows to a target stream."""
+    string, spans = _format_block(block, widths, alignments, separator)
+    colorise.highlight_spans(string, spans, end='', file=file,
+                             enabled=enabled)
+    _flush(file)
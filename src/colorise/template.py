@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Precompiled color format templates for colorise.compile.
+
+A template parses a color format string once into a program of literal text,
+style switches and replacement fields so that printing it only has to execute
+the program.
+
+"""
+
+import os
+import string
+import sys
+
+import colorise
+import colorise.policy
+from colorise.attributes import Attr
+from colorise.formatter import is_color_format, parse_color_format
+from colorise.instrumentation import flush as _flush, write as _write
+from colorise.nix.color_functions import RESET_SEQUENCE
+from colorise.style import Style
+
+# Operations of a template program
+_LITERAL = 0
+_STYLE = 1
+_RESET = 2
+_FIELD = 3
+
+# Color count used to validate styles when compiling a template. Whether a
+# color format is valid does not depend on the color count
+_VALIDATION_COLOR_COUNT = 16
+
+
+class Template(string.Formatter):
+    """A color format string that is parsed once and printed many times.
+
+    Templates support the same syntax as :py:func:`colorise.fprint` in
+    addition to ordinary replacement fields that are filled in when printing.
+
+    >>> status = colorise.compile('{fg=green}OK{reset} {0} took {1:.2f}s')
+    >>> status.print('build', 1.2345)
+
+    A field is a color format if any of its comma-separated parts is a color
+    (e.g. 'fg=red') or an attribute, otherwise it is a replacement field.
+    Invalid colors and attributes in color formats are reported when the
+    template is created.
+
+    """
+
+    def __init__(self, fmt, set_style_func, reset_func, num_colors_func,
+                 supports_ansi_func, autoreset=True, styles=None,
+                 replacement_fields=True):
+        """Initialise the template.
+
+        Four OS-dependent functions are passed in for setting a style,
+        resetting colors, getting the number of supported colors and checking
+        if a stream uses ANSI escape sequences. The autoreset and styles
+        arguments are the same as for :py:func:`colorise.fprint`. If
+        replacement_fields is False, all fields must be color formats as in
+        :py:func:`colorise.fprint`.
+
+        """
+        super().__init__()
+
+        self._attribute_names = Attr.names_with_aliases()
+        self._fmt = fmt
+        self._set_style_func = set_style_func
+        self._reset_func = reset_func
+        self._num_colors_func = num_colors_func
+        self._supports_ansi_func = supports_ansi_func
+        self._autoreset = autoreset
+        self._replacement_fields = replacement_fields
+        self._program = self._compile(fmt, autoreset, styles or {})
+
+    @property
+    def format_string(self):
+        """Return the format string the template was compiled from."""
+        return self._fmt
+
+    @property
+    def autoreset(self):
+        """If True, colors are reset before each color format field."""
+        return self._autoreset
+
+    def _compile(self, fmt, autoreset, styles):
+        """Compile a format string into a program."""
+        program = []
+        first_format = True
+        auto_arg_index = 0
+
+        for literal_text, field_name, format_spec, conversion in\
+                self.parse(fmt):
+            if literal_text:
+                program.append((_LITERAL, literal_text))
+
+            style = None
+
+            if field_name in styles:
+                style = styles[field_name]
+            elif field_name is not None and (
+                not self._replacement_fields
+                or is_color_format(field_name, self._attribute_names)
+            ):
+                fg, fg_attrs, bg, bg_attrs = parse_color_format(
+                    field_name,
+                    self._attribute_names,
+                )
+
+                if fg or fg_attrs or bg or bg_attrs:
+                    style = Style(fg, bg, fg_attrs + bg_attrs)
+
+            if style is not None:
+                # Resolve the style now so invalid colors are reported when
+                # compiling instead of when printing
+                style.ansi(_VALIDATION_COLOR_COUNT)
+
+                if autoreset and not first_format:
+                    program.append((_RESET,))
+
+                program.append((_STYLE, style))
+            elif field_name is not None:
+                # Handle arg indexing when empty field_names are given
+                if field_name == '':
+                    if auto_arg_index is False:
+                        raise ValueError('cannot switch from manual field '
+                                         'specification to automatic field '
+                                         'numbering')
+                    field_name = str(auto_arg_index)
+                    auto_arg_index += 1
+                elif field_name.isdigit():
+                    if auto_arg_index:
+                        raise ValueError('cannot switch from manual field '
+                                         'specification to automatic field '
+                                         'numbering')
+                    # Disable auto arg incrementing, if it gets used later on,
+                    # then an exception will be raised
+                    auto_arg_index = False
+
+                program.append((_FIELD, field_name, format_spec, conversion))
+
+            first_format = False
+
+        return program
+
+    def _format_field(self, field_name, format_spec, conversion, args,
+                      kwargs):
+        """Format a single replacement field."""
+        obj, _ = self.get_field(field_name, args, kwargs)
+        obj = self.convert_field(obj, conversion)
+
+        return self.format_field(obj, format_spec)
+
+    def print(self, *args, end=os.linesep, file=sys.stdout, enabled=True,
+              **kwargs):
+        """Print the template with replacement fields filled in.
+
+        Positional and keyword arguments are used for the replacement fields
+        as in str.format. The remaining keyword arguments are the same as for
+        :py:func:`colorise.fprint`.
+
+        """
+        enabled = enabled and colorise.policy.colors_enabled(file)
+
+        if not enabled or self._supports_ansi_func(file):
+            # Colors are embedded in the output so write everything at once
+            if not colorise._minimal_escapes:
+                output = self.render(*args, enabled=enabled, **kwargs) + end
+            elif enabled:
+                output = self._render_minimal(args, kwargs, end, file)
+            else:
+                # Reset any colors left set by minimal escapes
+                output = colorise.sgr.plain_prefix(file) +\
+                    self.render(*args, enabled=False, **kwargs) + end
+
+            _write(file, output)
+            return
+
+        # Flush any remaining stuff before resetting colors
+        _flush(file)
+        self._reset_func(file)
+
+        for op in self._program:
+            code = op[0]
+
+            if code == _LITERAL:
+                _write(file, op[1])
+            elif code == _FIELD:
+                _write(file, self._format_field(op[1], op[2], op[3], args,
+                                                kwargs))
+            else:
+                _flush(file)
+
+                if code == _STYLE:
+                    self._set_style_func(op[1], file)
+                else:
+                    self._reset_func(file)
+
+        _flush(file)  # Flush before resetting colors
+        self._reset_func(file)
+
+        # Make sure to print the end keyword after resetting so the next line
+        # is not affected by a newline or similar
+        _write(file, end)
+
+    def render(self, *args, enabled=True, **kwargs):
+        """Return the template as a string with embedded ANSI escape codes.
+
+        Arguments are the same as for :py:meth:`print`. The returned string
+        does not include an ending.
+
+        """
+        parts = []
+        enabled = enabled and colorise.policy.colors_enabled()
+
+        if enabled:
+            color_count = self._num_colors_func()
+            parts.append(RESET_SEQUENCE)
+
+        for op in self._program:
+            code = op[0]
+
+            if code == _LITERAL:
+                parts.append(op[1])
+            elif code == _FIELD:
+                parts.append(self._format_field(op[1], op[2], op[3], args,
+                                                kwargs))
+            elif enabled:
+                if code == _STYLE:
+                    parts.append(op[1].ansi(color_count))
+                else:
+                    parts.append(RESET_SEQUENCE)
+
+        if enabled:
+            parts.append(RESET_SEQUENCE)
+
+        return ''.join(parts)
+
+    def _render_minimal(self, args, kwargs, end, file):
+        """Render the template using the least escape codes possible.
+
+        Escape codes only change the colors and attributes that the stream
+        was left in by previous output and are only written before text.
+
+        """
+        color_count = self._num_colors_func()
+        state = colorise.sgr.get_state(file)
+        wanted = colorise.sgr.DEFAULT
+        parts = []
+
+        for op in self._program:
+            code = op[0]
+
+            if code == _STYLE:
+                wanted = colorise.sgr.apply_style(wanted, op[1], color_count)
+            elif code == _RESET:
+                wanted = colorise.sgr.DEFAULT
+            else:
+                if code == _LITERAL:
+                    text = op[1]
+                else:
+                    text = self._format_field(op[1], op[2], op[3], args,
+                                              kwargs)
+
+                if text:
+                    sequence, state = colorise.sgr.before_text(state, wanted,
+                                                               text)
+                    parts.append(sequence)
+                    parts.append(text)
+
+        sequence, state = colorise.sgr.format_end(end, state)
+        colorise.sgr.set_state(file, state)
+        parts.append(sequence)
+        parts.append(end)
+
+        return ''.join(parts)
+
+    def __repr__(self):  # noqa: D105
+        return '{0}({1!r})'.format(self.__class__.__name__, self._fmt)
@@ -3,9 +3,10 @@
 
 """Windows color look-up tables and functions."""
 
+import colorise.capabilities
 import colorise.nix.cluts
 from colorise.attributes import Attr
-from colorise.color_tools import closest_color
+from colorise.color_tools import closest_color, get_clut_index, invalidate_clut_index
 from colorise.win.win32_functions import (
     can_interpret_ansi,
     can_redefine_colors,
@@ -78,22 +79,55 @@ _WINDOWS_LOGICAL_NAMES['lightgrey'] = _FOREGROUND_RED | _FOREGROUND_GREEN |\
 _WINDOWS_LOGICAL_NAMES['lightgray'] = _WINDOWS_LOGICAL_NAMES['lightgrey']
 
 
+# The console's current color look-up table, queried on first use
+_console_clut = None
+
+# Incremented whenever the console look-up table is invalidated so results
+# cached elsewhere, e.g. by styles, can be keyed by it
+_generation = 0
+
+
 def get_clut(color_count, file):
     """Return the appropriate color look-up table."""
+    global _console_clut
+
     if can_redefine_colors(file):
-        return get_windows_clut()
+        if _console_clut is None:
+            _console_clut = get_windows_clut()
+
+        return _console_clut
 
     return _WINDOWS_CLUT
 
 
+def invalidate_clut():
+    """Discard the queried console color look-up table and its index.
+
+    This must be called when the console colors are redefined.
+
+    """
+    global _console_clut, _generation
+
+    _generation += 1
+
+    if _console_clut is not None:
+        invalidate_clut_index(_console_clut)
+        _console_clut = None
+
+
+def get_generation():
+    """Return the number of times the look-up table has been invalidated."""
+    return _generation
+
+
 def to_codes(bg, color, attributes):
     """Convert a set of attributes to Windows character attributes."""
     codes = [color] + [_WIN_ATTRIBUTES[attr] for attr in attributes]
 
     if bg:
-        return [code << 4 for code in codes]
+        return tuple(code << 4 for code in codes)
 
-    return codes
+    return tuple(codes)
 
 
 def color_from_name(name, color_count, bg, attributes):
@@ -126,15 +160,13 @@ def color_from_index(idx, color_count, bg, attributes, file):
         )
     elif idx < 88:
         # 88 color index
-        color = closest_color(
-            colorise.nix.cluts._XTERM_CLUT_88[idx],
-            _WINDOWS_CLUT
+        color = get_clut_index(_WINDOWS_CLUT).closest(
+            colorise.nix.cluts.get_xterm_clut_88()[idx],
         )
     elif idx < 256:
         # 256 color index
-        color = closest_color(
-            colorise.nix.cluts._XTERM_CLUT_256[idx],
-            _WINDOWS_CLUT
+        color = get_clut_index(_WINDOWS_CLUT).closest(
+            colorise.nix.cluts.get_xterm_clut_256()[idx],
         )
 
     return to_codes(bg, color, attributes)
@@ -154,6 +186,10 @@ def get_rgb_color(color_count, bg, rgb, attributes, file):
         )
 
     # No true-color capabilities, approximate the rgb color
-    idx = closest_color(rgb, get_clut(color_count, file))
+    idx = get_clut_index(get_clut(color_count, file)).closest(rgb)
 
     return to_codes(bg, idx, attributes)
+
+
+# The console colors may have been changed outside of colorise
+colorise.capabilities.add_listener(invalidate_clut)
@@ -9,7 +9,11 @@ import os
 import platform
 import sys
 
+import colorise.buffering
+import colorise.capabilities
+import colorise.cluts
 import colorise.nix.color_functions
+import colorise.win.cluts
 from colorise.attributes import Attr
 from colorise.cluts import get_color
 from colorise.win.cluts import can_interpret_ansi
@@ -22,7 +26,18 @@ from colorise.win.winhandle import WinHandle
 
 
 def num_colors():
-    """Get the number of colors supported by the terminal."""
+    """Get the number of colors supported by the terminal.
+
+    The console is probed once per process and the result is cached until
+    the relevant environment variables change or the cache is explicitly
+    refreshed.
+
+    """
+    return colorise.capabilities.cached('num_colors', _probe_num_colors)
+
+
+def _probe_num_colors():
+    """Probe the console for the number of colors it supports."""
     if os.environ.get('ConEmuANSI', '') == 'ON':
         # ANSI escapes sequences are interpreted. ConEmu console detected which
         # supports 24-bit colors, but can we detect this somehow?
@@ -61,17 +76,76 @@ def reset_color(file=sys.stdout):
         if handle.is_console_handle:
             # Do not call the console api when output target is not a tty since
             # calls that expect it to be a valid console handle will fail
+            _flush_before_console_call(file)
             set_console_text_attribute(
                 handle,
                 handle.default_fg | handle.default_bg,
             )
 
 
+def _flush_before_console_call(file):
+    """Ensure that all output to a stream is written before a console call.
+
+    Console API calls take effect immediately so any output that is still
+    buffered, e.g. by colorise.buffered, would otherwise be colored wrongly.
+
+    """
+    colorise.buffering.unwrap(file).flush()
+
+
 def or_bit_flags(*bit_flags):
     """Bitwise OR together a list of bitflags into a single flag."""
     return functools.reduce(operator.or_, bit_flags)
 
 
+def get_console_codes(fg, bg, attributes, color_count):
+    """Return the console codes for a foreground and background color.
+
+    Each entry is None if the corresponding color is not given, in which case
+    the default color of the target handle should be used.
+
+    """
+    codes = []
+
+    for idx, color in enumerate([fg, bg]):
+        if color:
+            codes.append(get_color(
+                color,
+                color_count,
+                colorise.win.cluts,
+                idx == 1,
+                attributes,
+            ))
+        else:
+            codes.append(None)
+
+    return codes
+
+
+def set_console_codes(codes, file):
+    """Set console codes as returned by get_console_codes for a stream."""
+    handle = get_win_handle(WinHandle.from_sys_handle(file))
+
+    if handle.is_console_handle:
+        # Combine attributes and color codes into a single bitflag if the
+        # handle is a valid console handle (a tty) since win32 calls that
+        # expect it to be a valid console handle will fail otherwise. The
+        # codes are still resolved by the caller because we want to inform
+        # users about incorrect color formats even if the output is a pipe or
+        # a call in a subprocess
+        flags = []
+
+        for idx, code in enumerate(codes):
+            if code is None:
+                flags.append(handle.default_bg if idx == 1
+                             else handle.default_fg)
+            else:
+                flags.extend(code)
+
+        _flush_before_console_call(file)
+        set_console_text_attribute(handle, or_bit_flags(*flags))
+
+
 def set_color(fg=None, bg=None, attributes=None, file=sys.stdout):
     """Set color and attributes in the terminal."""
     if num_colors() > 16 and can_interpret_ansi(file):
@@ -81,36 +155,37 @@ def set_color(fg=None, bg=None, attributes=None, file=sys.stdout):
     else:
         if fg or bg or attributes:
             if Attr.Reset not in attributes:
-                handle = get_win_handle(WinHandle.from_sys_handle(file))
-                color_count = num_colors()
-                codes = []
-
-                for idx, color in enumerate([fg, bg]):
-                    isbg = idx == 1
-
-                    if color:
-                        codes.extend(get_color(
-                            color,
-                            color_count,
-                            colorise.win.cluts,
-                            isbg,
-                            attributes,
-                        ))
-                    else:
-                        codes.append(
-                            handle.default_bg if isbg else handle.default_fg,
-                        )
-
-                if handle.is_console_handle:
-                    # Combine attributes and color codes into a single bitflag
-                    # if the handle is a valid console handle (a tty) since
-                    # win32 calls that expect it to be a valid console handle
-                    # will fail otherwise. We still call get_color above
-                    # because we want to inform users about incorrect color
-                    # formats even if the output is a pipe or a call in a
-                    # subprocess
-                    flags = or_bit_flags(*codes)
-                    set_console_text_attribute(handle, flags)
+                codes = get_console_codes(fg, bg, attributes, num_colors())
+                set_console_codes(codes, file)
+            else:
+                reset_color(file)
+
+
+def supports_ansi(file):
+    """Return True if colors are set via ANSI escape sequences for a stream."""
+    return num_colors() > 16 and can_interpret_ansi(file)
+
+
+def set_style(style, file=sys.stdout):
+    """Set the colors and attributes of a precompiled style."""
+    color_count = num_colors()
+
+    if color_count > 16 and can_interpret_ansi(file):
+        colorise.nix.color_functions.set_style(
+            style, file, num_colors_func=num_colors,
+        )
+    else:
+        if style:
+            if Attr.Reset not in style.attributes:
+                # Console codes depend on the current console colors so they
+                # are cached per generation of the look-up table
+                generation = colorise.win.cluts.get_generation()
+                codes = style.resolve(
+                    ('win32', color_count, generation),
+                    get_console_codes,
+                    color_count,
+                )
+                set_console_codes(codes, file)
             else:
                 reset_color(file)
 
@@ -118,3 +193,7 @@ def set_color(fg=None, bg=None, attributes=None, file=sys.stdout):
 def redefine_colors(color_map, file=sys.stdout):
     """Redefine the base console colors with a new mapping."""
     _redefine_colors(color_map, file)
+
+    # Colors approximated with the old color table are no longer valid
+    colorise.win.cluts.invalidate_clut()
+    colorise.cluts.clear_color_cache()
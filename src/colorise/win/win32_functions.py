@@ -8,6 +8,7 @@ import os
 import sys
 from ctypes import WinError, wintypes
 
+import colorise.capabilities
 from colorise.win.winhandle import WinHandle
 
 # Create a separate WinDLL instance since the one from ctypes.windll.kernel32
@@ -260,7 +261,20 @@ def restore_console_modes():
 
 
 def can_interpret_ansi(file):
-    """Return True if the Windows console can interpret ANSI escape codes."""
+    """Return True if the Windows console can interpret ANSI escape codes.
+
+    The result is cached per standard handle.
+
+    """
+    return colorise.capabilities.cached(
+        ('can_interpret_ansi', WinHandle.from_sys_handle(file)),
+        _probe_can_interpret_ansi,
+        file,
+    )
+
+
+def _probe_can_interpret_ansi(file):
+    """Probe if the Windows console can interpret ANSI escape codes."""
     # NOTE: Not sure if sys.stdout and sys.stderr are synced with the handles
     # returned by GetStdHandle so we use existing windows functions to tell if
     # the handles are valid console handles
@@ -6,6 +6,8 @@
 import sys
 from ctypes import wintypes
 
+from colorise.buffering import BufferedStream
+
 
 class WinHandle:
     """Represents a Windows stream handle."""
@@ -32,6 +34,9 @@ class WinHandle:
     @classmethod
     def from_sys_handle(cls, syshandle):
         """Return the handle identifier for a python handle."""
+        if isinstance(syshandle, BufferedStream):
+            syshandle = syshandle.stream
+
         if syshandle is sys.stdout:
             return cls.STDOUT
         elif syshandle is sys.stderr:
@@ -13,6 +13,21 @@ import pytest
 import colorise
 
 
+@pytest.fixture(autouse=True)
+def refresh_capabilities():
+    """Ensure that cached capabilities do not leak between tests."""
+    colorise.refresh_capabilities()
+    yield
+    colorise.refresh_capabilities()
+
+
+@pytest.fixture(autouse=True)
+def clear_color_environment(monkeypatch):
+    """Ensure that the environment does not disable or force colors."""
+    for name in ('NO_COLOR', 'FORCE_COLOR', 'CLICOLOR', 'CLICOLOR_FORCE'):
+        monkeypatch.delenv(name, raising=False)
+
+
 @pytest.fixture
 def test_stdout(capsys):
     """Capture and test stdout against a call to a colorise function."""
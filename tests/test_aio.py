@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test asyncio output functions."""
+
+import asyncio
+
+import pytest
+
+import colorise
+import colorise.aio
+
+
+class MockWriter:
+    """Collects written bytes and counts drains like a StreamWriter."""
+
+    def __init__(self):
+        self.data = b''
+        self.writes = 0
+        self.drains = 0
+
+    def write(self, data):
+        assert isinstance(data, bytes)
+        self.data += data
+        self.writes += 1
+
+    async def drain(self):
+        self.drains += 1
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.mark.skip_on_windows
+def test_acprint():
+    writer = MockWriter()
+    run(colorise.aio.acprint(writer, 'Hello', fg='red', end='\n'))
+
+    assert writer.data == b'\x1b[0m\x1b[31mHello\x1b[0m\n'
+    assert writer.writes == 1
+    assert writer.drains == 1
+
+
+@pytest.mark.skip_on_windows
+def test_afprint():
+    writer = MockWriter()
+    run(colorise.aio.afprint(writer, '{fg=red}Hello {bg=blue}world!',
+                             end='\n'))
+
+    assert writer.data == b'\x1b[0m\x1b[31mHello \x1b[0m\x1b[44mworld!'\
+        b'\x1b[0m\n'
+    assert writer.writes == 1
+    assert writer.drains == 1
+
+
+@pytest.mark.skip_on_windows
+def test_ahighlight():
+    writer = MockWriter()
+    run(colorise.aio.ahighlight(writer, 'Hello', [1, 2], fg='red', end=''))
+
+    assert writer.data == b'\x1b[0mH\x1b[31mel\x1b[0mlo'
+    assert writer.writes == 1
+    assert writer.drains == 1
+
+
+def test_aio_disabled():
+    writer = MockWriter()
+
+    async def write_all():
+        await colorise.aio.acprint(writer, 'a', fg='red', end='',
+                                   enabled=False)
+        await colorise.aio.afprint(writer, '{fg=red}b', end='',
+                                   enabled=False)
+        await colorise.aio.ahighlight(writer, 'c', [0], fg='red', end='',
+                                      enabled=False)
+
+    run(write_all())
+
+    assert writer.data == b'abc'
+    assert writer.drains == 3
+
+
+def test_aio_encoding():
+    writer = MockWriter()
+    run(colorise.aio.acprint(writer, 'æøå', end='', enabled=False,
+                             encoding='latin-1'))
+
+    assert writer.data == 'æøå'.encode('latin-1')
+
+    with pytest.raises(UnicodeEncodeError):
+        run(colorise.aio.acprint(writer, 'æøå', enabled=False,
+                                 encoding='ascii'))
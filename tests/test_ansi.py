@@ -1,11 +1,16 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""Test the cprint function."""
+"""Test ANSI escape sequences."""
 
 import pytest
 
+from colorise.ansi import char_width, iter_runs, strip, truncate, visible_width
 from colorise.nix.color_functions import to_ansi
+from colorise.sgr import DEFAULT, SgrState
+
+RED = '\x1b[0m\x1b[31m'
+RESET = '\x1b[0m'
 
 
 @pytest.mark.skip_on_windows
@@ -13,3 +18,66 @@ def test_ansi():
     assert to_ansi(34, '95') == '\x1b[34;95m'
     assert to_ansi(0) == '\x1b[0m'
     assert to_ansi() == ''
+
+
+def test_strip():
+    assert strip('plain') == 'plain'
+    assert strip(RED + 'Hello' + RESET + ' world') == 'Hello world'
+    assert strip('\x1b]8;;https://example.org\x1b\\link\x1b]8;;\x07') ==\
+        'link'
+    assert strip('a\x1b[2Kb\x1b(Bc') == 'abc'
+
+    # Incomplete sequences at the end are removed
+    assert strip('abc\x1b[38;5') == 'abc'
+    assert strip('abc\x1b') == 'abc'
+
+
+def test_char_width():
+    assert char_width('a') == 1
+    assert char_width('\u00e9') == 1
+    assert char_width('\u6f22') == 2
+    assert char_width('\uff21') == 2
+    assert char_width('\U0001f600') == 2
+    assert char_width('\u0301') == 0
+    assert char_width('\u200b') == 0
+    assert char_width('\x07') == 0
+
+
+def test_visible_width():
+    assert visible_width('') == 0
+    assert visible_width('Hello') == 5
+    assert visible_width(RED + 'Hello' + RESET) == 5
+    assert visible_width(RED + '\u6f22\u5b57' + RESET) == 4
+    assert visible_width('e\u0301') == 1
+
+
+def test_truncate():
+    assert truncate('Hello', 5) == 'Hello'
+    assert truncate('Hello world', 5) == 'Hello'
+    assert truncate('Hello world', 5, '...') == 'He...'
+    assert truncate('Hello', 2, '...') == '..'
+
+    # Escape sequences are never cut and all of them are kept
+    assert truncate(RED + 'Hello' + RESET + ' world', 3) ==\
+        RED + 'Hel' + RESET
+    assert truncate(RED + 'Hello' + RESET + ' world', 7, '\u2026') ==\
+        RED + 'Hello' + RESET + ' \u2026'
+
+    # Wide characters that do not fit are left out entirely
+    assert truncate('\u6f22\u5b57', 3) == '\u6f22'
+
+
+def test_iter_runs():
+    assert list(iter_runs('')) == []
+    assert list(iter_runs('plain')) == [(DEFAULT, 'plain')]
+    assert list(iter_runs(
+        'a' + RED + 'b\x1b[2Kc\x1b[1md' + RESET + 'e',
+    )) == [
+        (DEFAULT, 'a'),
+        (SgrState('31'), 'bc'),
+        (SgrState('31', None, [1]), 'd'),
+        (DEFAULT, 'e'),
+    ]
+
+    # Sequences that are not understood do not change the state
+    assert list(iter_runs('a\x1b[38:5:1mb')) == [(DEFAULT, 'ab')]
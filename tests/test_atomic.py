@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test line-atomic output."""
+
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+import colorise
+from colorise.ansi import strip
+from colorise.atomic import PIPE_BUF, AtomicWriter, Collector, _split
+
+pytestmark = pytest.mark.skip_on_windows
+
+
+class Pipe:
+    """A pipe whose output is read by a background thread."""
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe()
+        self._chunks = []
+        self._thread = threading.Thread(target=self._read)
+        self._thread.start()
+
+    def _read(self):
+        while True:
+            chunk = os.read(self.read_fd, 65536)
+
+            if not chunk:
+                break
+
+            self._chunks.append(chunk)
+
+    def output(self):
+        """Close the write end and return everything written to the pipe."""
+        os.close(self.write_fd)
+        self._thread.join()
+        os.close(self.read_fd)
+
+        return b''.join(self._chunks).decode('utf-8')
+
+
+@pytest.fixture
+def pipe():
+    """Return a pipe."""
+    return Pipe()
+
+
+def test_split():
+    assert _split(b'ab\ncd\nef\n', 6) == [b'ab\ncd\n', b'ef\n']
+    assert _split(b'abcdefgh\nij\n', 6) == [b'abcdefgh\n', b'ij\n']
+    assert _split(b'ab\ncd', 100) == [b'ab\ncd']
+
+
+def test_writes_complete_lines(pipe):
+    writer = AtomicWriter(pipe.write_fd)
+
+    colorise.cprint('Hello', fg='red', end='', file=writer)
+    colorise.cprint(' world', fg='blue', file=writer)
+    colorise.cprint('incomplete', end='', file=writer)
+    writer.close()
+
+    assert pipe.output() == (
+        '\x1b[0m\x1b[31mHello\x1b[0m\x1b[0m\x1b[34m world\x1b[0m\n'
+        '\x1b[0mincomplete\x1b[0m'
+    )
+
+    with pytest.raises(ValueError, match=r'^I/O operation on closed'):
+        writer.write('more')
+
+
+def test_single_os_write_per_line(pipe, monkeypatch):
+    writes = []
+    os_write = os.write
+
+    def write(fd, data):
+        writes.append(data)
+        return os_write(fd, data)
+
+    monkeypatch.setattr(os, 'write', write)
+
+    with AtomicWriter(pipe.write_fd) as writer:
+        colorise.highlight('Hello', [0, 2, 4], fg='red', file=writer)
+        colorise.fprint('{fg=green}a{reset} b', file=writer)
+
+    monkeypatch.undo()
+    output = pipe.output()
+
+    assert len(writes) == 2
+    assert strip(output) == 'Hello\na b\n'
+
+
+def _worker(write_fd, name, count):
+    """Print colored lines to a shared pipe."""
+    writer = AtomicWriter(write_fd)
+
+    for i in range(count):
+        colorise.cprint(name * 40, fg='red', end='', file=writer)
+        colorise.cprint(' {0}'.format(i), fg='blue', file=writer)
+
+    writer.close()
+
+
+def _lines_intact(output, names, count):
+    """Return True if all lines written by workers are intact."""
+    lines = strip(output).splitlines()
+
+    return sorted(lines) == sorted(
+        '{0} {1}'.format(name * 40, i) for name in names for i in range(count)
+    )
+
+
+def test_workers_do_not_interleave(pipe):
+    context = multiprocessing.get_context('fork')
+    names = 'abcd'
+    workers = [
+        context.Process(target=_worker, args=(pipe.write_fd, name, 200))
+        for name in names
+    ]
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    assert _lines_intact(pipe.output(), names, 200)
+
+
+def test_collector(pipe):
+    context = multiprocessing.get_context('fork')
+    line = 'x' * (PIPE_BUF * 2)
+
+    with Collector(pipe.write_fd, context=context) as collector:
+        writer = AtomicWriter(pipe.write_fd, collector=collector)
+        colorise.cprint(line, fg='red', file=writer)
+        colorise.cprint('short', file=writer)
+
+    assert strip(pipe.output()) == line + '\nshort\n'
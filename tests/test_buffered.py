@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test buffered output."""
+
+import io
+import os
+
+import pytest
+
+import colorise
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts the number of writes and flushes."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+@pytest.mark.skip_on_windows
+def test_buffered_output():
+    stream = CountingStream()
+
+    with colorise.buffered(stream) as out:
+        colorise.cprint('Hello', fg='red', file=out)
+        colorise.fprint('{fg=blue}world', file=out)
+        colorise.highlight('Hello', [0, 2], bg='blue', file=out)
+
+        assert stream.getvalue() == ''
+        assert stream.writes == 0
+        assert stream.flushes == 0
+
+    assert stream.getvalue() ==\
+        '\x1b[0m\x1b[31mHello\x1b[0m' + os.linesep +\
+        '\x1b[0m\x1b[34mworld\x1b[0m' + os.linesep +\
+        '\x1b[0m\x1b[44mH\x1b[0me\x1b[44ml\x1b[0mlo' + os.linesep
+    assert stream.writes == 1
+    assert stream.flushes == 1
+
+
+def test_buffered_threshold():
+    stream = CountingStream()
+
+    with colorise.buffered(stream, threshold=10) as out:
+        assert out.threshold == 10
+
+        out.write('Hello')
+        assert stream.writes == 0
+
+        out.write('world')
+        assert stream.writes == 1
+        assert stream.getvalue() == 'Helloworld'
+
+        out.write('!')
+
+    assert stream.writes == 2
+    assert stream.getvalue() == 'Helloworld!'
+
+
+def test_buffered_flush_buffer():
+    stream = CountingStream()
+    out = colorise.buffered(stream)
+
+    out.write('Hello')
+    out.flush()
+    assert stream.getvalue() == ''
+
+    out.flush_buffer()
+    assert stream.getvalue() == 'Hello'
+    assert stream.flushes == 0
+    assert not out.closed
+
+    out.close()
+    assert out.closed
+    assert stream.flushes == 1
+    assert not stream.closed
+
+    with pytest.raises(ValueError, match='closed buffered stream'):
+        out.write('world')
+
+
+def test_buffered_stream_attributes():
+    stream = io.StringIO()
+    out = colorise.buffered(stream)
+
+    assert out.stream is stream
+    assert not out.isatty()
+
+    with pytest.raises(io.UnsupportedOperation):
+        out.fileno()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test caching of terminal capabilities."""
+
+import io
+
+import pytest
+
+import colorise
+import colorise.capabilities
+
+
+@pytest.fixture
+def probe():
+    calls = []
+
+    def _probe(value):
+        calls.append(value)
+        return value
+
+    _probe.calls = calls
+
+    return _probe
+
+
+def test_capability_cache(probe, monkeypatch):
+    monkeypatch.setenv('COLORISE_TEST_VARIABLE', 'a')
+    cache = colorise.capabilities.CapabilityCache(['COLORISE_TEST_VARIABLE'])
+
+    assert cache.get('key', probe, 1) == 1
+    assert cache.get('key', probe, 2) == 1
+    assert cache.get('other', probe, 3) == 3
+    assert probe.calls == [1, 3]
+
+    cache.clear()
+
+    assert cache.get('key', probe, 4) == 4
+    assert probe.calls == [1, 3, 4]
+
+
+def test_capability_cache_environment_change(probe, monkeypatch):
+    monkeypatch.setenv('COLORISE_TEST_VARIABLE', 'a')
+    cache = colorise.capabilities.CapabilityCache(['COLORISE_TEST_VARIABLE'])
+
+    assert cache.get('key', probe, 1) == 1
+
+    monkeypatch.setenv('COLORISE_TEST_VARIABLE', 'b')
+    assert cache.get('key', probe, 2) == 2
+
+    monkeypatch.delenv('COLORISE_TEST_VARIABLE')
+    assert cache.get('key', probe, 3) == 3
+    assert cache.get('key', probe, 4) == 3
+
+
+def test_capability_cache_probe_error():
+    cache = colorise.capabilities.CapabilityCache([])
+
+    def failing_probe():
+        raise RuntimeError('Probe failed')
+
+    with pytest.raises(RuntimeError, match='Probe failed'):
+        cache.get('key', failing_probe)
+
+    assert cache.get('key', lambda: 16) == 16
+
+
+def test_stream_key():
+    assert colorise.capabilities.stream_key(io.StringIO()) is None
+    assert colorise.capabilities.stream_key(None) is None
+
+
+@pytest.mark.skip_on_windows
+def test_num_colors_is_cached(monkeypatch):
+    import colorise.nix.color_functions
+
+    calls = []
+
+    def mocked_probe():
+        calls.append(True)
+        return 88
+
+    monkeypatch.setattr(
+        colorise.nix.color_functions,
+        '_probe_num_colors',
+        mocked_probe,
+    )
+    colorise.refresh_capabilities()
+
+    assert colorise.num_colors() == 88
+    assert colorise.num_colors() == 88
+    assert len(calls) == 1
+
+    colorise.refresh_capabilities()
+
+    assert colorise.num_colors() == 88
+    assert len(calls) == 2
+
+
+def test_capability_cache_listeners(probe, monkeypatch):
+    monkeypatch.setenv('COLORISE_TEST_VARIABLE', 'a')
+    cache = colorise.capabilities.CapabilityCache(['COLORISE_TEST_VARIABLE'])
+    invalidations = []
+    cache.add_listener(lambda: invalidations.append(True))
+
+    cache.get('key', probe, 1)
+    cache.get('key', probe, 1)
+    assert len(invalidations) == 1
+
+    monkeypatch.setenv('COLORISE_TEST_VARIABLE', 'b')
+    cache.get('key', probe, 1)
+    assert len(invalidations) == 2
+
+    cache.clear()
+    assert len(invalidations) == 3
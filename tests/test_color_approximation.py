@@ -19,24 +19,28 @@ def test_rgb_approximation(test_stdout, monkeypatch):
     monkeypatch.setenv('COLORTERM', '')
     monkeypatch.setenv('TERM_PROGRAM', '')
     monkeypatch.setenv('TERM_PROGRAM_VERSION', '')
+    colorise.refresh_capabilities()
 
     expected = '\x1b[0m\x1b[31mHello\x1b[0m' + os.linesep
     test_stdout(colorise.cprint, expected, 'Hello', fg='rgb(255;0;0)')
 
     # Mock 16 system colors
     monkeypatch.setattr(curses, 'tigetnum', lambda _: 16)
+    colorise.refresh_capabilities()
 
     expected = '\x1b[0m\x1b[31mHello\x1b[0m' + os.linesep
     test_stdout(colorise.cprint, expected, 'Hello', fg='rgb(255;0;0)')
 
     # Mock 88 colors
     monkeypatch.setattr(curses, 'tigetnum', lambda _: 88)
+    colorise.refresh_capabilities()
 
     expected = '\x1b[0m\x1b[38;5;64mHello\x1b[0m' + os.linesep
     test_stdout(colorise.cprint, expected, 'Hello', fg='rgb(255;0;0)')
 
     # Mock 256 colors
     monkeypatch.setattr(curses, 'tigetnum', lambda _: 256)
+    colorise.refresh_capabilities()
 
     expected = '\x1b[0m\x1b[38;5;196mHello\x1b[0m' + os.linesep
     test_stdout(colorise.cprint, expected, 'Hello', fg='rgb(255;0;0)')
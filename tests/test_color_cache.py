@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test memoization of resolved colors."""
+
+import pytest
+
+import colorise
+import colorise.cluts
+import colorise.nix.cluts
+
+
+@pytest.fixture
+def color_cache():
+    colorise.cluts.set_color_cache_size(2)
+    yield
+    colorise.cluts.set_color_cache_size(colorise.cluts._DEFAULT_CACHE_SIZE)
+
+
+def get_color(value, color_count=256):
+    return colorise.cluts.get_color(value, color_count, colorise.nix.cluts)
+
+
+def test_color_cache_hits_and_misses(color_cache):
+    assert get_color('rgb(255;0;0)') == ('\x1b[38;5;{0}m', 196)
+    assert get_color('rgb(255;0;0)') == ('\x1b[38;5;{0}m', 196)
+    assert get_color('rgb(255;0;0)', 16) == ('\x1b[{0}m', 31)
+
+    info = colorise.cluts.color_cache_info()
+
+    assert (info.hits, info.misses, info.maxsize, info.currsize) ==\
+        (1, 2, 2, 2)
+
+
+def test_color_cache_eviction(color_cache):
+    get_color('red')
+    get_color('blue')
+    get_color('red')
+    get_color('green')
+
+    # 'blue' was the least recently used color and should have been evicted
+    get_color('blue')
+
+    info = colorise.cluts.color_cache_info()
+
+    assert (info.hits, info.misses, info.currsize) == (1, 4, 2)
+
+
+def test_color_cache_errors(color_cache):
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Unknown color name 'unknown'"):
+            get_color('unknown')
+
+    assert colorise.cluts.color_cache_info().currsize == 0
+
+
+def test_color_cache_cleared_on_refresh(color_cache):
+    get_color('red')
+    colorise.refresh_capabilities()
+
+    assert colorise.cluts.color_cache_info().currsize == 0
@@ -1,10 +1,27 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import math
+import random
+
 import pytest
 
-from colorise.color_tools import closest_color, color_difference
-from colorise.nix.cluts import _NIX_SYSTEM_COLORS, _XTERM_CLUT_88, _XTERM_CLUT_256
+from colorise.color_tools import (
+    ClutIndex,
+    closest_color,
+    closest_colors,
+    color_difference,
+    get_clut_index,
+    hls_to_rgb,
+    hls_to_rgb_batch,
+    hsv_to_rgb,
+    hsv_to_rgb_batch,
+    invalidate_clut_index,
+)
+from colorise.nix.cluts import _NIX_SYSTEM_COLORS, get_xterm_clut_88, get_xterm_clut_256
+
+_XTERM_CLUT_88 = get_xterm_clut_88()
+_XTERM_CLUT_256 = get_xterm_clut_256()
 
 
 @pytest.fixture
@@ -55,3 +72,124 @@ def test_closest_color_xterm256(test_colors):
     assert closest_color(blue, _XTERM_CLUT_256) == 21
     assert closest_color(forest, _XTERM_CLUT_256) == 64
     assert closest_color(orangish, _XTERM_CLUT_256) == 173
+
+
+def euclidean_distance(rgb1, rgb2):
+    return math.sqrt(sum((i - j)**2 for i, j in zip(rgb1, rgb2)))
+
+
+@pytest.mark.parametrize('clut', [
+    _NIX_SYSTEM_COLORS,
+    _XTERM_CLUT_88,
+    _XTERM_CLUT_256,
+])
+@pytest.mark.parametrize('metric', [color_difference, euclidean_distance])
+def test_clut_index_matches_closest_color(test_colors, clut, metric):
+    rng = random.Random(1)
+    colors = list(test_colors) + list(clut.values()) + [
+        (0, 0, 0),
+        (255, 255, 255),
+        (31, 32, 63),
+        (300, 0, 0),
+    ]
+    colors.extend(
+        tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(500)
+    )
+
+    index = ClutIndex(clut, metric)
+
+    for rgb in colors:
+        assert index.closest(rgb) == closest_color(rgb, clut, metric)
+
+
+def test_clut_index_cell_size():
+    clut = {0: (0, 0, 0), 1: (255, 255, 255)}
+
+    assert ClutIndex(clut, cell_size=1).closest((200, 200, 200)) == 1
+    assert ClutIndex(clut, cell_size=256).closest((20, 20, 20)) == 0
+
+    with pytest.raises(ValueError, match='Cell size must be a divisor of 256'):
+        ClutIndex(clut, cell_size=100)
+
+
+def test_shared_clut_index():
+    clut = {0: (0, 0, 0), 1: (255, 255, 255)}
+    index = get_clut_index(clut)
+
+    assert get_clut_index(clut) is index
+    assert get_clut_index(clut, euclidean_distance) is not index
+
+    invalidate_clut_index(clut)
+    clut[1] = (10, 10, 10)
+
+    assert get_clut_index(clut) is not index
+    assert get_clut_index(clut).closest((200, 200, 200)) == 1
+
+
+@pytest.fixture
+def random_colors():
+    rng = random.Random(2)
+
+    return [tuple(rng.randint(0, 255) for _ in range(3)) for _ in range(200)]
+
+
+@pytest.fixture
+def hsv_colors():
+    return [(0, 0, 0), (360, 100, 100), (249, 41, 100), (120.5, 0, 50)] + [
+        (h, s, v) for h in range(0, 361, 45) for s in (0, 33, 100)
+        for v in (0, 50, 100)
+    ]
+
+
+@pytest.fixture
+def hls_colors():
+    return [(0.6919, 0.7940, 1.0), (0, 0, 0), (1.0, 1.0, 1.0)] + [
+        (h / 8., lightness / 4., s / 4.) for h in range(9)
+        for lightness in range(5) for s in range(5)
+    ]
+
+
+def test_closest_colors(random_colors):
+    for clut in [_NIX_SYSTEM_COLORS, _XTERM_CLUT_88, _XTERM_CLUT_256]:
+        expected = [closest_color(rgb, clut) for rgb in random_colors]
+
+        assert closest_colors(random_colors, clut) == expected
+        assert closest_colors(iter(random_colors), clut) == expected
+        assert closest_colors([list(rgb) for rgb in random_colors], clut) ==\
+            expected
+
+    assert closest_colors([], _XTERM_CLUT_256) == []
+
+
+def test_hsv_to_rgb_batch(hsv_colors):
+    assert hsv_to_rgb_batch(hsv_colors) ==\
+        [hsv_to_rgb(*hsv) for hsv in hsv_colors]
+
+
+def test_hls_to_rgb_batch(hls_colors):
+    assert hls_to_rgb_batch(hls_colors) ==\
+        [hls_to_rgb(*hls) for hls in hls_colors]
+
+
+def test_closest_colors_numpy(random_colors):
+    numpy = pytest.importorskip('numpy')
+    colors = numpy.array(random_colors).reshape(10, 20, 3)
+
+    for clut in [_NIX_SYSTEM_COLORS, _XTERM_CLUT_88, _XTERM_CLUT_256]:
+        expected = [closest_color(rgb, clut) for rgb in random_colors]
+        result = closest_colors(colors, clut)
+
+        assert result.shape == (10, 20)
+        assert result.reshape(-1).tolist() == expected
+
+        result = closest_colors(colors, clut, euclidean_distance)
+        assert result.shape == (10, 20)
+
+
+def test_batch_conversion_numpy(hsv_colors, hls_colors):
+    numpy = pytest.importorskip('numpy')
+
+    assert hsv_to_rgb_batch(numpy.array(hsv_colors)).tolist() ==\
+        [list(hsv_to_rgb(*hsv)) for hsv in hsv_colors]
+    assert hls_to_rgb_batch(numpy.array(hls_colors)).tolist() ==\
+        [list(hls_to_rgb(*hls)) for hls in hls_colors]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test colored strings."""
+
+import io
+import os
+
+import pytest
+
+from colorise import Style
+from colorise.colored_string import ColoredString
+
+RED = Style(fg='red')
+GREEN = Style(fg='green')
+
+
+def test_colored_string():
+    string = ColoredString('Hello', fg='red')
+
+    assert len(string) == 5
+    assert str(string) == 'Hello'
+    assert string.text == 'Hello'
+    assert string.spans() == [(0, 5, RED)]
+    assert ColoredString('plain').spans() == []
+    assert ColoredString('').runs() == []
+
+    with pytest.raises(ValueError, match=r'^Cannot use a style together'):
+        ColoredString('Hello', fg='red', style=GREEN)
+
+
+def test_concatenation():
+    name = ColoredString('colorise', style=GREEN)
+    line = 'Welcome to ' + name + '!'
+
+    assert line.text == 'Welcome to colorise!'
+    assert line.runs() == [(0, 11, None), (11, 19, GREEN), (19, 20, None)]
+
+    # Adjacent runs with the same style are merged
+    assert (name + name).runs() == [(0, 16, GREEN)]
+    assert name + '' == name
+
+    with pytest.raises(TypeError):
+        name + 1
+
+
+def test_slicing():
+    line = 'ab' + ColoredString('cd', style=RED) +\
+        ColoredString('ef', style=GREEN)
+
+    assert line[1:5].runs() == [(0, 1, None), (1, 3, RED), (3, 4, GREEN)]
+    assert line[2:4] == ColoredString('cd', style=RED)
+    assert line[-1] == ColoredString('f', style=GREEN)
+    assert line[::2].runs() == [(0, 1, None), (1, 2, RED), (2, 3, GREEN)]
+    assert line[4:2] == ColoredString()
+
+    with pytest.raises(IndexError):
+        line[6]
+
+
+def test_join_and_split():
+    words = [ColoredString('a', style=RED), 'b', ColoredString('c', style=RED)]
+    joined = ColoredString(', ', style=RED).join(words)
+
+    assert joined.text == 'a, b, c'
+    assert joined.runs() == [(0, 3, RED), (3, 4, None), (4, 7, RED)]
+    assert joined.split(', ') == [
+        ColoredString('a', style=RED),
+        ColoredString('b'),
+        ColoredString('c', style=RED),
+    ]
+    assert [part.text for part in joined.split(', ', 1)] == ['a', 'b, c']
+
+    string = ColoredString(' a b  c ', style=RED)
+    assert [part.text for part in string.split()] == ['a', 'b', 'c']
+    assert [part.text for part in string.split(None, 1)] == ['a', 'b  c ']
+    assert string.split()[0] == ColoredString('a', style=RED)
+
+    with pytest.raises(ValueError, match=r'^empty separator$'):
+        string.split('')
+
+
+def test_equality():
+    assert ColoredString('a', style=RED) == ColoredString('a', fg='red')
+    assert ColoredString('a', style=RED) != ColoredString('a', style=GREEN)
+    assert ColoredString('a') != 'a'
+    assert hash(ColoredString('a', style=RED)) ==\
+        hash(ColoredString('a', fg='red'))
+
+
+@pytest.mark.skip_on_windows
+def test_render_and_print():
+    line = 'a' + ColoredString('b', style=RED)
+    output = io.StringIO()
+    line.print(file=output)
+
+    assert line.render() == '\x1b[0ma\x1b[31mb\x1b[0m'
+    assert line.render(enabled=False) == 'ab'
+    assert output.getvalue() == '\x1b[0ma\x1b[31mb\x1b[0m' + os.linesep
+    assert ColoredString('plain').render() == 'plain'
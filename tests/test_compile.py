@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test compiled color format templates."""
+
+import os
+import sys
+
+import pytest
+
+import colorise
+
+
+def test_valid_compile():
+    colorise.compile('Hello {fg=red}world')
+    colorise.compile('Hello {fg=201,bg=#a696ff}world')
+    colorise.compile('Hello {fg=hsv(249;41;100),bold}world {0} {name}')
+    colorise.compile('Hello {bg=rgb(167;151;255)}{}{}')
+
+
+def test_invalid_compile():
+    invalid_formats = [
+        ('{fg=unknown}Hello', r"^Unknown color name 'unknown'$"),
+        ('{fg=300}Hello', r"^Color index must be in range 0-255 inclusive$"),
+        ('{bg=#a69ff}Hello', r"^Unknown or invalid color format '#a69ff'$"),
+        ('{fg=red,blod}Hello', r"^Unknown color format or attribute 'blod'$"),
+        ('{fg=red,fg=red}Hello', r'^Duplicate foreground color format$'),
+        ('{}{0}', r'^cannot switch from manual field specification'),
+    ]
+
+    for fmt, error_message in invalid_formats:
+        with pytest.raises(ValueError, match=error_message):
+            colorise.compile(fmt)
+
+
+@pytest.mark.skip_on_windows
+def test_compiled_output_matches_fprint(redirect):
+    formats = [
+        '{fg=red}Hello',
+        'Hel{bg=blue}lo',
+        '{fg=red}Hello {bg=blue}world!',
+        '{fg=red,bold}Hello {reset}world',
+    ]
+
+    for fmt in formats:
+        for autoreset in [True, False]:
+            with redirect('stdout') as stdout:
+                colorise.fprint(fmt, autoreset=autoreset, file=sys.stdout)
+                expected = stdout.value
+
+            with redirect('stdout') as stdout:
+                template = colorise.compile(fmt, autoreset=autoreset)
+                template.print(file=sys.stdout)
+
+                assert stdout.value == expected
+
+
+@pytest.mark.skip_on_windows
+def test_compiled_replacement_fields(test_stdout):
+    template = colorise.compile('{fg=red}{0}: {bg=blue}{count:>3}{1!r}')
+
+    test_stdout(
+        template.print,
+        '\x1b[0m\x1b[31mError: \x1b[0m\x1b[44m  3\'!\'\x1b[0m' + os.linesep,
+        'Error',
+        '!',
+        count=3,
+    )
+
+    test_stdout(
+        template.print,
+        'Error:   3\'!\'' + os.linesep,
+        'Error',
+        '!',
+        count=3,
+        enabled=False,
+    )
+
+
+@pytest.mark.skip_on_windows
+def test_compiled_styles(test_stdout):
+    styles = {'warn': colorise.Style(fg='yellow')}
+    template = colorise.compile('{warn}{}', styles=styles)
+
+    test_stdout(
+        template.print,
+        '\x1b[0m\x1b[33mCareful\x1b[0m!',
+        'Careful',
+        end='!',
+    )
+
+
+def test_compiled_missing_arguments():
+    template = colorise.compile('{fg=red}{0} {name}')
+
+    with pytest.raises(IndexError):
+        template.print()
+
+    with pytest.raises(KeyError):
+        template.print('Hello')
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test colored differences."""
+
+import io
+import random
+
+import pytest
+
+import colorise
+import colorise.diff
+from colorise.diff import DELETE, EQUAL, INSERT, diff_lines, diff_stream
+
+
+def test_diff_lines():
+    a = ['same\n', 'Hello world\n', 'removed\n', 'end\n']
+    b = ['same\n', 'Hello wOrld\n', 'end\n', 'added\n']
+
+    assert list(diff_lines(a, b)) == [
+        (EQUAL, 'same', []),
+        (DELETE, 'Hello world', [(7, 8)]),
+        (DELETE, 'removed', []),
+        (INSERT, 'Hello wOrld', [(7, 8)]),
+        (EQUAL, 'end', []),
+        (INSERT, 'added', []),
+    ]
+
+
+def test_diff_lines_max_line_work():
+    diffed = list(diff_lines(['abcd'], ['abXd'], max_line_work=15))
+
+    assert diffed == [(DELETE, 'abcd', []), (INSERT, 'abXd', [])]
+
+
+def test_diff_stream_matches_diff_lines():
+    rng = random.Random(1)
+    a = ['line {0}\n'.format(i) for i in range(500)]
+    b = list(a)
+
+    for _ in range(40):
+        idx = rng.randrange(len(b))
+        action = rng.choice(['delete', 'insert', 'change'])
+
+        if action == 'delete':
+            del b[idx]
+        elif action == 'insert':
+            b.insert(idx, 'new {0}\n'.format(idx))
+        else:
+            b[idx] = b[idx].replace('line', 'lime')
+
+    expected = list(diff_lines(a, b))
+
+    for window in [5, 50, 1000]:
+        diffed = list(diff_stream(io.StringIO(''.join(a)),
+                                  io.StringIO(''.join(b)), window=window))
+
+        # The old and new files can be reconstructed from the diff
+        assert [line for tag, line, _ in diffed if tag != INSERT] ==\
+            [line.rstrip('\n') for line in a]
+        assert [line for tag, line, _ in diffed if tag != DELETE] ==\
+            [line.rstrip('\n') for line in b]
+
+        if window >= len(a):
+            assert diffed == expected
+
+
+def test_diff_stream_empty_and_invalid():
+    assert list(diff_stream(io.StringIO(''), io.StringIO(''))) == []
+    assert list(diff_stream(io.StringIO('a\n'), io.StringIO(''))) ==\
+        [(DELETE, 'a', [])]
+
+    with pytest.raises(ValueError, match='Window must be positive'):
+        list(diff_stream(io.StringIO(''), io.StringIO(''), window=0))
+
+
+@pytest.mark.skip_on_windows
+def test_format_diff():
+    lines = list(colorise.diff.format_diff(diff_lines(['ab', 'x'],
+                                                      ['aB', 'x'])))
+
+    assert lines == [
+        '\x1b[0m\x1b[31m-a\x1b[0m\x1b[7m\x1b[31mb\x1b[0m',
+        '\x1b[0m\x1b[32m+a\x1b[0m\x1b[7m\x1b[32mB\x1b[0m',
+        ' x',
+    ]
+
+
+@pytest.mark.skip_on_windows
+def test_print_diff():
+    a = ['Hello world', 'same']
+    b = ['Hello wOrld', 'same', 'new']
+    expected = ''.join(
+        line + '\n'
+        for line in colorise.diff.format_diff(diff_lines(a, b))
+    )
+
+    output = io.StringIO()
+    colorise.diff.print_diff(a, b, end='\n', file=output)
+
+    assert output.getvalue() == expected
+
+    output = io.StringIO()
+    colorise.diff.print_diff_stream(io.StringIO('\n'.join(a)),
+                                    io.StringIO('\n'.join(b)), end='\n',
+                                    file=output)
+
+    assert output.getvalue() == expected
+
+
+def test_print_diff_disabled():
+    output = io.StringIO()
+    colorise.diff.print_diff(['a', 'b'], ['a', 'c'], end='\n', file=output,
+                             enabled=False)
+
+    assert output.getvalue() == ' a\n-b\n+c\n'
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test the string-returning cformat, fformat and hformat functions."""
+
+import os
+import sys
+
+import pytest
+
+import colorise
+from colorise.attributes import Attr
+
+
+def captured_output(redirect, func, *args, **kwargs):
+    with redirect('stdout') as stdout:
+        func(*args, file=sys.stdout, **kwargs)
+
+        return stdout.value
+
+
+@pytest.mark.skip_on_windows
+def test_cformat_matches_cprint(redirect):
+    kwargs = [
+        {'fg': 'red'},
+        {'bg': 'blue'},
+        {'fg': 'red', 'bg': 'blue', 'attributes': [Attr.Bold]},
+        {'fg': 201},
+        {'fg': 'rgb(167;151;255)'},
+        {'style': colorise.Style(fg='red', attributes=[Attr.Underline])},
+        {'fg': 'red', 'enabled': False},
+    ]
+
+    for kwarg in kwargs:
+        expected = captured_output(redirect, colorise.cprint, 'Hello',
+                                   **kwarg)
+
+        assert colorise.cformat('Hello', **kwarg) + os.linesep == expected
+
+
+@pytest.mark.skip_on_windows
+def test_cformat_output():
+    assert colorise.cformat('Hello', fg='red') == '\x1b[0m\x1b[31mHello\x1b[0m'
+    assert colorise.cformat('Hello', fg='red', enabled=False) == 'Hello'
+
+
+@pytest.mark.skip_on_windows
+def test_fformat_matches_fprint(redirect):
+    formats = [
+        '{fg=red}Hello',
+        'Hel{bg=blue}lo',
+        '{fg=red}Hello {bg=blue}world!',
+        '{fg=red,bold}Hello {reset}world',
+    ]
+
+    for fmt in formats:
+        for autoreset in [True, False]:
+            for enabled in [True, False]:
+                expected = captured_output(redirect, colorise.fprint, fmt,
+                                           autoreset=autoreset,
+                                           enabled=enabled)
+                result = colorise.fformat(fmt, autoreset=autoreset,
+                                          enabled=enabled)
+
+                assert result + os.linesep == expected
+
+
+@pytest.mark.skip_on_windows
+def test_hformat_matches_highlight(redirect):
+    tests = [
+        ('Hello!', [0, 2, 4], {'fg': 'red'}),
+        ('Hello', [1, 2, 4], {'bg': 'blue'}),
+        ('Hello', [4, 0, 1], {'style': colorise.Style(fg='red')}),
+        ('Hello', [], {'fg': 'red'}),
+        ('Hello', [0], {}),
+        ('', [0], {'fg': 'red'}),
+        ('Hello', [0, 2], {'fg': 'red', 'enabled': False}),
+    ]
+
+    for string, indices, kwargs in tests:
+        expected = captured_output(redirect, colorise.highlight, string,
+                                   indices, **kwargs)
+
+        assert colorise.hformat(string, indices, **kwargs) + os.linesep ==\
+            expected
+
+
+def test_format_invalid_colors():
+    with pytest.raises(ValueError, match="Unknown color name 'unknown'"):
+        colorise.cformat('Hello', fg='unknown')
+
+    with pytest.raises(ValueError, match="Unknown color name 'unknown'"):
+        colorise.fformat('{fg=unknown}Hello')
+
+    with pytest.raises(ValueError, match="Unknown color name 'unknown'"):
+        colorise.hformat('Hello', [0], fg='unknown')
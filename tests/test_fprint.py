@@ -3,8 +3,10 @@
 
 """Test the fprint function."""
 
+import io
 import os
 import sys
+import threading
 
 import pytest
 
@@ -159,3 +161,33 @@ def test_fprint_autoreset(test_stdout):
         text,
         autoreset=True,
     )
+
+
+@pytest.mark.skip_on_windows
+def test_fprint_threads():
+    # Each thread uses its own stream and autoreset setting, output must
+    # never end up in another thread's stream or use its settings
+    iterations = 200
+    text = '{fg=red}Hello {bg=blue}world!'
+    expected = {
+        True: '\x1b[0m\x1b[31mHello \x1b[0m\x1b[44mworld!\x1b[0m\n',
+        False: '\x1b[0m\x1b[31mHello \x1b[44mworld!\x1b[0m\n',
+    }
+    streams = [(io.StringIO(), i % 2 == 0) for i in range(8)]
+
+    def worker(stream, autoreset):
+        for _ in range(iterations):
+            colorise.fprint(text, autoreset=autoreset, end='\n', file=stream)
+
+    threads = [
+        threading.Thread(target=worker, args=args) for args in streams
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    for stream, autoreset in streams:
+        assert stream.getvalue() == expected[autoreset] * iterations
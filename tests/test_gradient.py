@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test gradients."""
+
+import io
+import os
+
+import pytest
+
+import colorise
+from colorise.attributes import Attr
+from colorise.cluts import to_rgb
+from colorise.gradients import gradient_runs, interpolate
+
+
+def test_to_rgb():
+    assert to_rgb('#ff0080') == (255, 0, 128)
+    assert to_rgb('0xf08') == (255, 0, 136)
+    assert to_rgb('rgb(1;2;3)') == (1, 2, 3)
+    assert to_rgb('hsv(120;100;100)') == (0, 255, 0)
+    assert to_rgb((1, 2, 3)) == (1, 2, 3)
+    assert to_rgb('lightblue') == (92, 92, 255)
+    assert to_rgb(1) == (205, 0, 0)
+    assert to_rgb(231) == (255, 255, 255)
+
+    with pytest.raises(ValueError, match=r"^Unknown color name 'bogus'$"):
+        to_rgb('bogus')
+
+    with pytest.raises(ValueError):
+        to_rgb((1, 2, 256))
+
+
+def test_interpolate_rgb():
+    assert interpolate(['#000000', '#ffffff'], 3) ==\
+        [(0, 0, 0), (128, 128, 128), (255, 255, 255)]
+    assert interpolate(['#ff0000', '#00ff00', '#0000ff'], 5) == [
+        (255, 0, 0),
+        (128, 128, 0),
+        (0, 255, 0),
+        (0, 128, 128),
+        (0, 0, 255),
+    ]
+    assert interpolate(['#123456'], 2) == [(18, 52, 86)] * 2
+    assert interpolate(['#000000', '#ffffff'], 1) == [(0, 0, 0)]
+    assert interpolate(['#000000', '#ffffff'], 0) == []
+
+
+def test_interpolate_hue():
+    # Red to blue goes through magenta rather than green
+    colors = interpolate(['#ff0000', '#0000ff'], 3, space='hsv')
+    assert colors[1] == (255, 0, 255)
+
+    colors = interpolate(['#ff0000', '#0000ff'], 3, space='hls')
+    assert colors[1] == (255, 0, 255)
+
+
+def test_invalid_gradients():
+    with pytest.raises(ValueError, match=r"^Unknown color space 'lab'"):
+        interpolate(['red'], 2, space='lab')
+
+    with pytest.raises(ValueError, match=r'^A gradient needs at least one'):
+        interpolate([], 2)
+
+
+def test_gradient_runs_coalesce():
+    text = 'Hello world'
+    runs = gradient_runs(text, ['#ff0000', '#ff0a00'], 16)
+
+    # All colors are approximated by red
+    assert len(runs) == 1
+    assert runs[0][:2] == (0, len(text))
+
+    runs = gradient_runs(text, ['#ff0000', '#ff0a00'], 2**24)
+    assert [run[:2] for run in runs] == [
+        (0, 1), (1, 2), (2, 3), (3, 4), (4, 6), (6, 7), (7, 8), (8, 9),
+        (9, 10), (10, 11),
+    ]
+
+
+def test_gradient_runs_whitespace():
+    # Whitespace joins the preceding run unless it is visible
+    runs = gradient_runs('a b', ['#ff0000', '#0000ff'], 16)
+    assert [run[:2] for run in runs] == [(0, 2), (2, 3)]
+
+    runs = gradient_runs('a b', ['#ff0000', '#0000ff'], 16, bg=True)
+    assert [run[:2] for run in runs] == [(0, 1), (1, 2), (2, 3)]
+
+    runs = gradient_runs('a b', ['#ff0000', '#0000ff'], 16,
+                         attributes=[Attr.Underline])
+    assert [run[:2] for run in runs] == [(0, 1), (1, 2), (2, 3)]
+
+
+@pytest.mark.skip_on_windows
+def test_gformat():
+    assert colorise.gformat('abcdef', ['#ff0000', '#00ff00']) ==\
+        '\x1b[0m\x1b[31mabc\x1b[0m\x1b[32mdef\x1b[0m'
+    assert colorise.gformat('ab', ['red', 'red'], background=True,
+                            attributes=[Attr.Bold]) ==\
+        '\x1b[0m\x1b[1m\x1b[41mab\x1b[0m'
+    assert colorise.gformat('abc', ['red', 'blue'], enabled=False) == 'abc'
+    assert colorise.gformat('', ['red', 'blue']) == ''
+
+
+@pytest.mark.skip_on_windows
+def test_gradient(test_stdout):
+    test_stdout(
+        colorise.gradient,
+        '\x1b[0m\x1b[31mabc\x1b[0m\x1b[32mdef\x1b[0m' + os.linesep,
+        'abcdef',
+        ['#ff0000', '#00ff00'],
+    )
+
+
+def test_gradient_disabled():
+    output = io.StringIO()
+    colorise.gradient('abc', ['red', 'blue'], file=output, enabled=False)
+
+    assert output.getvalue() == 'abc' + os.linesep
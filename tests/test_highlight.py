@@ -142,3 +142,14 @@ def test_highlight_proper_reset(redirect):
         colorise.highlight('Hello', [1, 2, 4], bg='blue', file=sys.stdout)
 
         assert stdout.value == expected
+
+
+@pytest.mark.skip_on_windows
+def test_highlight_duplicate_indices(test_stdout):
+    test_stdout(
+        colorise.highlight,
+        '\x1b[0mH\x1b[44mel\x1b[0ml\x1b[44mo\x1b[0m' + os.linesep,
+        'Hello',
+        [4, 1, 2, 1, 2, 4],
+        bg='blue',
+    )
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test span-based highlighting."""
+
+import os
+
+import pytest
+
+import colorise
+from colorise.attributes import Attr
+from colorise.spans import merge_spans
+
+RED = colorise.Style(fg='red')
+BLUE = colorise.Style(fg='blue')
+BOLD = colorise.Style(attributes=[Attr.Bold])
+UNDERLINE = colorise.Style(attributes=[Attr.Underline])
+
+
+def test_merge_spans():
+    assert merge_spans(10, []) == []
+    assert merge_spans(10, [(2, 4, RED)]) == [(2, 4, RED)]
+
+    # Unsorted and adjacent spans with equal styles are merged
+    assert merge_spans(10, [(4, 6, RED), (2, 4, RED)]) == [(2, 6, RED)]
+
+    # Spans are clipped and empty spans are ignored
+    assert merge_spans(5, [(-3, 2, RED), (3, 9, BLUE), (4, 4, BOLD)]) ==\
+        [(0, 2, RED), (3, 5, BLUE)]
+    assert merge_spans(5, [(6, 9, RED), (1, 3, colorise.Style())]) == []
+
+
+def test_merge_overlapping_spans():
+    # Later colors take precedence
+    assert merge_spans(10, [(0, 6, RED), (2, 4, BLUE)]) ==\
+        [(0, 2, RED), (2, 4, BLUE), (4, 6, RED)]
+    assert merge_spans(10, [(2, 4, BLUE), (0, 6, RED)]) == [(0, 6, RED)]
+
+    # Attributes are combined
+    assert merge_spans(10, [(0, 4, BOLD), (2, 6, UNDERLINE), (3, 5, RED)]) == [
+        (0, 2, BOLD),
+        (2, 3, colorise.Style(attributes=[Attr.Bold, Attr.Underline])),
+        (3, 4, colorise.Style('red', None, [Attr.Bold, Attr.Underline])),
+        (4, 5, colorise.Style('red', None, [Attr.Underline])),
+        (5, 6, UNDERLINE),
+    ]
+
+    # Background colors of earlier spans are kept
+    assert merge_spans(4, [(0, 4, colorise.Style(bg='blue')), (1, 2, RED)]) ==\
+        [
+            (0, 1, colorise.Style(bg='blue')),
+            (1, 2, colorise.Style(fg='red', bg='blue')),
+            (2, 4, colorise.Style(bg='blue')),
+        ]
+
+
+def test_attributes_do_not_leak_across_gaps(test_stdout):
+    # The attributes of a span do not carry over to a later span after a gap
+    spans = [(0, 2, BOLD), (1, 2, RED), (5, 7, BLUE)]
+
+    assert merge_spans(8, spans) == [
+        (0, 1, BOLD),
+        (1, 2, colorise.Style('red', None, [Attr.Bold])),
+        (5, 7, BLUE),
+    ]
+    test_stdout(
+        colorise.highlight_spans,
+        '\x1b[0m\x1b[1ma\x1b[0m\x1b[1m\x1b[31mb\x1b[0mcde\x1b[34mfg\x1b[0mh' +
+        os.linesep,
+        'abcdefgh',
+        spans,
+    )
+
+
+def test_merge_many_spans():
+    spans = [(i, i + 1, RED if i % 2 else BLUE) for i in range(10000)]
+    runs = merge_spans(10000, spans)
+
+    assert len(runs) == 10000
+    assert runs[1] == (1, 2, RED)
+
+
+@pytest.mark.skip_on_windows
+def test_highlight_spans_output(test_stdout):
+    test_stdout(
+        colorise.highlight_spans,
+        '\x1b[0mH\x1b[31mel\x1b[0ml\x1b[1m\x1b[34mo\x1b[0m!' + os.linesep,
+        'Hello!',
+        [(1, 3, RED), (4, 5, BLUE), (4, 5, BOLD)],
+    )
+
+
+@pytest.mark.skip_on_windows
+def test_hformat_spans_matches_hformat():
+    indices = [0, 2, 3, 5]
+    spans = [(0, 1, RED), (2, 4, RED), (5, 6, RED)]
+
+    assert colorise.hformat_spans('Hello!', spans) ==\
+        colorise.hformat('Hello!', indices, style=RED)
+
+
+def test_highlight_spans_disabled(test_stdout):
+    test_stdout(
+        colorise.highlight_spans,
+        'Hello' + os.linesep,
+        'Hello',
+        [(0, 2, RED)],
+        enabled=False,
+    )
+
+    assert colorise.hformat_spans('Hello', [(0, 2, RED)], enabled=False) ==\
+        'Hello'
+    assert colorise.hformat_spans('Hello', []) == 'Hello'
+
+
+def test_invalid_highlight_spans():
+    with pytest.raises(ValueError, match=r"^Unknown color name 'unknown'$"):
+        colorise.highlight_spans('Hello', [(0, 2, colorise.Style('unknown'))])
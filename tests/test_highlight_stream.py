@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test streaming regex highlighting."""
+
+import io
+import re
+
+import pytest
+
+import colorise
+from colorise.streaming import iter_matches
+
+RED = '\x1b[31m'
+RESET = '\x1b[0m'
+
+
+def highlighted(patterns, text, **kwargs):
+    outfile = io.StringIO()
+    colorise.highlight_stream(patterns, io.StringIO(text), outfile,
+                              fg='red', **kwargs)
+
+    return outfile.getvalue()
+
+
+def reference(patterns, text):
+    """Highlight the whole text at once."""
+    spans = [
+        (match.start(), match.end(), colorise.Style(fg='red'))
+        for pattern in patterns
+        for match in re.finditer(pattern, text)
+    ]
+
+    return colorise.hformat_spans(text, spans).replace(RESET, '')
+
+
+def test_iter_matches_reconstructs_input():
+    text = 'abc' * 1000
+    pieces = list(iter_matches('b', io.StringIO(text), chunk_size=7,
+                               lookback=2))
+
+    assert ''.join(piece for piece, _ in pieces) == text
+    assert sum(len(spans) for _, spans in pieces) == 1000
+
+    for piece, spans in pieces:
+        assert all(piece[start:end] == 'b' for start, end in spans)
+
+
+def test_iter_matches_across_chunks():
+    text = 'xx needle xxxx needle x needle'
+
+    for chunk_size in range(1, 12):
+        pieces = iter_matches(r'needle', io.StringIO(text),
+                              chunk_size=chunk_size, lookback=6)
+        matches = [piece[start:end] for piece, spans in pieces
+                   for start, end in spans]
+
+        assert matches == ['needle'] * 3
+
+
+def test_iter_matches_anchors_and_lookbehind():
+    text = 'ab\nab\nxab\n' * 20
+    patterns = [re.compile(r'^ab', re.MULTILINE), r'(?<=x)a']
+    pieces = iter_matches(patterns, io.StringIO(text), chunk_size=4,
+                          lookback=3)
+    count = sum(len(spans) for _, spans in pieces)
+
+    assert count == 60
+
+
+def test_iter_matches_invalid_arguments():
+    with pytest.raises(ValueError, match='Chunk size must be positive'):
+        list(iter_matches('a', io.StringIO('a'), chunk_size=0))
+
+    with pytest.raises(ValueError, match='Lookback must not be negative'):
+        list(iter_matches('a', io.StringIO('a'), lookback=-1))
+
+
+@pytest.mark.skip_on_windows
+def test_highlight_stream_output():
+    assert highlighted('needle', 'a needle in a haystack', chunk_size=3,
+                       lookback=6) ==\
+        RESET + 'a ' + RED + 'needle' + RESET + ' in a haystack'
+
+
+@pytest.mark.skip_on_windows
+def test_highlight_stream_matches_whole_string():
+    text = 'ERROR: disk full\nINFO: ok\nWARNING: low memory ERROR\n' * 50
+    patterns = [r'ERROR', r'WARN\w*', r'ok|memory']
+
+    for chunk_size in [1, 5, 64, 4096]:
+        output = highlighted(patterns, text, chunk_size=chunk_size,
+                             lookback=16)
+
+        assert output.replace(RESET, '') == reference(patterns, text)
+
+
+def test_highlight_stream_disabled():
+    text = 'a needle in a haystack'
+
+    assert highlighted('needle', text, enabled=False) == text
+    assert highlighted('nothing', text) == text
+    assert highlighted('needle', '') == ''
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test image rendering."""
+
+import array
+import io
+import os
+
+import pytest
+
+import colorise
+from colorise.image import format_image, render
+from colorise.nix.cluts import get_xterm_clut_256
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+
+
+def test_format_image():
+    pixels = [
+        [RED, RED, BLUE],
+        [GREEN, GREEN, None],
+    ]
+
+    assert format_image(pixels, color_count=16) ==\
+        '\x1b[0m\x1b[31;42m▀▀\x1b[34;49m▀\x1b[0m' + os.linesep
+    assert format_image(pixels, color_count=256) ==\
+        '\x1b[0m\x1b[38;5;196;48;5;46m▀▀\x1b[38;5;21;49m▀\x1b[0m' + os.linesep
+    assert format_image(pixels, color_count=2**24) ==\
+        '\x1b[0m\x1b[38;2;255;0;0;48;2;0;255;0m▀▀'\
+        '\x1b[38;2;0;0;255;49m▀\x1b[0m' + os.linesep
+
+
+def test_format_image_256_color_indices():
+    # Indices 30 to 37 of the 256 color table are cube colors, not the
+    # system colors whose escape codes share the same numbers
+    clut = get_xterm_clut_256()
+    pixels = [
+        [clut[idx] for idx in range(30, 38)],
+        [clut[idx] for idx in range(30, 38)],
+    ]
+
+    assert format_image(pixels, color_count=256) ==\
+        '\x1b[0m' + ''.join(
+            '\x1b[38;5;{0};48;5;{0}m▀'.format(idx) for idx in range(30, 38)
+        ) + '\x1b[0m' + os.linesep
+
+
+def test_format_image_transparent():
+    pixels = [
+        [None, None, RED],
+        [BLUE, None, None],
+        [None, GREEN, GREEN],
+    ]
+
+    assert format_image(pixels, color_count=16) == (
+        '\x1b[0m\x1b[34;49m▄\x1b[39;49m \x1b[31;49m▀\x1b[0m' + os.linesep +
+        '\x1b[39;49m \x1b[32;49m▀▀\x1b[0m' + os.linesep
+    )
+
+
+def test_format_image_coalesces_approximated_colors():
+    # Both shades of red are approximated by the same system color
+    pixels = [[RED, (250, 10, 0)], [RED, (240, 0, 10)]]
+
+    assert format_image(pixels, color_count=16) ==\
+        '\x1b[0m\x1b[31;41m▀▀\x1b[0m' + os.linesep
+
+
+def test_format_image_flat_sequences():
+    expected = '\x1b[0m\x1b[31;42m▀▀\x1b[0m' + os.linesep
+    components = [255, 0, 0] * 2 + [0, 255, 0] * 2
+
+    assert format_image(array.array('B', components), 2, 2,
+                        color_count=16) == expected
+    assert format_image(bytes(components), 2, 2, color_count=16) == expected
+
+    with pytest.raises(ValueError, match=r'^Expected 12 RGB components'):
+        format_image(bytes(components[:-1]), 2, 2)
+
+
+def test_format_image_crops():
+    pixels = [[RED, BLUE], [GREEN, BLUE], [BLUE, BLUE]]
+
+    assert format_image(pixels, width=1, height=2, color_count=16) ==\
+        '\x1b[0m\x1b[31;42m▀\x1b[0m' + os.linesep
+    assert format_image([], color_count=16) == ''
+
+
+@pytest.mark.skip_on_windows
+def test_render_writes_once():
+    output = io.StringIO()
+    colorise.reset_stats()
+    colorise.enable_stats()
+
+    try:
+        render([[RED] * 10] * 10, file=output)
+
+        assert colorise.stats()['writes'] == 1
+    finally:
+        colorise.enable_stats(False)
+        colorise.reset_stats()
+
+    assert output.getvalue().count(os.linesep) == 5
+
+
+def test_render_policy():
+    colorise.set_output_policy('never')
+
+    try:
+        output = io.StringIO()
+        render([[RED]], file=output)
+
+        assert output.getvalue() == ''
+    finally:
+        colorise.set_output_policy('environment')
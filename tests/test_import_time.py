@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test that importing colorise does not import optional features."""
+
+import subprocess
+import sys
+
+# Modules that are only imported when the features they implement are used
+LAZY_MODULES = [
+    'colorise.aio',
+    'colorise.ansi',
+    'colorise.atomic',
+    'colorise.buffering',
+    'colorise.colored_string',
+    'colorise.diff',
+    'colorise.formatter',
+    'colorise.gradients',
+    'colorise.image',
+    'colorise.logging',
+    'colorise.sgr',
+    'colorise.spans',
+    'colorise.streaming',
+    'colorise.table',
+    'colorise.template',
+]
+
+
+def imported_modules():
+    """Return the modules imported by colorise in a new interpreter."""
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            '-c',
+            'import sys, colorise; print("\\n".join(sys.modules))',
+        ],
+        universal_newlines=True,
+    )
+
+    return set(output.splitlines())
+
+
+def test_lazy_modules_not_imported():
+    assert not imported_modules() & set(LAZY_MODULES)
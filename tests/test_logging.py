@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test the colored logging handler."""
+
+import io
+import logging
+import threading
+
+import pytest
+
+import colorise
+from colorise.ansi import strip
+from colorise.attributes import Attr
+from colorise.logging import ColorHandler
+
+
+class SlowStream(io.StringIO):
+    """In-memory stream whose flushes block until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.released = threading.Event()
+        self.flushes = 0
+
+    def flush(self):
+        self.released.wait()
+        self.flushes += 1
+
+
+@pytest.fixture
+def logger():
+    """Return a logger that does not propagate to the root logger."""
+    logger = logging.getLogger('colorise.tests')
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@pytest.mark.skip_on_windows
+def test_color_handler(logger):
+    output = io.StringIO()
+    handler = ColorHandler(output)
+    logger.addHandler(handler)
+
+    logger.debug('debug')
+    logger.info('info')
+    logger.critical('critical')
+    handler.flush()
+
+    assert output.getvalue() == (
+        '\x1b[0m\x1b[36mdebug\x1b[0m\n'
+        '\x1b[0minfo\x1b[0m\n'
+        '\x1b[0m\x1b[1m\x1b[31mcritical\x1b[0m\n'
+    )
+
+
+@pytest.mark.skip_on_windows
+def test_custom_styles(logger):
+    output = io.StringIO()
+    handler = ColorHandler(output, styles={
+        logging.WARNING: colorise.Style(attributes=[Attr.Underline]),
+    })
+    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+    logger.addHandler(handler)
+
+    logger.info('quiet')
+    logger.error('loud')
+    handler.flush()
+
+    # Levels below the lowest styled level have no style
+    assert output.getvalue() ==\
+        '\x1b[0mINFO: quiet\x1b[0m\n\x1b[0m\x1b[4mERROR: loud\x1b[0m\n'
+
+
+def test_get_style():
+    handler = ColorHandler(io.StringIO())
+
+    try:
+        assert handler.get_style(logging.WARNING + 5) ==\
+            colorise.Style(fg='yellow')
+        assert handler.get_style(logging.NOTSET) is None
+    finally:
+        handler.close()
+
+
+def test_writes_in_background(logger):
+    output = SlowStream()
+    handler = ColorHandler(output)
+    logger.addHandler(handler)
+
+    # Logging does not wait for the stream to be flushed
+    for i in range(10):
+        logger.warning('Record %d', i)
+
+    output.released.set()
+    handler.flush()
+
+    lines = strip(output.getvalue()).splitlines()
+    assert lines == ['Record {0}'.format(i) for i in range(10)]
+
+    # Records queued while the stream was blocked are written together
+    assert output.flushes < 10
+
+
+def test_close_writes_queued_records(logger):
+    output = io.StringIO()
+    handler = ColorHandler(output)
+    logger.addHandler(handler)
+
+    logger.error('first')
+    handler.close()
+    logger.error('second')
+
+    assert 'first' in output.getvalue()
+    assert 'second' in output.getvalue()
+    assert not handler._thread.is_alive()
+
+
+def test_color_handler_policy(logger):
+    colorise.set_output_policy('never')
+
+    try:
+        output = io.StringIO()
+        handler = ColorHandler(output)
+        logger.addHandler(handler)
+
+        logger.error('plain')
+        handler.flush()
+
+        assert output.getvalue() == 'plain\n'
+    finally:
+        colorise.set_output_policy('environment')
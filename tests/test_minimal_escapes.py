@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test minimal escape sequences."""
+
+import io
+
+import pytest
+
+import colorise
+from colorise.attributes import Attr
+from colorise.sgr import DEFAULT, SgrState, parse, transition
+
+RED = colorise.Style(fg='red')
+BOLD_RED = colorise.Style(fg='red', attributes=[Attr.Bold])
+
+
+@pytest.fixture
+def minimal():
+    """Enable minimal escapes for a test."""
+    colorise.enable_minimal_escapes()
+    yield
+    colorise.enable_minimal_escapes(False)
+
+
+def test_parse():
+    assert parse('') == (False, DEFAULT)
+    assert parse('\x1b[1;4m\x1b[31m\x1b[48;5;201m') ==\
+        (False, SgrState('31', '48;5;201', [1, 4]))
+    assert parse('\x1b[38;2;1;2;3m') == (False, SgrState('38;2;1;2;3'))
+    assert parse('\x1b[0m') == (True, DEFAULT)
+    assert parse('\x1b[22;39m', SgrState('31', '44', [1, 2, 4])) ==\
+        (False, SgrState(None, '44', [4]))
+
+
+def test_transition():
+    red = SgrState('31')
+    bold_red = SgrState('31', None, [1])
+
+    assert transition(red, red) == ''
+    assert transition(None, red) == '\x1b[0;31m'
+    assert transition(None, DEFAULT) == '\x1b[0m'
+    assert transition(red, bold_red) == '\x1b[1m'
+    assert transition(bold_red, red) == '\x1b[22m'
+    assert transition(red, SgrState('31', '44')) == '\x1b[44m'
+
+    # Resetting is preferred when it is at least as short
+    assert transition(red, DEFAULT) == '\x1b[0m'
+    assert transition(bold_red, SgrState('32')) == '\x1b[0;32m'
+
+    # Turning off bold also turns off faint
+    assert transition(SgrState('31', None, [1, 2, 4]),
+                      SgrState('31', None, [2, 4])) == '\x1b[22;2m'
+
+
+@pytest.mark.skip_on_windows
+def test_cprint_minimal(minimal):
+    output = io.StringIO()
+
+    colorise.cprint('a', style=BOLD_RED, end='', file=output)
+    colorise.cprint('b', style=BOLD_RED, end='', file=output)
+    colorise.cprint('c', fg='red', end='', file=output)
+    colorise.cprint('d', end='', file=output)
+
+    assert output.getvalue() == '\x1b[0;1;31mab\x1b[22mc\x1b[0md'
+
+
+@pytest.mark.skip_on_windows
+def test_background_reset_before_end(minimal):
+    output = io.StringIO()
+
+    colorise.cprint('a', bg='blue', end='\n', file=output)
+    colorise.cprint('b', bg='blue', end='', file=output)
+
+    assert output.getvalue() == '\x1b[0;44ma\x1b[0m\n\x1b[44mb'
+
+
+@pytest.mark.skip_on_windows
+def test_highlight_minimal(minimal):
+    output = io.StringIO()
+
+    colorise.highlight('Hello', [0, 1, 4, 9], fg='red', end='', file=output)
+    colorise.highlight_spans('ab', [(0, 2, RED)], end='', file=output)
+
+    assert output.getvalue() == '\x1b[0;31mHe\x1b[0mll\x1b[31moab'
+
+
+@pytest.mark.skip_on_windows
+def test_fprint_minimal(minimal):
+    output = io.StringIO()
+
+    colorise.fprint('{fg=red}a {bold}b{reset} c', end='', file=output)
+    colorise.fprint('{fg=red,bold}d', end='', file=output)
+
+    # Whitespace is written without changing the colors
+    assert output.getvalue() ==\
+        '\x1b[0;31ma \x1b[0;1mb\x1b[0m c\x1b[1;31md'
+
+
+@pytest.mark.skip_on_windows
+def test_set_and_reset_color_minimal(minimal):
+    output = io.StringIO()
+
+    # The first reset is always written since the state is unknown
+    colorise.reset_color(file=output)
+    colorise.set_color(fg='red', file=output)
+    colorise.set_color(fg='red', file=output)
+    colorise.set_color(attributes=[Attr.Bold], file=output)
+    colorise.reset_color(file=output)
+    colorise.reset_color(file=output)
+
+    assert output.getvalue() == '\x1b[0m\x1b[31m\x1b[1m\x1b[0m'
+
+
+@pytest.mark.skip_on_windows
+def test_plain_output_resets_colors(minimal):
+    output = io.StringIO()
+
+    colorise.cprint('a', fg='red', end='', file=output)
+    colorise.highlight('b', [], fg='red', end='', file=output)
+    colorise.cprint('c', fg='red', end='', file=output, enabled=False)
+
+    assert output.getvalue() == '\x1b[0;31ma\x1b[0mbc'
+
+
+@pytest.mark.skip_on_windows
+def test_minimal_escapes_buffered(minimal):
+    output = io.StringIO()
+
+    with colorise.buffered(output) as out:
+        colorise.cprint('a', fg='red', end='', file=out)
+
+    # The state of the underlying stream is tracked
+    colorise.cprint('b', fg='red', end='', file=output)
+
+    assert output.getvalue() == '\x1b[0;31mab'
+
+
+@pytest.mark.skip_on_windows
+def test_minimal_escapes_disabled():
+    output = io.StringIO()
+
+    colorise.cprint('a', fg='red', end='', file=output)
+    colorise.cprint('b', fg='red', end='', file=output)
+
+    assert output.getvalue() ==\
+        '\x1b[0m\x1b[31ma\x1b[0m\x1b[0m\x1b[31mb\x1b[0m'
+
+
+@pytest.mark.skip_on_windows
+def test_disabling_resets_colors():
+    output = io.StringIO()
+    reset_output = io.StringIO()
+
+    colorise.enable_minimal_escapes()
+    colorise.cprint('a', fg='red', end='', file=output)
+    colorise.cprint('b', fg='red', end='', file=reset_output)
+    colorise.reset_color(file=reset_output)
+    colorise.enable_minimal_escapes(False)
+
+    # Only streams left with colors set are reset
+    assert output.getvalue() == '\x1b[0;31ma\x1b[0m'
+    assert reset_output.getvalue() == '\x1b[0;31mb\x1b[0m'
@@ -84,6 +84,7 @@ def test_windows10_24bit(monkeypatch):
         'getwindowsversion',
         mocked_24bit_getwindowsversion
     )
+    colorise.refresh_capabilities()
 
     assert colorise.num_colors() == 256**3
 
@@ -93,5 +94,6 @@ def test_windows10_24bit(monkeypatch):
         'getwindowsversion',
         mocked_not_24bit_getwindowsversion
     )
+    colorise.refresh_capabilities()
 
     assert colorise.num_colors() != 256**3
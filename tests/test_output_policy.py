@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test the output policy."""
+
+import io
+import os
+
+import pytest
+
+import colorise
+
+
+class TerminalStream(io.StringIO):
+    """In-memory stream that pretends to be a terminal."""
+
+    def isatty(self):
+        return True
+
+
+@pytest.fixture
+def setenv(monkeypatch):
+    """Set or delete an environment variable and refresh capabilities."""
+    def _setenv(name, value):
+        if value is None:
+            monkeypatch.delenv(name)
+        else:
+            monkeypatch.setenv(name, value)
+
+        colorise.refresh_capabilities()
+
+    return _setenv
+
+
+@pytest.fixture
+def policy():
+    """Set an output policy for a test and restore the default afterwards."""
+    yield colorise.set_output_policy
+    colorise.set_output_policy('environment')
+
+
+def test_default_policy():
+    assert colorise.colors_enabled(io.StringIO())
+    assert colorise.colors_enabled(TerminalStream())
+
+
+def test_no_color(setenv):
+    setenv('NO_COLOR', '1')
+
+    output = io.StringIO()
+    colorise.cprint('Hello', fg='red', file=output)
+    colorise.fprint('{fg=red}Hello', file=output)
+    colorise.highlight('Hello', [0, 1], fg='red', file=output)
+    colorise.highlight_spans('Hello', [(0, 2, colorise.Style('red'))],
+                             file=output)
+
+    assert output.getvalue() == ('Hello' + os.linesep) * 4
+    assert colorise.cformat('Hello', fg='red') == 'Hello'
+    assert colorise.fformat('{fg=red}Hello') == 'Hello'
+    assert colorise.hformat('Hello', [0], fg='red') == 'Hello'
+
+    # An empty value does not disable colors
+    setenv('NO_COLOR', '')
+    assert colorise.colors_enabled(output)
+
+
+def test_no_color_skips_color_resolution(setenv):
+    setenv('NO_COLOR', '1')
+    colorise.reset_stats()
+    colorise.enable_stats()
+
+    try:
+        colorise.cprint('Hello', fg='#abcdef', file=io.StringIO())
+        colorise.set_color(fg='#abcdef', file=io.StringIO())
+
+        assert colorise.stats()['color_lookups'] == 0
+    finally:
+        colorise.enable_stats(False)
+        colorise.reset_stats()
+
+
+def test_force_color(setenv, policy):
+    policy('auto')
+    assert not colorise.colors_enabled(io.StringIO())
+
+    # FORCE_COLOR=0 does not force colors
+    setenv('FORCE_COLOR', '0')
+    assert not colorise.colors_enabled(io.StringIO())
+
+    setenv('FORCE_COLOR', '1')
+    assert colorise.colors_enabled(io.StringIO())
+
+    # NO_COLOR takes precedence
+    setenv('NO_COLOR', '1')
+    assert not colorise.colors_enabled(io.StringIO())
+
+
+def test_auto_policy(setenv, policy):
+    setenv('TERM', 'xterm')
+    policy('auto')
+
+    assert colorise.colors_enabled(TerminalStream())
+    assert not colorise.colors_enabled(io.StringIO())
+
+    output = io.StringIO()
+    colorise.cprint('Hello', fg='red', file=output)
+    assert output.getvalue() == 'Hello' + os.linesep
+
+    setenv('CLICOLOR_FORCE', '1')
+    assert colorise.colors_enabled(io.StringIO())
+
+    setenv('CLICOLOR_FORCE', '0')
+    setenv('CLICOLOR', '0')
+    assert not colorise.colors_enabled(TerminalStream())
+
+    setenv('CLICOLOR', None)
+    setenv('TERM', 'dumb')
+    assert not colorise.colors_enabled(TerminalStream())
+
+
+def test_always_and_never_policies(setenv, policy):
+    setenv('NO_COLOR', '1')
+    policy('always')
+    assert colorise.colors_enabled(io.StringIO())
+
+    setenv('NO_COLOR', None)
+    policy('never')
+    assert not colorise.colors_enabled(TerminalStream())
+    assert colorise.cformat('Hello', fg='red') == 'Hello'
+
+
+def test_highlight_stream_policy(setenv):
+    setenv('NO_COLOR', '1')
+    output = io.StringIO()
+
+    colorise.highlight_stream('l+', io.StringIO('Hello world'), output,
+                              fg='red', chunk_size=4)
+
+    assert output.getvalue() == 'Hello world'
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError, match=r"^Unknown output policy 'nope'"):
+        colorise.set_output_policy('nope')
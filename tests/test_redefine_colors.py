@@ -19,3 +19,14 @@ def test_redefine_colors_error():
 
     with pytest.raises(colorise.error.NotSupportedError, match=error_message):
         colorise.redefine_colors({})
+
+
+@pytest.mark.skip_on_nix
+def test_refresh_invalidates_console_codes():
+    import colorise.win.cluts
+
+    # Styles key their cached console codes by the generation
+    generation = colorise.win.cluts.get_generation()
+    colorise.refresh_capabilities()
+
+    assert colorise.win.cluts.get_generation() > generation
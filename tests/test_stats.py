@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test runtime statistics."""
+
+import io
+
+import pytest
+
+import colorise
+import colorise.cluts
+import colorise.nix.cluts
+
+
+@pytest.fixture
+def stats():
+    colorise.reset_stats()
+    colorise.enable_stats()
+    yield
+    colorise.enable_stats(False)
+    colorise.reset_stats()
+
+
+def test_stats_disabled():
+    colorise.reset_stats()
+    colorise.cprint('Hello', fg='red', file=io.StringIO())
+    stats = colorise.stats()
+
+    assert not stats['enabled']
+    assert stats['writes'] == 0
+    assert stats['color_lookups'] == 0
+    assert stats['streams'] == {}
+
+
+@pytest.mark.skip_on_windows
+def test_stats_output(stats):
+    stream = io.StringIO()
+    colorise.cprint('Hello', fg='red', end='\n', file=stream)
+    colorise.set_color(fg='blue', file=stream)
+    colorise.reset_color(file=stream)
+
+    stats = colorise.stats()
+    expected = {
+        'writes': 3,
+        'flushes': 1,
+        'characters_written': len(stream.getvalue()),
+        'escape_bytes': len(stream.getvalue()) - len('Hello\n'),
+    }
+
+    assert stats['enabled']
+    assert stats['set_color_calls'] == 1
+    assert stats['reset_color_calls'] == 1
+    assert stats['streams'] == {'<StringIO>': expected}
+
+    for name, value in expected.items():
+        assert stats[name] == value
+
+
+def test_stats_color_cache(stats):
+    colorise.cluts.clear_color_cache()
+    colorise.cformat('Hello', fg='rgb(167;151;255)')
+    colorise.cformat('Hello', fg='rgb(167;151;255)')
+    colorise.cformat('Hello', fg='red')
+    stats = colorise.stats()
+
+    assert stats['color_lookups'] == 3
+    assert stats['color_cache_misses'] == 2
+    assert stats['color_cache_hits'] == 1
+    assert stats['color_resolution_time'] > 0
+
+    colorise.cformat('Hello', fg='#00ff00')
+    colorise.cformat('Hello', fg='#00ff00')
+    stats = colorise.stats()
+
+    assert stats['color_lookups'] == 5
+    assert stats['color_cache_misses'] == 3
+    assert stats['color_cache_hits'] == 2
+
+
+def test_stats_capability_probes(stats):
+    colorise.refresh_capabilities()
+    colorise.num_colors()
+    colorise.num_colors()
+
+    assert colorise.stats()['capability_probes'] == 1
+
+
+@pytest.mark.skip_on_windows
+def test_stats_approximation_time(stats):
+    colorise.cluts.clear_color_cache()
+    colorise.cluts.get_color('#a696ff', 16, colorise.nix.cluts)
+
+    assert colorise.stats()['approximation_time'] > 0
+
+
+def test_reset_stats(stats):
+    colorise.cprint('Hello', file=io.StringIO())
+    colorise.reset_stats()
+    stats = colorise.stats()
+
+    assert stats['writes'] == 0
+    assert stats['streams'] == {}
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test precompiled styles."""
+
+import os
+import sys
+
+import pytest
+
+import colorise
+from colorise.attributes import Attr
+
+
+def test_style_properties():
+    style = colorise.Style(fg='red', bg='blue', attributes=[Attr.Bold])
+
+    assert style.fg == 'red'
+    assert style.bg == 'blue'
+    assert style.attributes == (Attr.Bold,)
+    assert style
+    assert not colorise.Style()
+
+
+def test_style_equality():
+    assert colorise.Style(fg='red') == colorise.Style(fg='red')
+    assert colorise.Style(fg='red') != colorise.Style(bg='red')
+    assert hash(colorise.Style(fg='red', attributes=[Attr.Bold])) ==\
+        hash(colorise.Style(fg='red', attributes=[Attr.Bold]))
+
+
+def test_style_is_compiled_once():
+    calls = []
+
+    def compiler(fg, bg, attributes, color_count):
+        calls.append((fg, bg, attributes, color_count))
+        return color_count
+
+    style = colorise.Style(fg='red')
+
+    assert style.resolve(16, compiler, 16) == 16
+    assert style.resolve(16, compiler, 16) == 16
+    assert style.resolve(256, compiler, 256) == 256
+    assert calls == [('red', None, [], 16), ('red', None, [], 256)]
+
+
+@pytest.mark.skip_on_windows
+def test_style_ansi():
+    style = colorise.Style(fg='red', bg='blue', attributes=[Attr.Bold])
+
+    assert style.ansi(16) == '\x1b[1m\x1b[31m\x1b[44m'
+    assert style.ansi(256) == '\x1b[1m\x1b[31m\x1b[44m'
+    assert colorise.Style(fg=201).ansi(256) == '\x1b[38;5;201m'
+    assert colorise.Style(fg='#a696ff').ansi(2**24) ==\
+        '\x1b[38;2;166;150;255m'
+    assert colorise.Style().ansi(16) == ''
+
+
+def test_invalid_style():
+    with pytest.raises(ValueError, match=r"^Unknown color name 'unknown'$"):
+        colorise.cprint('Hello', style=colorise.Style(fg='unknown'))
+
+    with pytest.raises(ValueError, match='Cannot use a style together'):
+        colorise.cprint('Hello', fg='red', style=colorise.Style(fg='red'))
+
+
+@pytest.mark.skip_on_windows
+def test_style_cprint_output(test_stdout):
+    test_stdout(
+        colorise.cprint,
+        '\x1b[0m\x1b[31m\x1b[44mHello\x1b[0m' + os.linesep,
+        'Hello',
+        style=colorise.Style(fg='red', bg='blue'),
+    )
+
+
+@pytest.mark.skip_on_windows
+def test_style_highlight_output(test_stdout):
+    test_stdout(
+        colorise.highlight,
+        '\x1b[0m\x1b[31mH\x1b[0me\x1b[31ml\x1b[0ml\x1b[31mo\x1b[0m!'
+        + os.linesep,
+        'Hello!',
+        [0, 2, 4],
+        style=colorise.Style(fg='red'),
+    )
+
+
+@pytest.mark.skip_on_windows
+def test_style_fprint_output(redirect):
+    styles = {
+        'warn': colorise.Style(fg='yellow'),
+        'error': colorise.Style(fg='red', attributes=[Attr.Bold]),
+    }
+
+    with redirect('stdout') as stdout:
+        colorise.fprint('{warn}Hello {error}world', styles=styles,
+                        file=sys.stdout)
+
+        assert stdout.value == '\x1b[0m\x1b[33mHello \x1b[0m\x1b[1m\x1b[31m'\
+            'world\x1b[0m' + os.linesep
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Test streaming tables."""
+
+import io
+import os
+
+import pytest
+
+import colorise
+from colorise.table import render
+
+RED = colorise.Style(fg='red')
+
+
+def render_lines(*args, **kwargs):
+    """Render a table to a string and return its lines."""
+    output = io.StringIO()
+    render(*args, file=output, **kwargs)
+
+    return output.getvalue().split(os.linesep)[:-1]
+
+
+def test_table_plain():
+    rows = [('alpha', 1, 2.5), ('beta', 12345, None)]
+
+    assert render_lines(rows, columns=['Name', 'Count', 'Value'],
+                        enabled=False) == [
+        'Name   Count  Value',
+        'alpha      1    2.5',
+        'beta   12345',
+    ]
+
+
+def test_table_fixed_widths():
+    rows = iter([('a very long name', 1), ('short', 22)])
+
+    # Cells are truncated and number columns are left aligned without a
+    # sample
+    assert render_lines(rows, widths=[6, 3], separator=' | ',
+                        enabled=False) == [
+        'a ver… | 1',
+        'short  | 22',
+    ]
+
+
+def test_table_sample():
+    rows = [('a',), ('bb',), ('a much longer value',)]
+
+    assert render_lines(rows, sample_size=2, enabled=False) ==\
+        ['a', 'bb', 'a…']
+
+
+@pytest.mark.skip_on_windows
+def test_table_styles():
+    rows = [('x', -1), ('y', 2)]
+    styles = [RED, lambda value: RED if value < 0 else None]
+
+    assert render_lines(rows, columns=['N', 'V'], styles=styles) == [
+        '\x1b[0m\x1b[1mN\x1b[0m   \x1b[1mV\x1b[0m',
+        '\x1b[31mx\x1b[0m  \x1b[31m-1\x1b[0m',
+        '\x1b[31my\x1b[0m   2',
+    ]
+
+
+@pytest.mark.skip_on_windows
+def test_table_colored_cells():
+    rows = [(colorise.cformat('ab', fg='red'), 'c'), ('d', 'e')]
+
+    lines = render_lines(rows)
+    assert colorise.ansi.strip(lines[0]) == 'ab  c'
+    assert lines[1] == 'd   e'
+
+
+def test_table_writes_blocks():
+    output = io.StringIO()
+    colorise.reset_stats()
+    colorise.enable_stats()
+
+    try:
+        render(([i] for i in range(10)), block_size=4, file=output,
+               enabled=False)
+
+        assert colorise.stats()['writes'] == 3
+    finally:
+        colorise.enable_stats(False)
+        colorise.reset_stats()
+
+    assert output.getvalue().split() == [str(i) for i in range(10)]
+
+
+def test_empty_table():
+    assert render_lines([]) == []